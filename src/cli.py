@@ -0,0 +1,165 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.models.participant import Participant
+from src.models.participant_repository import ParticipantRepository
+from src.utils.batch_rankings import rank_scores_batch
+from src.utils.fixed_point import DISPLAY_DIGITS
+from src.utils.ranking_rules import CompiledRules, load_jury_ids, load_ranking_rules
+from src.utils.results_export import REPORTS, WRITERS, export_reports
+from src.utils.score_journal import read_journaled_scores
+
+
+@dataclass
+class CompetitionSummary:
+    """What processing one competition found, small enough to send back from a worker"""
+    name: str
+    ranked: int = 0
+    incomplete: int = 0  # Scored by part of the jury
+    unknown: List[str] = field(default_factory=list)  # Scored start numbers missing from participants.csv
+    # (style, start number, stored, recomputed) final totals that disagree
+    mismatched: List[Tuple[str, str, object, object]] = field(default_factory=list)
+    output_paths: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.mismatched
+
+
+def read_scores(data_dir: str, backend: str = 'json') -> Dict[str, Dict]:
+    """The scores of a data directory without writing to it, unlike opening a score store"""
+    if backend == 'sqlite':
+        from src.utils.sqlite_store import SqliteScoreStore
+        db_path = os.path.join(data_dir, 'scores.db')
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(db_path)
+        store = SqliteScoreStore(db_path)
+        try:
+            return store.load()
+        finally:
+            store.close()
+
+    return read_journaled_scores(os.path.join(data_dir, 'scores.json'))
+
+
+def check_final_totals(scores: Dict[str, Dict], participants: Dict[int, Participant], jury_count: int,
+                       rules: CompiledRules, summary: CompetitionSummary):
+    """Compare stored final totals with the rules and count unknown and unfinished participants"""
+    for style, style_scores in scores.items():
+        for start_number, participant_scores in style_scores.items():
+            if not start_number.isdigit() or int(start_number) not in participants:
+                summary.unknown.append(f"{style}/{start_number}")
+                continue
+            jury_scores = [key for key in participant_scores if key != 'final_total']
+            if jury_scores and len(jury_scores) != jury_count:
+                summary.incomplete += 1
+            stored = participant_scores.get('final_total')
+            recomputed = rules.final_total(participant_scores, jury_count)
+            # Older versions stored the unrounded mean, compare at the precision stored now
+            rounded = None if stored is None else round(float(stored), DISPLAY_DIGITS)
+            if rounded != recomputed and jury_scores:
+                summary.mismatched.append((style, start_number, stored, recomputed))
+
+
+def process_competition(data_dir: str, output_dir: Optional[str] = None, backend: str = 'json',
+                        reports: Sequence[str] = ('results',),
+                        formats: Sequence[str] = ('csv',)) -> CompetitionSummary:
+    """Rank one competition and export its reports, errors are reported in the summary"""
+    summary = CompetitionSummary(competition_name(data_dir))
+    try:
+        config_path = os.path.join(data_dir, 'jury_config.json')
+        rules = load_ranking_rules(config_path).compile()
+        jury_ids = load_jury_ids(config_path)
+        jury_count = len(jury_ids)
+        participants = ParticipantRepository.from_csv(os.path.join(data_dir, 'participants.csv')).by_start_number
+        scores = read_scores(data_dir, backend)
+
+        check_final_totals(scores, participants, jury_count, rules, summary)
+        groups = rank_scores_batch(scores, participants, jury_count, rules)  # Vectorized with pandas
+        summary.ranked = sum(len(entries) for entries in groups.values())
+
+        if output_dir is not None:
+            summary.output_paths = export_reports(output_dir, summary.name, groups, scores,
+                                                  participants.values(), jury_ids, reports, formats)
+    except Exception as e:  # One broken competition must not end the whole run
+        summary.error = f"{type(e).__name__}: {e}"
+    return summary
+
+
+def competition_name(data_dir: str) -> str:
+    return os.path.basename(os.path.normpath(os.path.abspath(data_dir)))
+
+
+def report(summary: CompetitionSummary, check: bool):
+    if summary.error:
+        print(f"{summary.name}: failed, {summary.error}", file=sys.stderr)
+        return
+    line = f"{summary.name}: {summary.ranked} ranked, {summary.incomplete} incomplete"
+    if summary.unknown:
+        line += f", {len(summary.unknown)} scored but not registered"
+    if summary.output_paths:
+        line += f" -> {', '.join(summary.output_paths)}"
+    print(line)
+    if check:
+        for style, start_number, stored, recomputed in summary.mismatched:
+            print(f"  {style} {start_number}: stored final total {stored}, rules give {recomputed}")
+
+
+def run(data_dirs: List[str], output_dir: Optional[str] = None, jobs: Optional[int] = None,
+        backend: str = 'json', reports: Sequence[str] = ('results',),
+        formats: Sequence[str] = ('csv',)) -> List[CompetitionSummary]:
+    """Process competitions in order, in a process pool when there is more than one"""
+    if jobs == 1 or len(data_dirs) == 1:
+        return [process_competition(data_dir, output_dir, backend, reports, formats) for data_dir in data_dirs]
+    count = len(data_dirs)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(process_competition, data_dirs, [output_dir] * count, [backend] * count,
+                             [reports] * count, [formats] * count))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m src.cli',
+                                     description="Recompute, check and export competition results without the GUI")
+    parser.add_argument('competitions', nargs='+', metavar='DATA_DIR',
+                        help="Competition data directories, laid out like data/")
+    parser.add_argument('--output', '-o', help="Directory for the <competition>-<report>.<format> files")
+    parser.add_argument('--report', '-r', action='append', choices=REPORTS,
+                        help="Report to export, may be repeated, defaults to results")
+    parser.add_argument('--format', '-f', action='append', choices=list(WRITERS),
+                        help="Export format, may be repeated, defaults to csv")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help="Worker processes, defaults to one per CPU")
+    parser.add_argument('--backend', choices=['json', 'sqlite'], default=None,
+                        help="Scores from scores.json and its journal or from scores.db, "
+                             "defaults to SCORE_STORE or json")
+    parser.add_argument('--check', action='store_true',
+                        help="List stored final totals that do not match the rules, exit with 1 if any")
+    args = parser.parse_args(argv)
+
+    names = [competition_name(data_dir) for data_dir in args.competitions]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if args.output and duplicates:
+        parser.error(f"Competitions would write the same results file: {', '.join(duplicates)}")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    backend = args.backend or os.environ.get('SCORE_STORE', 'json')
+    if backend not in ('json', 'sqlite'):
+        backend = 'json'
+    summaries = run(args.competitions, args.output, args.jobs, backend,
+                    args.report or ['results'], args.format or ['csv'])
+    for summary in summaries:
+        report(summary, args.check)
+    failed = any(summary.error for summary in summaries)
+    return 1 if failed or (args.check and not all(summary.ok for summary in summaries)) else 0
+
+
+if __name__ == '__main__':
+    # python -m src.cli season/*/ --output results/ --check
+    sys.exit(main())
@@ -4,8 +4,10 @@ import ttkbootstrap as ttk
 from tkinter import messagebox
 from src.models.category import Style, Category, AgeGroup
 from src.models.participant import Participant
+from src.models.participant_repository import get_participant_repository
 from src.models.score import Score
 from src.models.jury import JuryMember
+from src.utils.ranking_rules import get_ranking_rules
 from src.utils.translations import TRANSLATIONS
 from typing import List, Dict
 import json
@@ -16,24 +18,22 @@ from src.gui.rankings_frame import RankingsFrame
 class ScoreValidator:
     def __init__(self, language='english'):
         self.language = language
+        self.rules = get_ranking_rules()
 
-    def validate_main_score(self, value: str) -> tuple[bool, str]:
+    def validate_score(self, criterion: str, value: str) -> tuple[bool, str]:
         try:
             score = int(value)
-            if 0 <= score <= 30:
+            if self.rules.validate(criterion, score):
                 return True, ""
-            return False, TRANSLATIONS[self.language]['score_range_error'].format(max=30)
+            return False, TRANSLATIONS[self.language]['score_range_error'].format(max=self.rules.maxima[criterion])
         except ValueError:
             return False, TRANSLATIONS[self.language]['number_error']
 
+    def validate_main_score(self, value: str) -> tuple[bool, str]:
+        return self.validate_score('technique', value)
+
     def validate_expression(self, value: str) -> tuple[bool, str]:
-        try:
-            score = int(value)
-            if 0 <= score <= 10:
-                return True, ""
-            return False, "Expression score must be between 0 and 10"
-        except ValueError:
-            return False, "Score must be a whole number"
+        return self.validate_score('expression', value)
 
 class ScoringApp(ttk.Window):
     def __init__(self):
@@ -167,13 +167,11 @@ class ScoringApp(ttk.Window):
         }
         
         try:
-            with open('data/participants.csv', 'r') as file:
-                csv_lines = file.readlines()
-                for line in csv_lines:
-                    participant = Participant.from_csv_line(line.strip())
-                    self.participants[participant.style].append(participant)
+            repository = get_participant_repository()
+            for style in self.participants:
+                self.participants[style] = repository.for_style(style)
             
-            print(f"Successfully loaded {len(csv_lines)} participants")
+            print(f"Successfully loaded {len(repository)} participants")
             print(f"Modern: {len(self.participants[Style.MODERN])}")
             print(f"Urban: {len(self.participants[Style.URBAN])}")
         except FileNotFoundError:
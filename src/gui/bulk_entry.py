@@ -0,0 +1,255 @@
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableView, QComboBox,
+                              QPushButton, QLabel, QSpinBox, QStyledItemDelegate,
+                              QHeaderView, QMessageBox)
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor, QBrush
+from src.models.category import Style, Category, AgeGroup
+from src.models.jury import JuryMember
+from src.models.participant import Participant
+from src.models.participant_repository import get_participant_repository
+from src.models.score import CRITERIA
+from src.utils.ranking_rules import CompiledRules
+from src.utils.score_store import Change, ScoreStore
+from typing import Dict, List
+
+FIRST_CRITERION_COLUMN = 3
+INCOMPLETE_BRUSH = QBrush(QColor('#6b2b2b'))
+
+class BulkEntryModel(QAbstractTableModel):
+    """Editable grid of one group's scores, one row per participant and jury member.
+
+    Edits stay in the model until ``changes`` turns them into store changes.
+    A row counts as a jury score once every criterion is above zero, like in
+    the single-participant panel. A row cleared to all zeros removes the
+    jury score, an incomplete row keeps the stored one.
+    """
+    HEADERS = ['Start', 'Name', 'Jury', *(c.capitalize() for c in CRITERIA), 'Total']
+
+    def __init__(self, participants: List[Participant], jury_members: List[JuryMember],
+                 style_scores: Dict[str, Dict], rules: CompiledRules, parent=None):
+        super().__init__(parent)
+        self.participants = participants
+        self.jury_members = jury_members
+        self.rules = rules
+        self.maxima = [rules.maxima[c] for c in CRITERIA]
+        self.rows = [(participant, jury) for participant in participants for jury in jury_members]
+        self.values: List[List[int]] = []
+        for participant, jury in self.rows:
+            s = style_scores.get(str(participant.start_number), {}).get(str(jury.id))
+            self.values.append([s[c] for c in CRITERIA] if s else [0] * len(CRITERIA))
+        self.edited = set()  # Rows changed since loading
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            if FIRST_CRITERION_COLUMN <= section < FIRST_CRITERION_COLUMN + len(CRITERIA):
+                return f"{self.HEADERS[section]} ({self.maxima[section - FIRST_CRITERION_COLUMN]})"
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if self.criterion(index) is not None:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def criterion(self, index) -> int:
+        column = index.column() - FIRST_CRITERION_COLUMN
+        return column if 0 <= column < len(CRITERIA) else None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        participant, jury = self.rows[index.row()]
+        values = self.values[index.row()]
+        column = index.column()
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == 0:
+                return participant.start_number
+            elif column == 1:
+                return participant.name
+            elif column == 2:
+                return jury.name
+            elif self.criterion(index) is not None:
+                return values[self.criterion(index)]
+            return sum(values) if all(values) else ""
+        elif role == Qt.BackgroundRole and self.is_incomplete(index.row()):
+            return INCOMPLETE_BRUSH
+        elif role == Qt.TextAlignmentRole and column != 1:
+            return Qt.AlignCenter
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        criterion = self.criterion(index)
+        if role != Qt.EditRole or criterion is None:
+            return False
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return False
+        if not 0 <= value <= self.maxima[criterion]:
+            return False
+
+        row = index.row()
+        self.values[row][criterion] = value
+        self.edited.add(row)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+        return True
+
+    def is_incomplete(self, row: int) -> bool:
+        """Some criteria entered but not all, so the row would not be saved"""
+        values = self.values[row]
+        return any(values) and not all(values)
+
+    def incomplete_rows(self) -> int:
+        return sum(1 for row in range(len(self.rows)) if self.is_incomplete(row))
+
+    def incomplete_edited_rows(self) -> int:
+        return sum(1 for row in self.edited if self.is_incomplete(row))
+
+    def changes(self, style: str, style_scores: Dict[str, Dict]) -> List[Change]:
+        """Store changes turning the edited participants' scores into the grid's"""
+        edited_participants = {self.rows[row][0].start_number for row in self.edited}
+        changes = []
+        for row in range(0, len(self.rows), len(self.jury_members)):
+            participant = self.rows[row][0]
+            if participant.start_number not in edited_participants:
+                continue
+            start_number = str(participant.start_number)
+            stored = style_scores.get(start_number, {})
+            participant_scores = {}
+            for offset, jury in enumerate(self.jury_members):
+                values = self.values[row + offset]
+                if all(values):
+                    jury_score = dict(zip(CRITERIA, values))
+                    jury_score['total'] = sum(values)
+                    participant_scores[str(jury.id)] = jury_score
+                elif any(values) and str(jury.id) in stored:
+                    participant_scores[str(jury.id)] = stored[str(jury.id)]
+            total = self.rules.final_total(participant_scores, len(self.jury_members))
+            if total is not None:
+                participant_scores['final_total'] = total
+
+            changes.extend(ScoreStore.diff(style, start_number, stored, participant_scores))
+        return changes
+
+class _CriterionDelegate(QStyledItemDelegate):
+    """Spin box editors bounded by each criterion's maximum"""
+
+    def createEditor(self, parent, option, index):
+        model = index.model()
+        editor = QSpinBox(parent)
+        editor.setRange(0, model.maxima[model.criterion(index)])
+        return editor
+
+class BulkEntryDialog(QDialog):
+    """Grid entry of a whole (category, age group) of one style, committed at once"""
+    committed = Signal(list)  # Start numbers whose scores changed
+
+    def __init__(self, style: Style, jury_members: List[JuryMember], store: ScoreStore,
+                 rules: CompiledRules, saver=None, parent=None):
+        super().__init__(parent)
+        self.style = style
+        self.jury_members = jury_members
+        self.store = store
+        self.saver = saver
+        self.rules = rules
+        self.model = None
+        self.group = None  # (category index, age group index) of the loaded grid
+        self.setWindowTitle(f"Grid entry - {style.value.capitalize()}")
+        self.resize(900, 600)
+        self.setup_ui()
+        self.load_group()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        group_layout = QHBoxLayout()
+        self.category_combo = QComboBox()
+        for category in Category:
+            self.category_combo.addItem(category.value.capitalize(), category)
+        self.age_group_combo = QComboBox()
+        for age_group in AgeGroup:
+            self.age_group_combo.addItem(age_group.value.capitalize(), age_group)
+        self.category_combo.currentIndexChanged.connect(self.load_group)
+        self.age_group_combo.currentIndexChanged.connect(self.load_group)
+        group_layout.addWidget(self.category_combo)
+        group_layout.addWidget(self.age_group_combo)
+        group_layout.addStretch()
+        layout.addLayout(group_layout)
+
+        self.table = QTableView()
+        self.table.setItemDelegate(_CriterionDelegate(self.table))
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        self.status_label = QLabel()
+        self.commit_button = QPushButton("Commit")
+        self.close_button = QPushButton("Close")
+        self.commit_button.clicked.connect(self.commit)
+        self.close_button.clicked.connect(self.reject)
+        button_layout.addWidget(self.status_label, 1)
+        button_layout.addWidget(self.commit_button)
+        button_layout.addWidget(self.close_button)
+        layout.addLayout(button_layout)
+
+    def load_group(self):
+        if self.model is not None and self.model.edited:
+            if QMessageBox.question(self, "Grid entry", "Discard uncommitted grid edits?") != QMessageBox.Yes:
+                # Back to the group that is still loaded
+                for combo, index in zip((self.category_combo, self.age_group_combo), self.group):
+                    combo.blockSignals(True)
+                    combo.setCurrentIndex(index)
+                    combo.blockSignals(False)
+                return
+        self.group = (self.category_combo.currentIndex(), self.age_group_combo.currentIndex())
+        participants = get_participant_repository().for_group(
+            self.style, self.category_combo.currentData(), self.age_group_combo.currentData())
+        self.model = BulkEntryModel(participants, self.jury_members,
+                                    self.store.style_scores(self.style.value), self.rules, self)
+        self.model.dataChanged.connect(self.update_status)
+        self.table.setModel(self.model)
+        self.update_status()
+
+    def update_status(self):
+        incomplete = self.model.incomplete_rows()
+        self.status_label.setText(f"{len(self.model.participants)} participants, "
+                                  f"{incomplete} incomplete row(s)")
+        # Finish or clear edited rows first, half a score is not saved
+        self.commit_button.setEnabled(bool(self.model.edited) and not self.model.incomplete_edited_rows())
+
+    def commit(self):
+        """Write every edited participant in one store write"""
+        if self.model.incomplete_edited_rows():
+            return
+        style_scores = self.store.style_scores(self.style.value)
+        changes = self.model.changes(self.style.value, style_scores)
+        removed = [change for change in changes if change[3] is None and change[2] != 'final_total']
+        if removed:
+            names = {str(jury.id): jury.name for jury in self.jury_members}
+            lines = "\n".join(f"{start_number}: {names.get(jury_id, jury_id)}"
+                              for _, start_number, jury_id, _ in removed)
+            if QMessageBox.question(self, "Grid entry",
+                                    f"Delete these jury scores?\n{lines}") != QMessageBox.Yes:
+                return
+        if changes:
+            try:
+                if self.saver is not None:
+                    # Earlier single edits go out first so they cannot overwrite these
+                    self.saver.flush()
+                self.store.append(changes)
+            except Exception as e:
+                QMessageBox.warning(self, "Error", f"Could not save scores: {str(e)}")
+                return
+            self.committed.emit(sorted({int(change[1]) for change in changes}))
+        self.model.edited.clear()
+        self.update_status()
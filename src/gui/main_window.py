@@ -1,15 +1,71 @@
+import os
 from PySide6.QtWidgets import (QMainWindow, QTabWidget, QWidget, QVBoxLayout, 
-                              QMenuBar, QMenu, QComboBox)
-from PySide6.QtCore import Qt
+                              QMenuBar, QMenu, QComboBox, QMessageBox, QApplication, QFileDialog)
+from PySide6.QtCore import Qt, QRunnable, QThreadPool, QTimer
 from .style_frame import StyleFrame
-from .rankings_frame import RankingsFrame
+from .score_saver import ScoreSaver
 from src.models.category import Style
+from src.models.participant_repository import get_participant_repository
+from src.utils.ranking_rules import get_ranking_rules
+from src.utils.remote_store import RemoteScoreStore
+from src.utils.score_store import open_score_store
+from src.utils.startup_profile import profiler
+
+class _PreloadTask(QRunnable):
+    """Warm the shared participant and rules caches before hidden tabs need them"""
+
+    def run(self):
+        try:
+            get_participant_repository()
+            get_ranking_rules()
+        except Exception as e:
+            print(f"Error preloading data: {e}")
 
 class MainWindow(QMainWindow):
+    EXTERNAL_INCREMENTAL_LIMIT = 20  # Participants changed elsewhere at once before whole groups are reloaded
+    SYNC_INTERVAL_MS = 500
+    RANKINGS_TAB = 2
+    DARK_STYLE = """
+        QMainWindow, QWidget {
+            background-color: #2b2b2b;
+            color: #ffffff;
+        }
+        QTabWidget::pane {
+            border: 1px solid #444;
+        }
+        QTabBar::tab {
+            background: #333;
+            color: #fff;
+            padding: 8px 20px;
+            border: 1px solid #444;
+        }
+        QTabBar::tab:selected {
+            background: #444;
+        }
+        QMenuBar {
+            background-color: #333;
+            color: #fff;
+        }
+        QMenuBar::item:selected {
+            background-color: #444;
+        }
+        QComboBox {
+            background-color: #333;
+            color: #fff;
+            border: 1px solid #555;
+            padding: 5px;
+        }
+    """
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Legacy Scoring Application")
         self.resize(1024, 768)
+        self.language = 'english'
+        self.is_dark = True
+        self.modern_frame = None
+        self.urban_frame = None
+        self.rankings_frame = None
         self.setup_ui()
         self.load_data()
 
@@ -40,96 +96,220 @@ class MainWindow(QMainWindow):
         english_action.triggered.connect(lambda: self.change_language("EN"))
         dutch_action.triggered.connect(lambda: self.change_language("NL"))
 
+        # Results, podiums and jury score sheets, one file each
+        export_menu = menu_bar.addMenu("Export")
+        for label, fmt in (("CSV...", 'csv'), ("JSON Lines...", 'jsonl'), ("Printable HTML...", 'html')):
+            export_menu.addAction(label).triggered.connect(lambda checked=False, fmt=fmt: self.export_results(fmt))
+
         # Create tab widget
         self.tab_widget = QTabWidget()
         layout.addWidget(self.tab_widget)
 
-        # Create frames
-        self.rankings_frame = RankingsFrame()
-        self.modern_frame = StyleFrame(Style.MODERN)
-        self.urban_frame = StyleFrame(Style.URBAN)
+        # Participants and rules load in the background while the store opens
+        QThreadPool.globalInstance().start(_PreloadTask())
+
+        # Scores are shared by all frames through one store, which is
+        # written to disk in the background
+        with profiler.phase('open score store'):
+            self.store = open_score_store('data')
+        profiler.counter('aggregate cache', self.store.aggregates.stats)
+        self.saver = ScoreSaver(self.store, parent=self)
+        self.saver.saved.connect(self.on_scores_saved)
+        self.saver.failed.connect(self.on_save_failed)
+        self.saver.rejected.connect(self.on_remote_changes)
+
+        # With a scoring server, other devices' scores arrive in the background
+        self.remote_sync = None
+        self.station_sync = None
+        if isinstance(self.store, RemoteScoreStore):
+            from .remote_sync import RemoteSync
+            self.remote_sync = RemoteSync(self.store, parent=self)
+            self.remote_sync.received.connect(self.on_remote_changes)
+            self.remote_sync.reloaded.connect(self.on_remote_reload)
+            self.remote_sync.failed.connect(self.on_remote_failed)
+            self.remote_sync.start()
+        else:
+            # Other stations sharing the data directory, read on a worker thread
+            from .station_sync import StationSync
+            self.station_sync = StationSync(self.store, self.SYNC_INTERVAL_MS, parent=self)
+            self.station_sync.received.connect(self.show_external_changes)
+            self.station_sync.failed.connect(
+                lambda error: print(f"Error reading other stations' scores: {error}"))
+            self.station_sync.start()
 
-        # Add tabs
-        self.tab_widget.addTab(self.modern_frame, "Modern")
-        self.tab_widget.addTab(self.urban_frame, "Urban")
-        self.tab_widget.addTab(self.rankings_frame, "Rankings")
+        # Live results for scoreboards, RESULTS_FEED=[host:]port switches it on
+        self.results_publisher = None
+        if os.environ.get('RESULTS_FEED'):
+            self.start_results_feed(os.environ['RESULTS_FEED'])
+
+        # Tabs start as empty pages, their frames are built when first shown
+        self.tab_builders = [
+            ("Modern", lambda: self.build_style_frame(Style.MODERN)),
+            ("Urban", lambda: self.build_style_frame(Style.URBAN)),
+            ("Rankings", self.build_rankings_frame),
+        ]
+        for title, _ in self.tab_builders:
+            page = QWidget()
+            QVBoxLayout(page).setContentsMargins(0, 0, 0, 0)
+            self.tab_widget.addTab(page, title)
+        self.built_tabs = set()
+        self.tab_widget.currentChanged.connect(self.ensure_tab)
 
         # Set dark theme
-        self.setStyleSheet("""
-            QMainWindow, QWidget {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            QTabWidget::pane {
-                border: 1px solid #444;
-            }
-            QTabBar::tab {
-                background: #333;
-                color: #fff;
-                padding: 8px 20px;
-                border: 1px solid #444;
-            }
-            QTabBar::tab:selected {
-                background: #444;
-            }
-            QMenuBar {
-                background-color: #333;
-                color: #fff;
-            }
-            QMenuBar::item:selected {
-                background-color: #444;
-            }
-            QComboBox {
-                background-color: #333;
-                color: #fff;
-                border: 1px solid #555;
-                padding: 5px;
-            }
-        """)
+        self.setStyleSheet(self.DARK_STYLE)
 
     def load_data(self):
-        # Connect frames
-        self.modern_frame.scores_updated.connect(self.rankings_frame.refresh_rankings)
-        self.urban_frame.scores_updated.connect(self.rankings_frame.refresh_rankings)
+        self.ensure_tab(self.tab_widget.currentIndex())
+
+    def ensure_tab(self, index):
+        """Build the frame of a tab the first time it is shown"""
+        if index < 0 or index in self.built_tabs:
+            return
+        self.built_tabs.add(index)
+        title, build = self.tab_builders[index]
+        with profiler.phase(f'build {title} tab'):
+            frame = build()
+            if self.language != 'english':
+                frame.update_language(self.language)
+            if not self.is_dark:
+                frame.update_theme(self.is_dark)
+            self.tab_widget.widget(index).layout().addWidget(frame)
+
+    def build_style_frame(self, style: Style) -> StyleFrame:
+        frame = StyleFrame(style, store=self.store, saver=self.saver)
+        frame.scores_updated.connect(self.on_score_changed)
+        frame.bulk_committed.connect(self.on_bulk_committed)
+        if style == Style.MODERN:
+            self.modern_frame = frame
+        else:
+            self.urban_frame = frame
+        return frame
+
+    def build_rankings_frame(self):
+        # Imported on first use, it is not needed for the first paint
+        from .rankings_frame import RankingsFrame
+        self.rankings_frame = RankingsFrame(store=self.store)
+        if self.results_publisher is not None:
+            self.results_publisher.follow(self.rankings_frame)
+        return self.rankings_frame
+
+    def start_results_feed(self, address: str):
+        from src.utils.results_broadcast import ResultsBroadcaster
+        from .results_publisher import ResultsPublisher
+        host, _, port = address.rpartition(':')
+        try:
+            broadcaster = ResultsBroadcaster(host or '127.0.0.1', int(port))
+            port = broadcaster.start()
+        except (OSError, ValueError) as e:
+            print(f"Could not start the results feed on {address}: {e}")
+            return
+        print(f"Results feed on http://{broadcaster.host}:{port}/results/stream")
+        self.results_publisher = ResultsPublisher(broadcaster, parent=self)
+        # The feed follows the rankings tab, build it even if it is never opened
+        QTimer.singleShot(0, lambda: self.ensure_tab(self.RANKINGS_TAB))
+
+    def frames(self):
+        return [frame for frame in (self.modern_frame, self.urban_frame, self.rankings_frame)
+                if frame is not None]
+
+    def on_score_changed(self, style, start_number):
+        # Rankings built later load every score, so only a live frame needs updates
+        if self.rankings_frame is not None:
+            self.rankings_frame.on_score_changed(style, start_number)
+
+    def on_bulk_committed(self, style, start_numbers):
+        # A whole grid changed at once, its group is re-read in one query
+        if self.rankings_frame is not None:
+            self.rankings_frame.reload_groups((style, start_number) for start_number in start_numbers)
+
+    def on_remote_changes(self, changes):
+        # Local edits still on their way to the server will replace these there
+        unsaved = self.saver.unsaved({change[:3] for change in changes})
+        changes = [change for change in changes if change[:3] not in unsaved]
+        self.store.apply(changes)
+        self.show_external_changes(changes)
+
+    def show_external_changes(self, changes):
+        """Refresh what shows scores changed elsewhere, already applied to the store"""
+        touched = {(style, start_number) for style, start_number, _, _ in changes}
+        for frame in (self.modern_frame, self.urban_frame):
+            if frame is not None:
+                frame.on_external_changes({start_number for style, start_number in touched
+                                           if style == frame.style.value})
+        if self.rankings_frame is not None:
+            if len(touched) > self.EXTERNAL_INCREMENTAL_LIMIT:
+                self.rankings_frame.reload_groups(touched)
+            else:
+                for style, start_number in touched:
+                    self.rankings_frame.on_score_changed(style, int(start_number))
+
+    def on_remote_reload(self, scores):
+        self.store.replace_scores(scores)
+        for frame in (self.modern_frame, self.urban_frame):
+            if frame is not None:
+                frame.load_scores()
+        if self.rankings_frame is not None:
+            self.rankings_frame.load_rankings()
+
+    def on_remote_failed(self, error):
+        self.statusBar().showMessage(f"Scoring server unreachable: {error}", 2000)
+
+    def on_scores_saved(self, count):
+        self.statusBar().showMessage(f"Saved {count} score change(s)", 2000)
+
+    def on_save_failed(self, error):
+        QMessageBox.warning(self, "Error", f"Could not save scores: {error}")
+
+    def export_results(self, fmt: str):
+        from src.utils.calculations import rank_scores
+        from src.utils.ranking_rules import load_jury_ids
+        from src.utils.results_export import REPORTS, export_reports
+        directory = QFileDialog.getExistingDirectory(self, "Export results to")
+        if not directory:
+            return
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            scores, cache = self.store.snapshot_cache()
+            participants = get_participant_repository().by_start_number
+            jury_ids = load_jury_ids()
+            groups = rank_scores(scores, participants, len(jury_ids), get_ranking_rules(), cache)
+            self.store.aggregates.adopt(cache)
+            paths = export_reports(directory, 'event', groups, scores, participants.values(),
+                                   jury_ids, REPORTS, [fmt])
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", f"Could not export results: {e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        self.statusBar().showMessage(f"Exported {len(paths)} file(s) to {directory}", 5000)
+
+    def closeEvent(self, event):
+        # Stop ranking work, write pending edits and close the store before exiting
+        if self.rankings_frame is not None:
+            self.rankings_frame.worker.cancel()
+            self.rankings_frame.worker.wait()
+        if self.results_publisher is not None:
+            self.results_publisher.stop()
+        if self.remote_sync is not None:
+            self.remote_sync.stop()
+        if self.station_sync is not None:
+            self.station_sync.stop()
+            self.station_sync.wait()
+        self.saver.flush()
+        self.store.close()
+        profiler.report_counters()
+        if self.remote_sync is not None:
+            self.remote_sync.wait()
+        super().closeEvent(event)
 
     def change_language(self, lang_code):
-        lang = 'dutch' if lang_code == 'NL' else 'english'
-        self.modern_frame.update_language(lang)
-        self.urban_frame.update_language(lang)
-        self.rankings_frame.update_language(lang)
+        self.language = 'dutch' if lang_code == 'NL' else 'english'
+        for frame in self.frames():
+            frame.update_language(self.language)
 
     def change_theme(self, is_dark: bool):
         """Change application theme"""
-        if is_dark:
-            self.setStyleSheet("""
-                QMainWindow, QWidget {
-                    background-color: #2b2b2b;
-                    color: #ffffff;
-                }
-                QTabWidget::pane {
-                    border: 1px solid #444;
-                }
-                QTabBar::tab {
-                    background: #333;
-                    color: #fff;
-                    padding: 8px 20px;
-                    border: 1px solid #444;
-                }
-                QTabBar::tab:selected {
-                    background: #444;
-                }
-                QMenuBar {
-                    background-color: #333;
-                    color: #fff;
-                }
-                QMenuBar::item:selected {
-                    background-color: #444;
-                }
-            """)
-        else:
-            self.setStyleSheet("")
-        
-        # Update theme in frames
-        self.modern_frame.update_theme(is_dark)
-        self.urban_frame.update_theme(is_dark)
-        self.rankings_frame.update_theme(is_dark) 
\ No newline at end of file
+        self.is_dark = is_dark
+        self.setStyleSheet(self.DARK_STYLE if is_dark else "")
+        for frame in self.frames():
+            frame.update_theme(is_dark)
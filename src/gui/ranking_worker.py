@@ -0,0 +1,54 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from src.utils.ranking_snapshot import build_snapshot
+from src.utils.score_store import ScoreStore
+import threading
+
+class _RankingTask(QRunnable):
+    def __init__(self, worker: 'RankingWorker', participants, generation: int):
+        super().__init__()
+        self.worker = worker
+        self.participants = participants
+        self.generation = generation
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        try:
+            snapshot = build_snapshot(self.worker.store, self.participants, self.generation,
+                                      self.cancel_event.is_set)
+        except Exception as e:
+            self.worker.failed.emit(str(e))
+            return
+        if snapshot is not None and not self.cancel_event.is_set():
+            self.worker.finished.emit(snapshot)
+
+class RankingWorker(QObject):
+    """Full ranking recomputes on a worker thread.
+
+    Starting a recompute cancels the one in flight, finished snapshots
+    arrive on the GUI thread through ``finished``.
+    """
+    finished = Signal(object)  # RankingSnapshot
+    failed = Signal(str)
+
+    def __init__(self, store: ScoreStore, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._task = None
+
+        # One worker, a cancelled task gives way to its replacement quickly
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+    def start(self, participants, generation: int):
+        self.cancel()
+        self._task = _RankingTask(self, participants, generation)
+        self.pool.start(self._task)
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel_event.set()
+            self._task = None
+
+    def wait(self):
+        """Block until queued recomputes are done, for shutdown and tests"""
+        self.pool.waitForDone()
@@ -1,49 +1,101 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QTableView, QHeaderView, 
-                              QStyledItemDelegate, QStyleOptionViewItem)
+                              QStyledItemDelegate, QStyleOptionViewItem,
+                              QGroupBox, QLabel)
 from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QColor, QBrush, QFont
 from src.models.category import Style, Category, AgeGroup
 from src.utils.translations import TRANSLATIONS
 from src.models.participant import Participant
-import json
-from dataclasses import dataclass
-from collections import defaultdict
-from typing import Dict, List
-
-@dataclass
-class RankingEntry:
-    start_number: int
-    name: str
-    category: Category
-    age_group: AgeGroup
-    score: float
+from src.models.participant_repository import get_participant_repository
+from src.models.ranking import RankingEntry
+from src.utils.leaderboard import Leaderboard
+from src.utils.ranking_engine import RankingEngine, shared_rank
+from src.utils.ranking_rules import get_ranking_rules
+from src.utils.ranking_snapshot import RankingSnapshot
+from src.utils.score_store import ScoreStore, open_score_store
+from .ranking_worker import RankingWorker
+from array import array
 
 class RankingsModel(QAbstractTableModel):
+    """Rankings shown as a header row per group followed by its entries.
+
+    A flat index maps every row to its group, so looking up a cell is O(1).
+    Rows are handed to the view in batches as it scrolls, and a group can be
+    collapsed to just its header.
+    """
+    FETCH_BATCH = 200
+    HEADER_COLORS = {True: "#333333", False: "#dddddd"}  # Group header background per is_dark
+
     def __init__(self):
         super().__init__()
-        self.rankings = []
         self.headers = ['#', 'Name', 'Score']
-        self.group_headers = []
-        
-    def rowCount(self, parent=None):
-        return len(self.rankings) + len(self.group_headers)
-        
-    def columnCount(self, parent=None):
+        self.is_dark = True
+        self.order = []  # [(group key, title)] in display order
+        self.group_indexes = {}  # Position of each group key in order
+        self.groups = {}  # Best-first entries per group key
+        self.sizes = []  # Entry count per group index
+        self.collapsed = set()  # Collapsed group indexes
+        self.row_groups = array('H')  # Group index of every row
+        self.group_starts = []  # Header row per group index
+        self.loaded = 0  # Rows handed to the view so far
+
+    def set_groups(self, order, groups):
+        self.beginResetModel()
+        self.order = order
+        self.group_indexes = {key: g for g, (key, _) in enumerate(order)}
+        self.groups = groups
+        self.sizes = [len(groups.get(key, [])) for key, _ in order]
+        self.collapsed = {g for g in self.collapsed if g < len(order)}
+        self.build_index()
+        self.loaded = min(len(self.row_groups), self.FETCH_BATCH)
+        self.endResetModel()
+
+    def visible_rows(self, g):
+        if not self.sizes[g]:
+            return 0
+        return 1 if g in self.collapsed else self.sizes[g] + 1
+
+    def build_index(self):
+        self.row_groups = array('H')
+        self.group_starts = []
+        for g in range(len(self.order)):
+            self.group_starts.append(len(self.row_groups))
+            self.row_groups.extend(array('H', [g]) * self.visible_rows(g))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
         return len(self.headers)
-        
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.loaded < len(self.row_groups)
+
+    def fetchMore(self, parent):
+        count = min(self.FETCH_BATCH, len(self.row_groups) - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid():
             return None
             
         row = index.row()
+        g = self.row_groups[row]
+        key, title = self.order[g]
+        position = row - self.group_starts[g] - 1
         col = index.column()
         
         # Check if this is a group header row
-        if row in self.group_headers:
+        if position < 0:
             if role == Qt.DisplayRole and col == 1:
-                return self.group_headers[row]
+                marker = "▸" if g in self.collapsed else "▾"
+                return f"{marker} {title}"
             elif role == Qt.BackgroundRole:
-                return QBrush(QColor("#333333"))
+                return QBrush(QColor(self.HEADER_COLORS[self.is_dark]))
             elif role == Qt.FontRole:
                 font = QFont()
                 font.setBold(True)
@@ -51,11 +103,11 @@ class RankingsModel(QAbstractTableModel):
             return None
             
         # Regular data row
-        entry = self.rankings[row - len(self.group_headers)]
+        entry = self.groups[key][position]
         
         if role == Qt.DisplayRole:
             if col == 0:
-                return str(row + 1)
+                return str(shared_rank(self.groups[key], position))
             elif col == 1:
                 return entry.name
             elif col == 2:
@@ -73,20 +125,151 @@ class RankingsModel(QAbstractTableModel):
             return self.headers[section]
         return None
 
+    def is_group_header(self, row):
+        return self.group_starts[self.row_groups[row]] == row
+
+    def toggle_group(self, row):
+        """Collapse or expand the group whose header is at row"""
+        g = self.row_groups[row]
+        if g in self.collapsed:
+            self.collapsed.discard(g)
+            self.insert_rows(g, row + 1, self.sizes[g])
+        else:
+            self.remove_rows(g, row + 1, self.sizes[g])
+            self.collapsed.add(g)
+        self.dataChanged.emit(self.index(row, 1), self.index(row, 1))
+
+    def insert_rows(self, g, first, count):
+        # Rows past the loaded part are only added to the index
+        visible = first < self.loaded or self.loaded == len(self.row_groups)
+        if visible:
+            self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        self.row_groups[first:first] = array('H', [g]) * count
+        for other in range(g + 1, len(self.group_starts)):
+            self.group_starts[other] += count
+        if visible:
+            self.loaded += count
+            self.endInsertRows()
+
+    def remove_rows(self, g, first, count):
+        visible_count = max(0, min(first + count, self.loaded) - first)
+        if visible_count:
+            self.beginRemoveRows(QModelIndex(), first, first + visible_count - 1)
+        del self.row_groups[first:first + count]
+        for other in range(g + 1, len(self.group_starts)):
+            self.group_starts[other] -= count
+        if visible_count:
+            self.loaded -= visible_count
+            self.endRemoveRows()
+
+    def apply_change(self, change):
+        """Update only the rows touched by a RankingChange from the ranking engine"""
+        g = self.group_indexes.get(change.key)
+        if g is None:
+            return
+        header_row = self.group_starts[g]
+        old_index, new_index = change.old_index, change.new_index
+        expanded = g not in self.collapsed
+
+        if old_index is not None and new_index is not None:
+            if expanded and old_index != new_index:
+                self.remove_rows(g, header_row + 1 + old_index, 1)
+                self.insert_rows(g, header_row + 1 + new_index, 1)
+        elif old_index is not None:
+            self.sizes[g] -= 1
+            if not self.sizes[g]:
+                # Last entry takes its group header along
+                self.remove_rows(g, header_row, 2 if expanded else 1)
+            elif expanded:
+                self.remove_rows(g, header_row + 1 + old_index, 1)
+        elif new_index is not None:
+            self.sizes[g] += 1
+            if self.sizes[g] == 1:
+                self.insert_rows(g, header_row, 2 if expanded else 1)
+            elif expanded:
+                self.insert_rows(g, header_row + 1 + new_index, 1)
+
+        # Ranks shift for the entries between the old and new position
+        if expanded and self.sizes[g]:
+            positions = [i for i in (old_index, new_index) if i is not None]
+            first = min(positions)
+            last = max(positions) if len(positions) == 2 else self.sizes[g] - 1
+            # Truly equal entries share the rank of the first of them, so the tie
+            # run at the start and the run following the moved span change too
+            entries = self.groups[change.key]
+            if first < len(entries):
+                while first > 0 and entries[first - 1].key == entries[first].key:
+                    first -= 1
+            if last + 1 < len(entries):
+                last += 1
+                while last + 1 < len(entries) and entries[last + 1].key == entries[last].key:
+                    last += 1
+            first_row = header_row + 1 + first
+            last_row = min(header_row + 1 + last, self.loaded - 1)
+            if first_row <= last_row:
+                self.dataChanged.emit(self.index(first_row, 0),
+                                      self.index(last_row, self.columnCount() - 1))
+
 class RankingsFrame(QWidget):
-    def __init__(self, parent=None):
+    rankings_changed = Signal(object)  # Group key that changed, None after a full recompute
+    GROUP_RELOAD_LIMIT = 4  # Groups re-read from the store at once before a full recompute
+    DARK_TABLE_STYLE = """
+        QTableView {
+            border: 1px solid #444;
+            gridline-color: #444;
+            background-color: #2b2b2b;
+            alternate-background-color: #333333;
+        }
+        QHeaderView::section {
+            background-color: #444;
+            padding: 6px;
+            border: none;
+            border-right: 1px solid #555;
+        }
+    """
+
+    def __init__(self, parent=None, store: ScoreStore = None):
         super().__init__(parent)
+        self.store = store
         self.language = 'english'
-        self.rankings = defaultdict(list)
+        self.engine = RankingEngine()
+        self.rankings = self.engine.groups
+        self.leaderboard = Leaderboard()
+        self.rules = get_ranking_rules()
         self.participants = {}
         self.age_order = ['mini', 'kids', 'juniors', 'teens', 'adults']
-        self.category_order = ['solo', 'duo', 'team']
+        self.category_order = ['solo', 'duo', 'teams']
+        if self.store is None:
+            self.store = open_score_store('data')
+        self.store.set_rules(self.rules)
+
+        # Full recomputes run on a worker. Edits made meanwhile are replayed
+        # onto the snapshot when it arrives, a newer recompute drops older ones
+        self.generation = 0
+        self.rebuilding = False
+        self.edited_while_rebuilding = set()  # (style, start_number)
+        self.worker = RankingWorker(self.store, parent=self)
+        self.worker.finished.connect(self.apply_snapshot)
+        self.worker.failed.connect(lambda error: print(f"Error loading rankings: {error}"))
         self.setup_ui()
         self.load_participants()
         self.load_rankings()
         
     def setup_ui(self):
         layout = QVBoxLayout(self)
+
+        # Daily podium per style
+        self.podium_group = QGroupBox(TRANSLATIONS[self.language]['daily_top3'])
+        podium_layout = QVBoxLayout()
+        self.top3_labels = {}
+        for style in [Style.MODERN, Style.URBAN]:
+            label = QLabel("-")
+            podium_layout.addWidget(label)
+            self.top3_labels[style.value] = label
+        self.highest_label = QLabel("-")
+        podium_layout.addWidget(self.highest_label)
+        self.podium_group.setLayout(podium_layout)
+        layout.addWidget(self.podium_group)
         
         # Create table view
         self.table = QTableView()
@@ -98,145 +281,154 @@ class RankingsFrame(QWidget):
         self.table.horizontalHeader().setDefaultAlignment(Qt.AlignLeft)
         self.table.setSelectionMode(QTableView.NoSelection)
         self.table.setAlternatingRowColors(True)
+        self.table.clicked.connect(self.on_row_clicked)
         
         # Style the table
-        self.table.setStyleSheet("""
-            QTableView {
-                border: 1px solid #444;
-                gridline-color: #444;
-                background-color: #2b2b2b;
-                alternate-background-color: #333333;
-            }
-            QHeaderView::section {
-                background-color: #444;
-                padding: 6px;
-                border: none;
-                border-right: 1px solid #555;
-            }
-        """)
+        self.table.setStyleSheet(self.DARK_TABLE_STYLE)
         
         layout.addWidget(self.table)
 
+    def on_row_clicked(self, index):
+        # Clicking a group header collapses or expands it
+        if self.model.is_group_header(index.row()):
+            self.model.toggle_group(index.row())
+
     def load_participants(self):
         try:
-            with open('data/participants.csv', 'r') as file:
-                for line in file:
-                    participant = Participant.from_csv_line(line.strip())
-                    self.participants[participant.start_number] = participant
+            self.participants = get_participant_repository().by_start_number
             print(f"Loaded {len(self.participants)} participants")
         except Exception as e:
             print(f"Error loading participants: {str(e)}")
+        self.store.register_participants(self.participants.values())
 
     def get_participant_info(self, participant_id: int) -> Participant:
         return self.participants.get(int(participant_id))
 
     def load_rankings(self):
-        try:
-            with open('data/scores.json', 'r') as file:
-                data = json.load(file)
-                print("\nLoaded scores:")
-                for style, scores in data.items():
-                    for pid, score_data in scores.items():
-                        if 'final_total' in score_data:
-                            print(f"ID {pid}: {score_data['final_total']}")
-                
-            # Process rankings for each style
-            for style in [Style.MODERN, Style.URBAN]:
-                style_scores = data.get(style.value, {})
-                print(f"\nProcessing {style.value} scores:")
-                self.process_style_rankings(style, style_scores)
-                
-            # Update displays
-            self.update_rankings_display()
-            self.update_top3_display()
-            self.update_highest_score_display()
-                
-        except FileNotFoundError:
-            print("No scores file found")
-        except Exception as e:
-            print(f"Error loading rankings: {str(e)}")
-
-    def process_style_rankings(self, style: Style, scores: Dict):
-        # Group scores by category and age group
-        for participant_id, score_data in scores.items():
-            try:
-                participant_id = int(participant_id)
-                print(f"\nProcessing participant {participant_id}")
-                print(f"Score data: {score_data}")
-            except ValueError:
-                continue
-            
-            if 'final_total' in score_data:
-                # Get participant info from participants.csv
-                participant = self.get_participant_info(participant_id)
-                if participant:
-                    key = (style.value, participant.category.value.lower(), participant.age_group.value.lower())
-                    final_score = float(score_data['final_total'])
-                    print(f"Adding ranking for {participant.name}:")
-                    print(f"  Category: {participant.category.value}")
-                    print(f"  Age Group: {participant.age_group.value}")
-                    print(f"  Final Score: {final_score}")
-                    self.rankings[key].append(RankingEntry(
-                        start_number=participant_id,
-                        name=participant.name,
-                        category=participant.category,
-                        age_group=participant.age_group,
-                        score=final_score
-                    ))
-
-        # Sort rankings
-        for rankings in self.rankings.values():
-            rankings.sort(key=lambda x: x.score, reverse=True)
-            print(f"Sorted rankings: {[(e.name, e.score) for e in rankings]}")
+        """Recompute all rankings on the worker, the result arrives in apply_snapshot"""
+        self.generation += 1
+        self.rebuilding = True
+        self.worker.start(self.participants, self.generation)
+
+    def apply_snapshot(self, snapshot: RankingSnapshot):
+        if snapshot.generation != self.generation:
+            return  # A newer recompute was started
+        self.rebuilding = False
+        self.engine = snapshot.engine
+        self.rankings = self.engine.groups
+        self.leaderboard = snapshot.leaderboard
+
+        # The snapshot may predate these, their current scores win
+        edited, self.edited_while_rebuilding = self.edited_while_rebuilding, set()
+        for style, start_number in edited:
+            participant = self.get_participant_info(start_number)
+            if participant:
+                ranking = self.store.aggregates.ranking_key(style, start_number)
+                self.engine.update(style, participant, ranking)
+                self.leaderboard.update(style, participant, ranking)
+                self.leaderboard.update_jury_scores(style, participant,
+                                                    self.store.participant_scores(style, start_number))
+        self.rankings_changed.emit(None)
+
+        # Update displays
+        self.update_rankings_display()
+        self.update_top3_display()
+        self.update_highest_score_display()
 
     def update_rankings_display(self):
-        self.model.beginResetModel()
-        
-        # Clear existing data
-        self.model.rankings = []
-        self.model.group_headers = []
-        
-        for style in [Style.MODERN, Style.URBAN]:
-            for age in self.age_order:
-                for category in self.category_order:
-                    key = (style.value, category, age)
-                    entries = self.rankings[key]
-                    if entries:
-                        # Add group header
-                        self.model.group_headers.append(
-                            f"{age.upper()} | {category.upper()}"
-                        )
-                        # Add entries
-                        self.model.rankings.extend(sorted(
-                            entries, 
-                            key=lambda x: x.score, 
-                            reverse=True
-                        ))
-        
-        self.model.endResetModel()
+        order = [((style.value, category, age), f"{age.upper()} | {category.upper()}")
+                 for style in [Style.MODERN, Style.URBAN]
+                 for age in self.age_order
+                 for category in self.category_order]
+        self.model.set_groups(order, self.rankings)
 
     def update_top3_display(self):
-        # Top 3 display is now handled by the main rankings display
-        pass
+        for style, label in self.top3_labels.items():
+            podium = "   ".join(f"{rank}. {entry.name} ({entry.score:.1f})"
+                                for rank, entry in enumerate(self.leaderboard.style_top(style, 3), 1))
+            label.setText(f"{style.capitalize()}: {podium or '-'}")
 
     def update_highest_score_display(self):
-        highest_score = 0
-        highest_entry = None
-        
-        for entries in self.rankings.values():
-            if entries and entries[0].score > highest_score:
-                highest_score = entries[0].score
-                highest_entry = entries[0]
-        
-        if highest_entry:
-            print(f"Highest score: {highest_entry.name} - {highest_score:.1f}")
+        t = TRANSLATIONS[self.language]
+        parts = []
+        top = self.leaderboard.overall_top(1)
+        if top:
+            parts.append(f"{t['highest_score']}: {top[0].name} - {top[0].score:.1f}")
+        highest_jury = self.leaderboard.highest_jury_score()
+        if highest_jury:
+            participant, jury_id, total = highest_jury
+            parts.append(f"{t['highest_jury_total']}: {participant.name} ({t['jury_member']} {jury_id}) - {total}")
+        self.highest_label.setText("   |   ".join(parts) or "-")
+
+    def on_score_changed(self, style: str, start_number: int):
+        """Move a single participant after one of its scores changed"""
+        participant = self.get_participant_info(start_number)
+        if not participant:
+            return
+        if self.rebuilding:
+            # The recompute in flight may have missed this edit
+            self.edited_while_rebuilding.add((style, start_number))
+
+        participant_scores = self.store.participant_scores(style, start_number)
+        ranking = self.store.aggregates.ranking_key(style, start_number)
+        change = self.engine.update(style, participant, ranking)
+        if change:
+            self.model.apply_change(change)
+            self.rankings_changed.emit(change.key)
+
+        self.leaderboard.update(style, participant, ranking)
+        self.leaderboard.update_jury_scores(style, participant, participant_scores)
+        self.update_top3_display()
+        self.update_highest_score_display()
+
+    def reload_groups(self, touched):
+        """Re-read the groups of many changed (style, start_number) participants from the store"""
+        groups = {}
+        for style, start_number in touched:
+            participant = self.get_participant_info(start_number)
+            if participant:
+                groups.setdefault(RankingEngine.group_key(style, participant), []).append(participant)
+        if len(groups) > self.GROUP_RELOAD_LIMIT:
+            self.load_rankings()
+            return
+        if self.rebuilding:
+            self.edited_while_rebuilding.update((key[0], p.start_number)
+                                                for key, changed in groups.items() for p in changed)
+
+        for key, changed in groups.items():
+            style = key[0]
+            results = [(self.get_participant_info(start_number), ranking)
+                       for start_number, ranking in self.store.group_ranking(*key)]
+            results = [(participant, ranking) for participant, ranking in results if participant]
+            previous = self.engine.replace_group(key, results)
+            ranked = {participant.start_number for participant, _ in results}
+            for entry in previous:
+                if entry.start_number not in ranked:
+                    self.leaderboard.update(style, self.get_participant_info(entry.start_number), None)
+            for participant, ranking in results:
+                self.leaderboard.update(style, participant, ranking)
+            for participant in changed:
+                self.leaderboard.update_jury_scores(style, participant,
+                                                    self.store.participant_scores(style, participant.start_number))
+
+        self.update_rankings_display()
+        for key in groups:
+            self.rankings_changed.emit(key)
+        self.update_top3_display()
+        self.update_highest_score_display()
 
     def refresh_rankings(self):
         """Reload and redisplay all rankings"""
-        self.rankings.clear()  # Clear existing rankings
-        self.load_rankings()   # Reload from scores.json 
+        self.load_rankings()   # Rebuild from the shared score store
+
+    def update_theme(self, is_dark: bool):
+        self.table.setStyleSheet(self.DARK_TABLE_STYLE if is_dark else "")
+        self.model.is_dark = is_dark
+        self.table.viewport().update()
 
     def update_language(self, lang):
         self.language = lang
         # Update any text that needs translation
+        self.podium_group.setTitle(TRANSLATIONS[lang]['daily_top3'])
+        self.update_highest_score_display()
         self.update_rankings_display() 
\ No newline at end of file
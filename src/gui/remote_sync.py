@@ -0,0 +1,55 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from src.utils.remote_store import RemoteScoreStore
+import threading
+
+RETRY_SECONDS = 2.0
+
+class _PollTask(QRunnable):
+    def __init__(self, sync: 'RemoteSync'):
+        super().__init__()
+        self.sync = sync
+
+    def run(self):
+        self.sync.poll_loop()
+
+class RemoteSync(QObject):
+    """Follows the score changes other devices make on the scoring server.
+
+    A worker thread long-polls the server and hands what it gets to the GUI
+    thread, which applies it to the shared store.
+    """
+    received = Signal(object)  # List of changes
+    reloaded = Signal(object)  # All scores, after the server lost track of this client
+    failed = Signal(str)
+
+    def __init__(self, store: RemoteScoreStore, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._stopped = threading.Event()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+    def start(self):
+        self._stopped.clear()
+        self.pool.start(_PollTask(self))
+
+    def poll_loop(self):
+        while not self._stopped.is_set():
+            try:
+                changes = self.store.fetch_changes()
+                if changes is None:
+                    self.reloaded.emit(self.store.fetch_scores())
+                elif changes:
+                    self.received.emit(changes)
+            except Exception as e:
+                if self._stopped.is_set():
+                    return
+                self.failed.emit(str(e))
+                self._stopped.wait(RETRY_SECONDS)
+
+    def stop(self):
+        """Stop polling, closing the store ends a poll in flight"""
+        self._stopped.set()
+
+    def wait(self):
+        self.pool.waitForDone()
@@ -0,0 +1,38 @@
+from PySide6.QtCore import QObject, QTimer
+from src.utils.results_broadcast import ResultsBroadcaster
+from src.utils.results_feed import ResultsFeed
+
+class ResultsPublisher(QObject):
+    """Feeds the rankings to the results broadcaster, a few updates per second at most.
+
+    Changed groups are collected from the rankings frame and compared with
+    what was published when the throttle timer fires, so a burst of edits
+    goes out as one update with only the rows that moved.
+    """
+
+    def __init__(self, broadcaster: ResultsBroadcaster, interval_ms: int = 250, parent=None):
+        super().__init__(parent)
+        self.broadcaster = broadcaster
+        self.feed = ResultsFeed()
+        self.groups = lambda: {}
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def follow(self, rankings_frame):
+        self.groups = lambda: rankings_frame.rankings
+        rankings_frame.rankings_changed.connect(self.mark)
+        self.mark(None)
+
+    def mark(self, key):
+        self.feed.mark(key)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        self.broadcaster.publish(self.feed.changes(self.groups()))
+
+    def stop(self):
+        self.timer.stop()
+        self.broadcaster.stop()
@@ -0,0 +1,68 @@
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PySide6.QtGui import QColor, QBrush
+from src.models.participant import Participant
+from array import array
+from typing import Dict, List
+
+MISSING, PARTIAL, SCORED = 0, 1, 2
+
+STATUS_TEXT = {MISSING: 'missing', PARTIAL: 'partial', SCORED: 'scored'}
+STATUS_MARK = {MISSING: '○', PARTIAL: '◐', SCORED: '●'}
+STATUS_COLORS = {
+    MISSING: QBrush(QColor('#888888')),
+    PARTIAL: QBrush(QColor('#e0a040')),
+    SCORED: QBrush(QColor('#60c060')),
+}
+
+class RunningOrderModel(QAbstractListModel):
+    """Participants of one style in running order with their scoring status.
+
+    Statuses are one byte per participant, filled once from the scores and
+    then changed one row at a time as scores are saved. Rows are formatted
+    on demand, so only the rows a view shows cost anything.
+    """
+
+    def __init__(self, participants: List[Participant], jury_count: int, parent=None):
+        super().__init__(parent)
+        self.participants = participants
+        self.jury_count = jury_count
+        self.statuses = array('B', bytes(len(participants)))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.participants)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        participant = self.participants[index.row()]
+        status = self.statuses[index.row()]
+
+        if role == Qt.DisplayRole:
+            return (f"{STATUS_MARK[status]}  {participant.start_number:>4}  {participant.name}  "
+                    f"({participant.category.value} / {participant.age_group.value})")
+        elif role == Qt.ForegroundRole:
+            return STATUS_COLORS[status]
+        elif role == Qt.ToolTipRole:
+            return STATUS_TEXT[status]
+        return None
+
+    def status_of(self, participant_scores: Dict) -> int:
+        jury_scores = sum(1 for key in participant_scores if key != 'final_total')
+        if jury_scores == 0:
+            return MISSING
+        return SCORED if jury_scores >= self.jury_count else PARTIAL
+
+    def load_statuses(self, style_scores: Dict[str, Dict]):
+        """Fill every status from one style's scores"""
+        self.beginResetModel()
+        self.statuses = array('B', (self.status_of(style_scores.get(str(p.start_number), {}))
+                                    for p in self.participants))
+        self.endResetModel()
+
+    def update_status(self, row: int, participant_scores: Dict):
+        """Recompute one participant's status after its scores changed"""
+        status = self.status_of(participant_scores)
+        if self.statuses[row] != status:
+            self.statuses[row] = status
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.ForegroundRole, Qt.ToolTipRole])
@@ -0,0 +1,107 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from src.utils.score_store import ChangesRejected, ScoreStore
+from typing import Dict, Tuple
+import threading
+
+class _CommitTask(QRunnable):
+    def __init__(self, saver: 'ScoreSaver'):
+        super().__init__()
+        self.saver = saver
+
+    def run(self):
+        self.saver.commit_pending()
+
+class ScoreSaver(QObject):
+    """Write-behind persistence of score changes on a worker thread.
+
+    Changes are applied to the store's in-memory scores right away and
+    written to disk shortly after. Repeated edits of the same jury entry
+    within one burst are merged into a single record.
+    """
+    saved = Signal(int)  # Number of records committed
+    failed = Signal(str)
+    rejected = Signal(object)  # Changes restoring the stored values of refused edits
+
+    def __init__(self, store: ScoreStore, delay_ms: int = 200, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._pending: Dict[Tuple[str, str, str], tuple] = {}
+        self._writing: Dict[Tuple[str, str, str], tuple] = {}  # Being written right now
+        self._lock = threading.Lock()
+        self._running = False
+
+        # One worker keeps commits in order
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.start_commit)
+
+    def submit(self, changes):
+        self.store.apply(changes)
+        with self._lock:
+            for change in changes:
+                self._pending[change[:3]] = change
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def start_commit(self):
+        with self._lock:
+            if self._running or not self._pending:
+                return
+            self._running = True
+        self.pool.start(_CommitTask(self))
+
+    def commit_pending(self):
+        # Keep draining so edits made during a slow write go out next
+        while True:
+            with self._lock:
+                self._writing.clear()
+                if not self._pending:
+                    self._running = False
+                    return
+                self._writing.update(self._pending)
+                self._pending.clear()
+                changes = list(self._writing.values())
+            try:
+                self.store.write(changes)
+            except ChangesRejected as e:
+                # Retrying cannot help and would hold back every later edit
+                self.failed.emit(str(e))
+                self.restore(changes)
+                continue
+            except Exception as e:
+                # Keep the changes (unless edited again since) for the next commit
+                with self._lock:
+                    for change in changes:
+                        self._pending.setdefault(change[:3], change)
+                    self._writing.clear()
+                    self._running = False
+                self.failed.emit(str(e))
+                return
+            self.saved.emit(len(changes))
+
+    def restore(self, changes):
+        """Show the stored values again where refused edits were not edited since"""
+        with self._lock:
+            self._writing.clear()
+            keys = [change[:3] for change in changes if change[:3] not in self._pending]
+        if not keys:
+            return
+        try:
+            self.rejected.emit(self.store.stored_entries(keys))
+        except Exception as e:
+            self.failed.emit(f"Could not reload the refused scores: {e}")
+
+    def unsaved(self, keys):
+        """The (style, start_number, key) entries among keys with edits not yet written"""
+        with self._lock:
+            return {key for key in keys if key in self._pending or key in self._writing}
+
+    def flush(self):
+        """Write everything still pending before shutting down"""
+        self.timer.stop()
+        self.pool.waitForDone()
+        self.commit_pending()
@@ -0,0 +1,56 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from src.utils.score_store import ScoreStore
+import threading
+
+class _SyncTask(QRunnable):
+    def __init__(self, sync: 'StationSync'):
+        super().__init__()
+        self.sync = sync
+
+    def run(self):
+        self.sync.sync_once()
+
+class StationSync(QObject):
+    """Follows the scores other stations sharing the data directory write.
+
+    A timer hands ``store.sync`` to a worker thread, where it may wait for the
+    journal locks, and what it applied arrives on the GUI thread through
+    ``received``. Ticks are skipped while a sync is still running.
+    """
+    received = Signal(object)  # List of changes, already applied to the store
+    failed = Signal(str)
+
+    def __init__(self, store: ScoreStore, interval_ms: int, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._busy = threading.Event()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self.timer.start()
+
+    def tick(self):
+        if self._busy.is_set():
+            return
+        self._busy.set()
+        self.pool.start(_SyncTask(self))
+
+    def sync_once(self):
+        try:
+            changes = self.store.sync()
+            if changes:
+                self.received.emit(changes)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self._busy.clear()
+
+    def stop(self):
+        self.timer.stop()
+
+    def wait(self):
+        self.pool.waitForDone()
@@ -1,40 +1,81 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                               QLabel, QSpinBox, QPushButton, QGroupBox,
-                              QFrame, QMessageBox, QSizePolicy)
+                              QFrame, QMessageBox, QSizePolicy, QLineEdit,
+                              QComboBox, QListWidget, QListWidgetItem, QListView)
 from PySide6.QtCore import Signal, Qt
-from src.models.category import Style
+from src.models.category import Style, Category, AgeGroup
 from src.models.jury import JuryMember
-from src.models.participant import Participant
+from src.models.participant_repository import get_participant_repository
 from src.utils.translations import TRANSLATIONS
-import json
+from src.models.score import CRITERIA
+from src.utils.participant_search import ParticipantSearch
+from src.utils.ranking_rules import get_ranking_rules, load_jury_members
+from src.utils.score_store import ScoreStore, open_score_store
+from .running_order import RunningOrderModel
+from .score_saver import ScoreSaver
+from contextlib import contextmanager
 
 class ScoreInput(QSpinBox):
+    DARK_STYLE = """
+        QSpinBox {
+            background-color: #333;
+            color: white;
+            border: 1px solid #555;
+            padding: 5px;
+            min-width: 60px;
+        }
+        QSpinBox:focus {
+            border: 1px solid #666;
+        }
+    """
+
     def __init__(self, max_value=30, parent=None):
         super().__init__(parent)
         self.setRange(0, max_value)
-        self.setStyleSheet("""
-            QSpinBox {
-                background-color: #333;
-                color: white;
-                border: 1px solid #555;
-                padding: 5px;
-                min-width: 60px;
-            }
-            QSpinBox:focus {
-                border: 1px solid #666;
-            }
-        """)
+        self.setStyleSheet(self.DARK_STYLE)
 
 class StyleFrame(QWidget):
-    scores_updated = Signal()
-
-    def __init__(self, style: Style, parent=None):
+    scores_updated = Signal(str, int)  # style, start number
+    bulk_committed = Signal(str, list)  # style and start numbers, after a grid commit
+    SEARCH_LIMIT = 50  # Results listed per query
+    DARK_STYLE = """
+        QGroupBox {
+            border: 1px solid #444;
+            margin-top: 1ex;
+            padding: 10px;
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 3px;
+        }
+        QPushButton {
+            background-color: #444;
+            color: white;
+            border: none;
+            padding: 8px 16px;
+            min-width: 100px;
+        }
+        QPushButton:hover {
+            background-color: #555;
+        }
+        QLabel {
+            color: white;
+        }
+    """
+
+    def __init__(self, style: Style, parent=None, store: ScoreStore = None,
+                 saver: ScoreSaver = None):
         super().__init__(parent)
         self.style = style
+        self.store = store
+        self.saver = saver
         self.current_participant_idx = 0
         self.participants = []
+        self.search = ParticipantSearch([])
         self.jury_members = []
         self.scores = {}
+        self.rules = get_ranking_rules()
         
         self.load_jury_members()
         self.load_participants()
@@ -42,7 +83,19 @@ class StyleFrame(QWidget):
         self.load_scores()
 
     def setup_ui(self):
-        layout = QVBoxLayout(self)
+        outer_layout = QHBoxLayout(self)
+
+        # Running order beside the scoring panel, uniform rows keep it virtual
+        self.running_order = RunningOrderModel(self.participants, len(self.jury_members), self)
+        self.running_order_view = QListView()
+        self.running_order_view.setModel(self.running_order)
+        self.running_order_view.setUniformItemSizes(True)
+        self.running_order_view.setMaximumWidth(340)
+        self.running_order_view.clicked.connect(lambda index: self.go_to_participant(index.row()))
+        outer_layout.addWidget(self.running_order_view)
+
+        layout = QVBoxLayout()
+        outer_layout.addLayout(layout, 1)
 
         # Navigation
         nav_layout = QHBoxLayout()
@@ -52,8 +105,42 @@ class StyleFrame(QWidget):
         self.next_button.clicked.connect(self.next_participant)
         nav_layout.addWidget(self.prev_button)
         nav_layout.addWidget(self.next_button)
+        self.grid_button = QPushButton("Grid entry")
+        self.grid_button.clicked.connect(self.open_bulk_entry)
+        nav_layout.addWidget(self.grid_button)
         layout.addLayout(nav_layout)
 
+        # Jump to a participant by start number or name
+        t = TRANSLATIONS['english']
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText(t['search_placeholder'])
+        self.search_input.setClearButtonEnabled(True)
+        self.category_filter = QComboBox()
+        self.category_filter.addItem(t['all_categories'], None)
+        for category in Category:
+            self.category_filter.addItem(category.value.capitalize(), category)
+        self.age_group_filter = QComboBox()
+        self.age_group_filter.addItem(t['all_age_groups'], None)
+        for age_group in AgeGroup:
+            self.age_group_filter.addItem(age_group.value.capitalize(), age_group)
+        search_layout.addWidget(self.search_input, 1)
+        search_layout.addWidget(self.category_filter)
+        search_layout.addWidget(self.age_group_filter)
+        layout.addLayout(search_layout)
+
+        self.search_results = QListWidget()
+        self.search_results.setMaximumHeight(120)
+        self.search_results.hide()
+        layout.addWidget(self.search_results)
+
+        self.search_input.textChanged.connect(self.update_search_results)
+        self.search_input.returnPressed.connect(self.jump_to_first_result)
+        self.category_filter.currentIndexChanged.connect(self.update_search_results)
+        self.age_group_filter.currentIndexChanged.connect(self.update_search_results)
+        self.search_results.itemActivated.connect(self.jump_to_result)
+        self.search_results.itemClicked.connect(self.jump_to_result)
+
         # Participant Info
         info_group = QGroupBox("Participant Info")
         info_layout = QGridLayout()
@@ -79,8 +166,8 @@ class StyleFrame(QWidget):
         scoring_layout = QGridLayout()
 
         # Headers
-        headers = ['Jury', 'Technique (30)', 'Choreography (30)', 
-                  'Performance (30)', 'Expression (10)', 'Total']
+        headers = ['Jury', *(f"{criterion.capitalize()} ({self.rules.maxima[criterion]})"
+                             for criterion in CRITERIA), 'Total']
         for col, header in enumerate(headers):
             label = QLabel(header)
             label.setAlignment(Qt.AlignCenter)
@@ -92,9 +179,8 @@ class StyleFrame(QWidget):
             scoring_layout.addWidget(QLabel(jury.name), row, 0)
             
             row_inputs = []
-            for col in range(4):
-                max_score = 10 if col == 3 else 30
-                score_input = ScoreInput(max_score)
+            for col, criterion in enumerate(CRITERIA):
+                score_input = ScoreInput(self.rules.maxima[criterion])
                 score_input.valueChanged.connect(self.calculate_scores)
                 scoring_layout.addWidget(score_input, row, col + 1)
                 row_inputs.append(score_input)
@@ -115,88 +201,54 @@ class StyleFrame(QWidget):
         layout.addWidget(scoring_group)
 
         # Style
-        self.setStyleSheet("""
-            QGroupBox {
-                border: 1px solid #444;
-                margin-top: 1ex;
-                padding: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px;
-            }
-            QPushButton {
-                background-color: #444;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                min-width: 100px;
-            }
-            QPushButton:hover {
-                background-color: #555;
-            }
-            QLabel {
-                color: white;
-            }
-        """)
+        self.setStyleSheet(self.DARK_STYLE)
 
         self.update_display()
+        self.update_navigation()
 
     def load_jury_members(self):
         try:
-            with open('data/jury_config.json', 'r') as f:
-                data = json.load(f)
-                self.jury_members = [
-                    JuryMember(member['id'], member['name'])
-                    for member in data.get('jury_members', [])
-                ]
+            self.jury_members = [
+                JuryMember(member['id'], member['name'], self.style.value)
+                for member in load_jury_members()
+            ]
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", f"Could not load jury members: {e}")
+            self.jury_members = []
         except Exception as e:
             print(f"Error loading jury members: {e}")
             self.jury_members = []
 
     def load_participants(self):
         try:
-            with open('data/participants.csv', 'r') as f:
-                self.participants = []
-                for line in f:
-                    participant = Participant.from_csv_line(line.strip())
-                    if participant.style == self.style:
-                        self.participants.append(participant)
-            self.update_navigation()
+            self.participants = get_participant_repository().for_style(self.style)
+            self.search = ParticipantSearch(self.participants)
         except Exception as e:
             print(f"Error loading participants: {e}")
 
     def load_scores(self):
         try:
-            with open('data/scores.json', 'r') as f:
-                data = json.load(f)
-                self.scores = data.get(self.style.value, {})
-        except FileNotFoundError:
-            self.scores = {}
+            if self.store is None:
+                self.store = open_score_store('data')
+            # Shared with the store, which applies every saved change to it
+            self.scores = self.store.style_scores(self.style.value)
         except Exception as e:
             print(f"Error loading scores: {e}")
             self.scores = {}
-        
+
+        self.running_order.load_statuses(self.scores)
         self.update_display()
 
-    def save_scores(self):
+    def save_scores(self, changes):
         try:
-            # Load existing scores
-            try:
-                with open('data/scores.json', 'r') as f:
-                    all_scores = json.load(f)
-            except FileNotFoundError:
-                all_scores = {}
-
-            # Update scores for this style
-            all_scores[self.style.value] = self.scores
-
-            # Save back to file
-            with open('data/scores.json', 'w') as f:
-                json.dump(all_scores, f, indent=2)
-
-            self.scores_updated.emit()
+            # Only the changed jury entries are written
+            if self.saver is not None:
+                self.saver.submit(changes)
+            else:
+                self.store.append(changes)
+            for start_number in {change[1] for change in changes}:
+                self.update_status(start_number)
+                self.scores_updated.emit(self.style.value, int(start_number))
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Could not save scores: {str(e)}")
 
@@ -207,26 +259,54 @@ class StyleFrame(QWidget):
         participant = self.participants[self.current_participant_idx]
         participant_scores = {}
 
+        self.update_totals()
         for jury_id, inputs in self.score_inputs.items():
             if all(input.value() > 0 for input in inputs[:-1]):  # Exclude total label
-                total = sum(input.value() for input in inputs[:-1])
-                inputs[-1].setText(f"{total:.1f}")  # Update total label
-                participant_scores[str(jury_id)] = {
-                    'technique': inputs[0].value(),
-                    'choreography': inputs[1].value(),
-                    'performance': inputs[2].value(),
-                    'expression': inputs[3].value(),
-                    'total': total
-                }
+                jury_score = {criterion: input.value() for criterion, input in zip(CRITERIA, inputs)}
+                jury_score['total'] = sum(jury_score.values())
+                participant_scores[str(jury_id)] = jury_score
 
         if participant_scores:
             # Calculate final total if all jury members have scored
-            if len(participant_scores) == len(self.jury_members):
-                final_total = sum(s['total'] for s in participant_scores.values()) / len(participant_scores)
-                participant_scores['final_total'] = final_total
+            total = self.rules.final_total(participant_scores, len(self.jury_members))
+            if total is not None:
+                participant_scores['final_total'] = total
+
+            start_number = str(participant.start_number)
+            changes = ScoreStore.diff(self.style.value, start_number,
+                                        self.scores.get(start_number, {}), participant_scores)
+            if changes:
+                self.save_scores(changes)
+
+    def open_bulk_entry(self):
+        from .bulk_entry import BulkEntryDialog
+        dialog = BulkEntryDialog(self.style, self.jury_members, self.store, self.rules,
+                                 saver=self.saver, parent=self)
+        current = self.participants[self.current_participant_idx] if self.participants else None
+        if current is not None:
+            dialog.category_combo.setCurrentIndex(dialog.category_combo.findData(current.category))
+            dialog.age_group_combo.setCurrentIndex(dialog.age_group_combo.findData(current.age_group))
+        dialog.committed.connect(self.on_bulk_committed)
+        dialog.exec()
+
+    def on_bulk_committed(self, start_numbers):
+        for start_number in start_numbers:
+            self.update_status(start_number)
+        self.update_display()
+        self.bulk_committed.emit(self.style.value, list(start_numbers))
 
-            self.scores[str(participant.start_number)] = participant_scores
-            self.save_scores()
+    def on_external_changes(self, start_numbers):
+        """Show scores another device changed, already applied to the store"""
+        for start_number in start_numbers:
+            self.update_status(start_number)
+        if self.participants and str(self.participants[self.current_participant_idx].start_number) in start_numbers:
+            self.update_display()
+
+    def update_status(self, start_number):
+        """Refresh one participant's running order status"""
+        position = self.search.position(start_number)
+        if position is not None:
+            self.running_order.update_status(position, self.scores.get(str(start_number), {}))
 
     def update_display(self):
         if not self.participants:
@@ -234,6 +314,9 @@ class StyleFrame(QWidget):
             return
 
         participant = self.participants[self.current_participant_idx]
+        current = self.running_order.index(self.current_participant_idx)
+        self.running_order_view.setCurrentIndex(current)
+        self.running_order_view.scrollTo(current)
         
         # Update info labels
         self.start_number_label.setText(str(participant.start_number))
@@ -244,13 +327,14 @@ class StyleFrame(QWidget):
         # Load existing scores
         participant_scores = self.scores.get(str(participant.start_number), {})
         
-        # Update score inputs
-        for jury_id, inputs in self.score_inputs.items():
-            jury_scores = participant_scores.get(str(jury_id), {})
-            inputs[0].setValue(jury_scores.get('technique', 0))
-            inputs[1].setValue(jury_scores.get('choreography', 0))
-            inputs[2].setValue(jury_scores.get('performance', 0))
-            inputs[3].setValue(jury_scores.get('expression', 0))
+        # Update score inputs without saving after every field
+        with self.bulk_update():
+            for jury_id, inputs in self.score_inputs.items():
+                jury_scores = participant_scores.get(str(jury_id), {})
+                inputs[0].setValue(jury_scores.get('technique', 0))
+                inputs[1].setValue(jury_scores.get('choreography', 0))
+                inputs[2].setValue(jury_scores.get('performance', 0))
+                inputs[3].setValue(jury_scores.get('expression', 0))
 
     def clear_display(self):
         self.start_number_label.setText("-")
@@ -258,9 +342,28 @@ class StyleFrame(QWidget):
         self.category_label.setText("-")
         self.age_group_label.setText("-")
         
+        with self.bulk_update():
+            for inputs in self.score_inputs.values():
+                for input in inputs[:-1]:
+                    input.setValue(0)
+
+    @contextmanager
+    def bulk_update(self):
+        """Fill in score inputs without a save and ranking refresh per field"""
+        spin_boxes = [input for inputs in self.score_inputs.values() for input in inputs[:-1]]
+        was_blocked = [spin_box.blockSignals(True) for spin_box in spin_boxes]
+        try:
+            yield
+        finally:
+            for spin_box, blocked in zip(spin_boxes, was_blocked):
+                spin_box.blockSignals(blocked)
+            self.update_totals()
+
+    def update_totals(self):
         for inputs in self.score_inputs.values():
-            for input in inputs:
-                input.setValue(0)
+            values = [input.value() for input in inputs[:-1]]
+            total = sum(values) if all(values) else 0
+            inputs[-1].setText(f"{total:.1f}")
 
     def update_navigation(self):
         self.prev_button.setEnabled(self.current_participant_idx > 0)
@@ -278,7 +381,47 @@ class StyleFrame(QWidget):
             self.update_display()
             self.update_navigation()
 
+    def update_search_results(self):
+        """List the participants matching the search box and filters"""
+        text = self.search_input.text()
+        category = self.category_filter.currentData()
+        age_group = self.age_group_filter.currentData()
+        self.search_results.clear()
+        if not text.strip() and category is None and age_group is None:
+            self.search_results.hide()
+            return
+
+        for position in self.search.search(text, category, age_group, limit=self.SEARCH_LIMIT):
+            participant = self.participants[position]
+            item = QListWidgetItem(f"{participant.start_number} - {participant.name} "
+                                   f"({participant.category.value}, {participant.age_group.value})")
+            item.setData(Qt.UserRole, position)
+            self.search_results.addItem(item)
+        self.search_results.show()
+
+    def jump_to_first_result(self):
+        if self.search_results.count():
+            self.jump_to_result(self.search_results.item(0))
+
+    def jump_to_result(self, item):
+        self.go_to_participant(item.data(Qt.UserRole))
+
+    def go_to_participant(self, position: int):
+        if 0 <= position < len(self.participants) and position != self.current_participant_idx:
+            self.current_participant_idx = position
+            self.update_display()
+            self.update_navigation()
+
+    def update_theme(self, is_dark: bool):
+        """The light theme is Qt's default look"""
+        self.setStyleSheet(self.DARK_STYLE if is_dark else "")
+        for score_input in self.findChildren(ScoreInput):
+            score_input.setStyleSheet(ScoreInput.DARK_STYLE if is_dark else "")
+
     def update_language(self, lang):
         t = TRANSLATIONS[lang]
         self.prev_button.setText(t['previous'])
-        self.next_button.setText(t['next'])
\ No newline at end of file
+        self.next_button.setText(t['next'])
+        self.search_input.setPlaceholderText(t['search_placeholder'])
+        self.category_filter.setItemText(0, t['all_categories'])
+        self.age_group_filter.setItemText(0, t['all_age_groups'])
\ No newline at end of file
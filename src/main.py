@@ -1,12 +1,23 @@
 import sys
-from PySide6.QtWidgets import QApplication
-from src.gui.main_window import MainWindow
+from src.utils.startup_profile import profiler
 
 def main():
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
+    argv = profiler.enable_from(sys.argv)
+    with profiler.phase('import Qt'):
+        from PySide6.QtCore import QTimer
+        from PySide6.QtWidgets import QApplication
+    with profiler.phase('import application'):
+        from src.gui.main_window import MainWindow
+
+    with profiler.phase('create application'):
+        app = QApplication(argv)
+    with profiler.phase('main window'):
+        window = MainWindow()
+        window.show()
+
+    # Reported from the event loop, after the first paint
+    QTimer.singleShot(0, profiler.report)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
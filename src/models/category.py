@@ -18,4 +18,9 @@ class Style(Enum):
 class Category(Enum):
     SOLO = "solo"
     DUO = "duo"
-    TEAMS = "teams" 
\ No newline at end of file
+    TEAMS = "teams" 
+
+# Declaration order of each enum, precomputed for sort keys
+STYLE_ORDER = {style: i for i, style in enumerate(Style)}
+CATEGORY_ORDER = {category: i for i, category in enumerate(Category)}
+AGE_GROUP_ORDER = {age_group: i for i, age_group in enumerate(AgeGroup)}
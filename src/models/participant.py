@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import List
-from .category import AgeGroup, Style, Category
+from .category import AgeGroup, Style, Category, STYLE_ORDER, CATEGORY_ORDER, AGE_GROUP_ORDER
 from itertools import count
 
 @dataclass
@@ -33,9 +33,12 @@ class Participant:
                     participants.append(cls.from_csv_line(line))
         
         # Sort by the hierarchical order
-        return sorted(participants, key=lambda p: (
-            p.style.value,  # Modern first, then Urban
-            [ag.value for ag in AgeGroup].index(p.age_group.value),  # Age group order
-            [c.value for c in Category].index(p.category.value),  # Category order
-            p.start_number  # Finally by ID
-        )) 
\ No newline at end of file
+        return sorted(participants, key=cls.sort_key)
+
+    def sort_key(self) -> tuple:
+        return (
+            STYLE_ORDER[self.style],  # Modern first, then Urban
+            AGE_GROUP_ORDER[self.age_group],  # Age group order
+            CATEGORY_ORDER[self.category],  # Category order
+            self.start_number  # Finally by ID
+        ) 
\ No newline at end of file
@@ -0,0 +1,106 @@
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterator, Optional, Tuple
+from .category import AgeGroup, Style, Category
+from .participant import Participant
+from .participant_table import AGE_GROUPS, CATEGORIES, STYLES, ParticipantTable
+import threading
+
+GroupKey = Tuple[Style, Category, AgeGroup]
+
+class ParticipantRows(Sequence):
+    """Participants of some rows of a table, built from the columns when accessed"""
+
+    def __init__(self, table: ParticipantTable, rows: array):
+        self.table = table
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return ParticipantRows(self.table, self.rows[position])
+        return self.table[self.rows[position]]
+
+    def __iter__(self) -> Iterator[Participant]:
+        table = self.table
+        return (table[row] for row in self.rows)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+class StartNumberIndex(Mapping):
+    """Start number to Participant, backed by the table rows"""
+
+    def __init__(self, table: ParticipantTable):
+        self.table = table
+        self.rows: Dict[int, int] = table.rows_by_start_number()
+
+    def __getitem__(self, start_number) -> Participant:
+        row = self.table.row_of(start_number)
+        if row is None:
+            raise KeyError(start_number)
+        return self.table[row]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+class ParticipantRepository:
+    """All participants of an event, stored in columns and indexed by row.
+
+    The indexes hold row numbers in running order, ``Participant`` objects
+    are only built for the participants that are looked at.
+    """
+
+    def __init__(self, table: ParticipantTable):
+        self.table = table
+        self.by_start_number = StartNumberIndex(table)
+        self.by_style: Dict[Style, ParticipantRows] = {}
+        self.by_group: Dict[GroupKey, ParticipantRows] = {}
+
+        # Groups come out of the sorted rows in running order as well
+        style_rows: Dict[Style, array] = {}
+        for (style, category, age_group), rows in table.group_rows(table.sorted_rows()).items():
+            style = STYLES[style]
+            self.by_group[(style, CATEGORIES[category], AGE_GROUPS[age_group])] = ParticipantRows(table, rows)
+            style_rows.setdefault(style, array('l')).extend(rows)
+        for style, rows in style_rows.items():
+            self.by_style[style] = ParticipantRows(table, rows)
+
+    @classmethod
+    def from_csv(cls, file_path: str) -> 'ParticipantRepository':
+        return cls(ParticipantTable.from_csv(file_path))
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __iter__(self) -> Iterator[Participant]:
+        return iter(self.table)
+
+    def get(self, start_number) -> Optional[Participant]:
+        return self.by_start_number.get(int(start_number))
+
+    def for_style(self, style: Style) -> Sequence:
+        """Participants of one style in running order"""
+        return self.by_style.get(style, [])
+
+    def for_group(self, style: Style, category: Category, age_group: AgeGroup) -> Sequence:
+        return self.by_group.get((style, category, age_group), [])
+
+
+_repositories: Dict[str, ParticipantRepository] = {}
+_repositories_lock = threading.Lock()
+
+def get_participant_repository(file_path: str = 'data/participants.csv') -> ParticipantRepository:
+    """The process-wide repository for a participants file, loaded on first use"""
+    with _repositories_lock:
+        repository = _repositories.get(file_path)
+        if repository is None:
+            repository = _repositories[file_path] = ParticipantRepository.from_csv(file_path)
+        return repository
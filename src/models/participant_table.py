@@ -0,0 +1,108 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .category import AgeGroup, Style, Category, STYLE_ORDER, CATEGORY_ORDER, AGE_GROUP_ORDER
+from .participant import Participant
+import sys
+
+STYLES = list(Style)
+CATEGORIES = list(Category)
+AGE_GROUPS = list(AgeGroup)
+
+# Enum lookups by the value used in participants.csv
+STYLE_BY_VALUE = {style.value: STYLE_ORDER[style] for style in Style}
+CATEGORY_BY_VALUE = {category.value: CATEGORY_ORDER[category] for category in Category}
+AGE_GROUP_BY_VALUE = {age_group.value: AGE_GROUP_ORDER[age_group] for age_group in AgeGroup}
+
+def iter_csv_rows(file_path: str) -> Iterator[Tuple[int, int, int, int, str]]:
+    """Stream (style, category, age_group, start_number, name) ordinal rows from a participants CSV.
+
+    Lines that do not parse are reported and skipped.
+    """
+    with open(file_path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                style, category, age_group, start_number, name = line.strip().split(',')
+                if not start_number.strip():
+                    raise ValueError("Start number is mandatory - it determines performance order")
+                yield (STYLE_BY_VALUE[style.strip()], CATEGORY_BY_VALUE[category.strip()],
+                       AGE_GROUP_BY_VALUE[age_group.strip()], int(start_number), name.strip())
+            except (ValueError, KeyError) as e:
+                print(f"Skipping participants line {line_number}: {e}")
+
+class ParticipantTable:
+    """Column-oriented participant storage for festival-scale registrations.
+
+    Enums are stored as ordinals in byte arrays, start numbers in an integer
+    array and names are interned. Indexing returns a ``Participant`` built
+    from the columns on access.
+    """
+
+    def __init__(self):
+        self.styles = array('B')
+        self.categories = array('B')
+        self.age_groups = array('B')
+        self.start_numbers = array('q')
+        self.names: List[str] = []
+        self._rows_by_start_number: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def from_csv(cls, file_path: str) -> 'ParticipantTable':
+        table = cls()
+        for row in iter_csv_rows(file_path):
+            table.append(*row)
+        return table
+
+    def append(self, style: int, category: int, age_group: int, start_number: int, name: str):
+        self.styles.append(style)
+        self.categories.append(category)
+        self.age_groups.append(age_group)
+        self.start_numbers.append(start_number)
+        self.names.append(sys.intern(name))
+        self._rows_by_start_number = None
+
+    def __len__(self) -> int:
+        return len(self.start_numbers)
+
+    def __getitem__(self, row: int) -> Participant:
+        return Participant(
+            start_number=self.start_numbers[row],
+            name=self.names[row],
+            style=STYLES[self.styles[row]],
+            category=CATEGORIES[self.categories[row]],
+            age_group=AGE_GROUPS[self.age_groups[row]]
+        )
+
+    def __iter__(self) -> Iterator[Participant]:
+        return (self[row] for row in range(len(self)))
+
+    def rows_by_start_number(self) -> Dict[int, int]:
+        """Row of every start number, built on first use"""
+        if self._rows_by_start_number is None:
+            self._rows_by_start_number = {n: row for row, n in enumerate(self.start_numbers)}
+        return self._rows_by_start_number
+
+    def row_of(self, start_number: int) -> Optional[int]:
+        return self.rows_by_start_number().get(start_number)
+
+    def sort_key(self, row: int) -> int:
+        """Participant.sort_key packed into one integer"""
+        return (((self.styles[row] << 4 | self.age_groups[row]) << 4 | self.categories[row]) << 40
+                | self.start_numbers[row])
+
+    def sorted_rows(self) -> List[int]:
+        """Rows in running order: style, age group, category, start number"""
+        return sorted(range(len(self)), key=self.sort_key)
+
+    def group_rows(self, rows: Optional[Iterable[int]] = None) -> Dict[Tuple[int, int, int], array]:
+        """Rows of every (style, category, age_group) ordinal group, in the order given (table order by default)"""
+        groups: Dict[Tuple[int, int, int], array] = {}
+        styles, categories, age_groups = self.styles, self.categories, self.age_groups
+        for row in range(len(self)) if rows is None else rows:
+            key = (styles[row], categories[row], age_groups[row])
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = array('l')
+            group.append(row)
+        return groups
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Tuple
+from .category import AgeGroup, Category
+
+@dataclass
+class RankingEntry:
+    start_number: int
+    name: str
+    category: Category
+    age_group: AgeGroup
+    score: float  # Final total, rounded for display
+    key: Tuple[int, ...] = ()  # Exact ranking key: scaled final total, then the ex aequo means
@@ -1,15 +1,21 @@
 from dataclasses import dataclass
 
+# Criterion order used by every score representation
+CRITERIA = ('technique', 'choreography', 'performance', 'expression')
+
 @dataclass
 class Score:
     participant_id: int  # start_number
-    jury_id: int
+    jury_member: int
     technique: int
     choreography: int
     performance: int
     expression: int
-    total: float
 
     @property
-    def total(self) -> float:
-        return self.technique + self.choreography + self.performance + self.expression 
\ No newline at end of file
+    def jury_id(self) -> int:
+        return self.jury_member
+
+    @property
+    def total(self) -> int:
+        return self.technique + self.choreography + self.performance + self.expression
@@ -0,0 +1,225 @@
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence
+from .score import CRITERIA, Score
+from ..utils.fixed_point import scaled_mean, to_display
+
+class ScoreMatrix:
+    """Jury scores of one style as a flat participant × jury × criterion byte array.
+
+    Criterion points are stored as unsigned bytes with a bitmap marking which
+    (participant, jury) cells were scored. Absent cells are kept zero, so row
+    and column sums can be taken over array slices without checking presence.
+    """
+
+    def __init__(self, jury_ids: Sequence = (), start_numbers: Sequence[int] = ()):
+        self.jury_ids: List[str] = [str(jury_id) for jury_id in jury_ids]
+        self.start_numbers = array('q')
+        self.values = array('B')
+        self.present = bytearray()
+        self._columns: Dict[str, int] = {jury_id: j for j, jury_id in enumerate(self.jury_ids)}
+        self._rows: Dict[int, int] = {}
+        for start_number in start_numbers:
+            self.add_participant(start_number)
+
+    @classmethod
+    def from_json(cls, style_scores: Dict[str, Dict], jury_ids: Optional[Sequence] = None) -> 'ScoreMatrix':
+        """Build from one style of scores.json, stored final totals are recomputed instead"""
+        if jury_ids is None:
+            jury_ids = sorted({key for participant_scores in style_scores.values()
+                               for key in participant_scores if key != 'final_total'}, key=_jury_order)
+        matrix = cls(jury_ids)
+        for start_number, participant_scores in style_scores.items():
+            try:
+                start_number = int(start_number)
+            except ValueError:
+                continue
+            matrix.add_participant(start_number)
+            for jury_id, s in participant_scores.items():
+                if jury_id != 'final_total':
+                    matrix.set(start_number, jury_id, [s[criterion] for criterion in CRITERIA])
+        return matrix
+
+    def to_json(self) -> Dict[str, Dict]:
+        """One style of scores.json, with a final_total once every jury member has scored"""
+        style_scores = {}
+        for row, start_number in enumerate(self.start_numbers):
+            participant_scores = {}
+            for j, jury_id in enumerate(self.jury_ids):
+                if self._is_present(row, j):
+                    offset = self._offset(row, j)
+                    s = dict(zip(CRITERIA, self.values[offset:offset + len(CRITERIA)]))
+                    s['total'] = sum(s.values())
+                    participant_scores[jury_id] = s
+            if self.jury_ids and len(participant_scores) == len(self.jury_ids):
+                participant_scores['final_total'] = to_display(
+                    scaled_mean(self.total(start_number), len(participant_scores)))
+            style_scores[str(start_number)] = participant_scores
+        return style_scores
+
+    def __len__(self) -> int:
+        return len(self.start_numbers)
+
+    def __contains__(self, start_number: int) -> bool:
+        return int(start_number) in self._rows
+
+    def add_participant(self, start_number: int) -> int:
+        """Row of a participant, appending an empty row for new start numbers"""
+        start_number = int(start_number)
+        row = self._rows.get(start_number)
+        if row is None:
+            row = self._rows[start_number] = len(self.start_numbers)
+            self.start_numbers.append(start_number)
+            self.values.extend(bytes(len(self.jury_ids) * len(CRITERIA)))
+            self.present.extend(bytes(self._bitmap_size_for(len(self)) - len(self.present)))
+        return row
+
+    def add_jury(self, jury_id) -> int:
+        """Column of a jury member, widening every row for new ids"""
+        jury_id = str(jury_id)
+        column = self._columns.get(jury_id)
+        if column is not None:
+            return column
+
+        old_width = len(self.jury_ids)
+        cells = [self._is_present(row, j) for row in range(len(self)) for j in range(old_width)]
+        row_size = old_width * len(CRITERIA)
+        values = array('B')
+        for row in range(len(self)):
+            values.extend(self.values[row * row_size:(row + 1) * row_size])
+            values.extend(bytes(len(CRITERIA)))
+
+        column = self._columns[jury_id] = old_width
+        self.jury_ids.append(jury_id)
+        self.values = values
+        self.present = bytearray(self._bitmap_size_for(len(self)))
+        for cell, present in enumerate(cells):
+            if present:
+                row, j = divmod(cell, old_width)
+                self._mark(row, j, True)
+        return column
+
+    def set(self, start_number: int, jury_id, points: Sequence[int]):
+        """Store the criterion points of one jury member, in CRITERIA order"""
+        if len(points) != len(CRITERIA):
+            raise ValueError(f"Expected {len(CRITERIA)} criterion scores, got {len(points)}")
+        if any(not 0 <= p <= 255 for p in points):
+            raise ValueError("Criterion scores must be between 0 and 255")
+        column = self.add_jury(jury_id)
+        row = self.add_participant(start_number)
+        offset = self._offset(row, column)
+        self.values[offset:offset + len(CRITERIA)] = array('B', points)
+        self._mark(row, column, True)
+
+    def remove(self, start_number: int, jury_id):
+        row = self._rows.get(int(start_number))
+        column = self._columns.get(str(jury_id))
+        if row is None or column is None:
+            return
+        offset = self._offset(row, column)
+        self.values[offset:offset + len(CRITERIA)] = array('B', bytes(len(CRITERIA)))
+        self._mark(row, column, False)
+
+    def get(self, start_number: int, jury_id) -> Optional[Score]:
+        row = self._rows.get(int(start_number))
+        column = self._columns.get(str(jury_id))
+        if row is None or column is None or not self._is_present(row, column):
+            return None
+        return self._score(row, column)
+
+    def row(self, start_number: int) -> 'ScoreRow':
+        return ScoreRow(self, self._rows[int(start_number)])
+
+    def scores(self, start_number: int) -> List[Score]:
+        return list(self.row(start_number))
+
+    # Row aggregates
+
+    def jury_count(self, start_number: int) -> int:
+        row = self._rows.get(int(start_number))
+        if row is None:
+            return 0
+        return sum(self._is_present(row, j) for j in range(len(self.jury_ids)))
+
+    def total(self, start_number: int) -> int:
+        """Sum of all jury totals of a participant"""
+        row = self._rows[int(start_number)]
+        size = len(self.jury_ids) * len(CRITERIA)
+        return sum(self.values[row * size:(row + 1) * size])
+
+    def criterion_sum(self, start_number: int, criterion: str) -> int:
+        row = self._rows[int(start_number)]
+        start = row * len(self.jury_ids) * len(CRITERIA) + CRITERIA.index(criterion)
+        return sum(self.values[start:start + len(self.jury_ids) * len(CRITERIA):len(CRITERIA)])
+
+    def average_total(self, start_number: int) -> Optional[float]:
+        count = self.jury_count(start_number)
+        return self.total(start_number) / count if count else None
+
+    def participant_totals(self) -> Dict[int, int]:
+        """Sum of jury totals per start number"""
+        size = len(self.jury_ids) * len(CRITERIA)
+        return {start_number: sum(self.values[row * size:(row + 1) * size])
+                for row, start_number in enumerate(self.start_numbers)}
+
+    # Column aggregates
+
+    def jury_means(self) -> Dict[str, Optional[float]]:
+        """Mean total given by every jury member over the participants it scored"""
+        row_size = len(self.jury_ids) * len(CRITERIA)
+        means = {}
+        for j, jury_id in enumerate(self.jury_ids):
+            count = sum(self._is_present(row, j) for row in range(len(self)))
+            total = sum(sum(self.values[j * len(CRITERIA) + c::row_size]) for c in range(len(CRITERIA)))
+            means[jury_id] = total / count if count else None
+        return means
+
+    def _offset(self, row: int, column: int) -> int:
+        return (row * len(self.jury_ids) + column) * len(CRITERIA)
+
+    def _is_present(self, row: int, column: int) -> bool:
+        bit = row * len(self.jury_ids) + column
+        return bool(self.present[bit >> 3] & (1 << (bit & 7)))
+
+    def _mark(self, row: int, column: int, present: bool):
+        bit = row * len(self.jury_ids) + column
+        if present:
+            self.present[bit >> 3] |= 1 << (bit & 7)
+        else:
+            self.present[bit >> 3] &= ~(1 << (bit & 7)) & 0xFF
+
+    def _bitmap_size_for(self, rows: int) -> int:
+        return _bitmap_size(rows * len(self.jury_ids))
+
+    def _score(self, row: int, column: int) -> Score:
+        offset = self._offset(row, column)
+        jury_id = self.jury_ids[column]
+        return Score(self.start_numbers[row], int(jury_id) if jury_id.isdigit() else jury_id,
+                     *self.values[offset:offset + len(CRITERIA)])
+
+class ScoreRow:
+    """View of one participant's scores in a ScoreMatrix, iterating as Score objects"""
+
+    def __init__(self, matrix: ScoreMatrix, row: int):
+        self.matrix = matrix
+        self.start_number = matrix.start_numbers[row]
+        self._row = row
+
+    def __len__(self) -> int:
+        return self.matrix.jury_count(self.start_number)
+
+    def __iter__(self) -> Iterator[Score]:
+        for j in range(len(self.matrix.jury_ids)):
+            if self.matrix._is_present(self._row, j):
+                yield self.matrix._score(self._row, j)
+
+    def total(self) -> int:
+        return self.matrix.total(self.start_number)
+
+    def criterion_sum(self, criterion: str) -> int:
+        return self.matrix.criterion_sum(self.start_number, criterion)
+
+def _bitmap_size(cells: int) -> int:
+    return (cells + 7) // 8
+
+def _jury_order(jury_id: str):
+    return (0, int(jury_id), '') if jury_id.isdigit() else (1, 0, jury_id)
@@ -0,0 +1,131 @@
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+from ..models.score import CRITERIA
+from .ranking_engine import RankingKey
+from .ranking_rules import DEFAULT_RULES, CompiledRules
+
+@dataclass(frozen=True)
+class Aggregate:
+    """Everything the rankings need from one participant's jury entries"""
+    jury_count: int
+    criterion_sums: Tuple[int, ...]  # In CRITERIA order
+    finished: bool  # A final_total is stored
+    key: Optional[RankingKey]  # None without jury scores
+
+    @property
+    def final_total(self) -> Optional[int]:
+        """Scaled aggregated total, the first part of the ranking key"""
+        return self.key[0] if self.key else None
+
+class AggregateCache:
+    """Per-participant aggregates keyed by (style, start_number), computed on first use.
+
+    Entries are read through ``lookup(style, start_number)`` and stay valid
+    until ``invalidate`` is called for that participant, which the score
+    store does whenever one of its entries changes. The lookup runs without
+    the cache lock held, so it may take the store's own lock.
+
+    Work on a copy of the scores reads through a ``freeze`` of the cache,
+    ``adopt`` keeps what it computed for participants unchanged since.
+    """
+
+    def __init__(self, lookup: Callable[[str, str], Dict], rules: CompiledRules = DEFAULT_RULES):
+        self.lookup = lookup
+        self.rules = rules
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[str, str], Aggregate] = {}
+        self._version = 0  # Bumped by every invalidation
+        self._changed: Dict[Tuple[str, str], int] = {}  # Version of each participant's last invalidation
+        self._cleared = 0  # Version of the last clear or rule switch
+        self.base_version: Optional[int] = None  # Version of the cache a frozen copy was taken from
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, style: str, start_number) -> Aggregate:
+        item = (style, str(start_number))
+        with self._lock:
+            aggregate = self._entries.get(item)
+            if aggregate is not None:
+                self.hits += 1
+                return aggregate
+            self.misses += 1
+            version = self._version
+
+        # Computed unlocked, kept only if nothing was invalidated meanwhile
+        aggregate = self._compute(self.lookup(*item))
+        with self._lock:
+            if self._unchanged_since(item, version):
+                self._entries[item] = aggregate
+        return aggregate
+
+    def _unchanged_since(self, item: Tuple[str, str], version: int) -> bool:
+        return self._cleared <= version and self._changed.get(item, 0) <= version
+
+    def ranking_key(self, style: str, start_number, jury_count: Optional[int] = None) -> Optional[RankingKey]:
+        """Same result as ``rules.ranking_key`` on the participant's current scores"""
+        aggregate = self.get(style, start_number)
+        if jury_count is None:
+            return aggregate.key if aggregate.finished else None
+        return aggregate.key if aggregate.jury_count == jury_count else None
+
+    def invalidate(self, style: str, start_number):
+        item = (style, str(start_number))
+        with self._lock:
+            self._entries.pop(item, None)
+            self._version += 1
+            self._changed[item] = self._version
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def set_rules(self, rules: CompiledRules):
+        """Switch rule sets, dropping aggregates computed under the old one"""
+        if rules is not self.rules:
+            with self._lock:
+                self.rules = rules
+                self._clear()
+
+    def _clear(self):
+        self._entries.clear()
+        self._changed.clear()
+        self._version += 1
+        self._cleared = self._version
+
+    def freeze(self, lookup: Callable[[str, str], Dict]) -> 'AggregateCache':
+        """A cache over a copy of the scores, starting with the aggregates known now.
+
+        Take it together with the copy, while the scores cannot change.
+        """
+        with self._lock:
+            frozen = AggregateCache(lookup, self.rules)
+            frozen._entries = dict(self._entries)
+            frozen.base_version = self._version
+        return frozen
+
+    def adopt(self, frozen: 'AggregateCache'):
+        """Keep what a frozen copy computed for participants unchanged since it was taken"""
+        with self._lock:
+            self.hits += frozen.hits
+            self.misses += frozen.misses
+            if frozen.rules is not self.rules:
+                return
+            for item, aggregate in frozen._entries.items():
+                if item not in self._entries and self._unchanged_since(item, frozen.base_version):
+                    self._entries[item] = aggregate
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+    def _compute(self, participant_scores: Dict) -> Aggregate:
+        jury_scores = [s for key, s in participant_scores.items() if key != 'final_total']
+        return Aggregate(
+            jury_count=len(jury_scores),
+            criterion_sums=tuple(sum(s[criterion] for s in jury_scores) for criterion in CRITERIA),
+            finished='final_total' in participant_scores,
+            key=self.rules.ranking_key(participant_scores, len(jury_scores)),
+        )
@@ -0,0 +1,126 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+from ..models.category import AgeGroup, Category
+from ..models.participant import Participant
+from ..models.ranking import RankingEntry
+from .calculations import CRITERIA, rank_scores
+from .fixed_point import SCALE, scale_factor, to_display
+from .ranking_engine import GroupKey
+from .ranking_rules import DEFAULT_RULES, CompiledRules
+
+try:
+    import pandas as pd
+except ImportError:  # pandas is only needed for batch recomputes
+    pd = None
+
+SCORE_COLUMNS = ['style', 'start_number', 'jury_id', *CRITERIA, 'total']
+PARTICIPANT_COLUMNS = ['start_number', 'name', 'category', 'age_group']
+PARTICIPANT_KEY = ['style', 'start_number']
+
+def key_columns(rules: CompiledRules = DEFAULT_RULES) -> List[str]:
+    """Fixed-point ranking key columns, in RankingEngine order"""
+    return ['key_total', *(f'key_{criterion}' for criterion in rules.tie_break)]
+
+def iter_score_rows(all_scores: Dict[str, Dict]) -> Iterator[tuple]:
+    """One (style, start_number, jury_id, criteria..., total) row per jury score"""
+    for style, style_scores in all_scores.items():
+        for start_number, participant_scores in style_scores.items():
+            try:
+                start_number = int(start_number)
+            except ValueError:
+                continue
+            for jury_id, s in participant_scores.items():
+                if jury_id == 'final_total':
+                    continue
+                yield (style, start_number, jury_id, *(s[c] for c in CRITERIA), s['total'])
+
+def scores_frame(all_scores: Dict[str, Dict]) -> 'pd.DataFrame':
+    return pd.DataFrame.from_records(iter_score_rows(all_scores), columns=SCORE_COLUMNS)
+
+def participants_frame(participants: Iterable[Participant]) -> 'pd.DataFrame':
+    return pd.DataFrame.from_records(
+        ((p.start_number, p.name, p.category.value, p.age_group.value) for p in participants),
+        columns=PARTICIPANT_COLUMNS)
+
+def aggregate_totals(scores: 'pd.DataFrame', jury_count: int,
+                     rules: CompiledRules = DEFAULT_RULES) -> 'pd.Series':
+    """Scaled final total per (style, start_number), the vectorized ``rules.aggregate``"""
+    weights = rules.rules.weights
+    if any(w != 1 for w in weights):
+        scores = scores.assign(total=sum(scores[c] * w for c, w in zip(CRITERIA, weights)))
+    aggregation = rules.rules.aggregation
+
+    if aggregation == 'median':
+        medians = scores.groupby(PARTICIPANT_KEY, sort=False)['total'].median()
+        return (medians * 2).round().astype('int64') * (SCALE // 2)
+
+    kept = jury_count
+    if aggregation == 'trimmed_mean':
+        kept = rules.trimmed_count(jury_count)
+        if kept != jury_count:
+            trim = rules.rules.trim
+            scores = scores.sort_values([*PARTICIPANT_KEY, 'total'])
+            position = scores.groupby(PARTICIPANT_KEY, sort=False).cumcount()
+            scores = scores[(position >= trim) & (position < jury_count - trim)]
+    sums = scores.groupby(PARTICIPANT_KEY, sort=False)['total'].sum()
+    return sums.astype('int64') * scale_factor(kept)
+
+def rank_frame(scores: 'pd.DataFrame', participants: 'pd.DataFrame', jury_count: int,
+               rules: CompiledRules = DEFAULT_RULES) -> 'pd.DataFrame':
+    """Final totals, criterion averages and group ranks for every participant in one pass.
+
+    Only participants scored by every jury member are ranked, as in
+    ``calculations.final_total``. Sorting and ties use the integer key
+    columns. The result is sorted by group and rank.
+    """
+    grouped = scores.groupby(PARTICIPANT_KEY, sort=False)
+    sums = grouped[list(CRITERIA)].sum()
+    counts = grouped.size()
+    complete = counts == jury_count
+    sums = sums[complete]
+
+    factor = scale_factor(jury_count)
+    results = pd.DataFrame({
+        'key_total': aggregate_totals(scores, jury_count, rules).reindex(sums.index),
+        **{f'key_{c}': sums[c].astype('int64') * factor for c in rules.tie_break},
+    }).reset_index()
+    results['final_total'] = results['key_total'] / SCALE
+    results = results.merge(participants, on='start_number', how='inner')
+
+    # Same order as RankingEngine.sort_key: best ranking key first, then start number
+    group_columns = ['style', 'category', 'age_group']
+    ranking_columns = key_columns(rules)
+    results = results.sort_values(
+        [*group_columns, *ranking_columns, 'start_number'],
+        ascending=[True] * len(group_columns) + [False] * len(ranking_columns) + [True])
+    results = results.reset_index(drop=True)
+
+    # Truly equal entries share the rank of the first of them
+    position = results.groupby(group_columns, sort=False).cumcount() + 1
+    compared = results[group_columns + ranking_columns]
+    starts_tie = (compared != compared.shift()).any(axis=1)
+    results['rank'] = position.where(starts_tie).ffill().astype(int)
+    return results
+
+def frame_to_groups(results: 'pd.DataFrame',
+                    rules: CompiledRules = DEFAULT_RULES) -> Dict[GroupKey, List[RankingEntry]]:
+    ranking_columns = key_columns(rules)
+    groups: Dict[GroupKey, List[RankingEntry]] = {}
+    for row in results.itertuples(index=False):
+        groups.setdefault((row.style, row.category, row.age_group), []).append(RankingEntry(
+            start_number=int(row.start_number),
+            name=row.name,
+            category=Category(row.category),
+            age_group=AgeGroup(row.age_group),
+            score=to_display(int(row.key_total)),
+            key=tuple(int(getattr(row, column)) for column in ranking_columns)
+        ))
+    return groups
+
+def rank_scores_batch(all_scores: Dict[str, Dict], participants: Dict[int, Participant],
+                      jury_count: int, rules: CompiledRules = DEFAULT_RULES) -> Dict[GroupKey, List[RankingEntry]]:
+    """Vectorized equivalent of ``calculations.rank_scores``, used when pandas is installed"""
+    if pd is None:
+        return rank_scores(all_scores, participants, jury_count, rules)
+    results = rank_frame(scores_frame(all_scores), participants_frame(participants.values()),
+                         jury_count, rules)
+    return frame_to_groups(results, rules)
@@ -1,28 +1,74 @@
-from typing import List
-from ..models.score import Score
+from typing import Dict, List, Optional, Union
+from ..models.participant import Participant
+from ..models.ranking import RankingEntry
+from ..models.score import CRITERIA, Score
+from ..models.score_matrix import ScoreRow
+from .aggregate_cache import AggregateCache
+from .ranking_engine import GroupKey, RankingEngine, RankingKey
+from .ranking_rules import DEFAULT_RULES, CompiledRules
 
-def calculate_average_score(scores: List[Score]) -> float:
+# Scores of one participant, as Score objects or a row of a ScoreMatrix
+JuryScores = Union[List[Score], ScoreRow]
+
+def calculate_average_score(scores: JuryScores) -> float:
+    if isinstance(scores, ScoreRow):
+        return scores.total() / len(scores)
     total = sum(score.total for score in scores)
     return total / len(scores)
 
-def resolve_ex_aequo(scores1: List[Score], scores2: List[Score]) -> int:
+def ex_aequo_key(scores: JuryScores, rules: CompiledRules = DEFAULT_RULES) -> Optional[RankingKey]:
+    """The rules' ranking key of one participant's jury scores: aggregated total, then the tie-break averages"""
+    participant_scores = {str(jury): {**{criterion: getattr(score, criterion) for criterion in CRITERIA},
+                                      'total': score.total}
+                          for jury, score in enumerate(scores)}
+    return rules.ranking_key(participant_scores, len(participant_scores))
+
+def resolve_ex_aequo(scores1: JuryScores, scores2: JuryScores, rules: CompiledRules = DEFAULT_RULES) -> int:
     """Returns 1 if scores1 wins, -1 if scores2 wins, 0 if truly equal"""
-    avg_technique1 = sum(s.technique for s in scores1) / len(scores1)
-    avg_technique2 = sum(s.technique for s in scores2) / len(scores2)
-    
-    if avg_technique1 != avg_technique2:
-        return 1 if avg_technique1 > avg_technique2 else -1
-        
-    avg_performance1 = sum(s.performance for s in scores1) / len(scores1)
-    avg_performance2 = sum(s.performance for s in scores2) / len(scores2)
-    
-    if avg_performance1 != avg_performance2:
-        return 1 if avg_performance1 > avg_performance2 else -1
-        
-    avg_choreography1 = sum(s.choreography for s in scores1) / len(scores1)
-    avg_choreography2 = sum(s.choreography for s in scores2) / len(scores2)
-    
-    if avg_choreography1 != avg_choreography2:
-        return 1 if avg_choreography1 > avg_choreography2 else -1
-    
-    return 0 
\ No newline at end of file
+    tie_break1 = ex_aequo_key(scores1, rules)[1:]
+    tie_break2 = ex_aequo_key(scores2, rules)[1:]
+    return (tie_break1 > tie_break2) - (tie_break1 < tie_break2)
+
+
+def final_total(participant_scores: Dict[str, Dict], jury_count: int,
+                rules: CompiledRules = DEFAULT_RULES) -> Optional[float]:
+    """Aggregated jury totals rounded for storage, only once every jury member has scored"""
+    return rules.final_total(participant_scores, jury_count)
+
+def ranking_key(participant_scores: Dict[str, Dict], jury_count: Optional[int] = None,
+                rules: CompiledRules = DEFAULT_RULES) -> Optional[RankingKey]:
+    """Final total followed by the ex aequo averages, computed once per participant.
+
+    All parts are exact fixed-point integers, see ``fixed_point``. Without a
+    jury count the stored final_total marks a finished participant.
+    Returns None for participants that are not finished.
+    """
+    return rules.ranking_key(participant_scores, jury_count)
+
+def rank_scores(all_scores: Dict[str, Dict], participants: Dict[int, Participant],
+                jury_count: int, rules: CompiledRules = DEFAULT_RULES,
+                cache: Optional[AggregateCache] = None) -> Dict[GroupKey, List[RankingEntry]]:
+    """Best-first rankings per (style, category, age_group) computed from raw jury scores.
+
+    Ties on the final total are broken by the ex aequo rules. With a cache
+    over the same scores, unchanged participants are not recomputed.
+    """
+    if cache is not None:
+        cache.set_rules(rules)
+    results = []
+    for style, style_scores in all_scores.items():
+        for start_number, participant_scores in style_scores.items():
+            try:
+                participant = participants.get(int(start_number))
+            except ValueError:
+                continue
+            if cache is not None:
+                key = cache.ranking_key(style, start_number, jury_count)
+            else:
+                key = rules.ranking_key(participant_scores, jury_count)
+            if participant and key is not None:
+                results.append((style, participant, key))
+
+    engine = RankingEngine()
+    engine.rebuild(results)
+    return {key: entries for key, entries in engine.groups.items() if entries}
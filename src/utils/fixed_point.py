@@ -0,0 +1,25 @@
+from math import lcm
+
+# Largest jury the exact scores support
+MAX_JURY_SIZE = 12
+
+# Divisible by every jury size up to MAX_JURY_SIZE, so every mean of integer
+# points is an exact integer once multiplied by it
+SCALE = lcm(*range(1, MAX_JURY_SIZE + 1))
+
+# Decimals kept when a scaled value leaves the scoring core
+DISPLAY_DIGITS = 2
+
+def scale_factor(jury_count: int) -> int:
+    """Multiplier turning a sum over jury_count scores into a scaled mean"""
+    if not 0 < jury_count <= MAX_JURY_SIZE:
+        raise ValueError(f"Jury size must be between 1 and {MAX_JURY_SIZE}, got {jury_count}")
+    return SCALE // jury_count
+
+def scaled_mean(total: int, jury_count: int) -> int:
+    """Mean of jury_count scores summing to total, times SCALE"""
+    return int(total) * scale_factor(jury_count)
+
+def to_display(value: int) -> float:
+    """Round a scaled value for showing or storing, never for comparing"""
+    return round(value / SCALE, DISPLAY_DIGITS)
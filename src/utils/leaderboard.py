@@ -0,0 +1,131 @@
+import heapq
+import itertools
+from typing import Dict, Hashable, List, Optional, Tuple
+from ..models.participant import Participant
+from ..models.ranking import RankingEntry
+from .ranking_engine import GroupKey, RankingEngine, RankingKey, make_entry
+
+class TopK:
+    """Best items of a changing set, kept in a heap with lazy deletion.
+
+    ``update`` is O(log n). Every push gets a sequence number and only the
+    entry with an item's current one is live, so a key that comes back
+    after a change does not revive its old entry. Replaced entries stay in
+    the heap until they reach the top, where ``top`` drops them.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[tuple, Hashable, int]] = []
+        self._keys: Dict[Hashable, tuple] = {}
+        self._seqs: Dict[Hashable, int] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def update(self, item: Hashable, key: Optional[tuple]):
+        """Set an item's key (higher is better), None removes the item"""
+        if key is None:
+            self._keys.pop(item, None)
+            self._seqs.pop(item, None)
+            return
+        key = tuple(key)
+        if self._keys.get(item) == key:
+            return
+        self._keys[item] = key
+        seq = self._seqs[item] = next(self._counter)
+        heapq.heappush(self._heap, (tuple(-value for value in key), item, seq))
+
+        # Keep stale entries from outgrowing the live ones
+        if len(self._heap) > 2 * len(self._keys) + 64:
+            self._heap = [(tuple(-value for value in self._keys[i]), i, seq) for i, seq in self._seqs.items()]
+            heapq.heapify(self._heap)
+
+    def top(self, k: int) -> List[Tuple[Hashable, tuple]]:
+        """Up to k (item, key) pairs, best first"""
+        found = []
+        popped = []
+        while self._heap and len(found) < k:
+            entry = heapq.heappop(self._heap)
+            negated, item, seq = entry
+            if self._seqs.get(item) != seq:
+                continue  # Stale, dropped for good
+            found.append((item, tuple(-value for value in negated)))
+            popped.append(entry)
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return found
+
+    def clear(self):
+        self._heap.clear()
+        self._keys.clear()
+        self._seqs.clear()
+
+class Leaderboard:
+    """Podium views maintained as scores arrive: top-K per group, per style and overall,
+    plus the highest single jury total.
+    """
+
+    def __init__(self):
+        self.participants: Dict[Tuple[str, int], Participant] = {}
+        self.groups: Dict[GroupKey, TopK] = {}
+        self.styles: Dict[str, TopK] = {}
+        self.overall = TopK()
+        self.jury_totals = TopK()  # Items are (style, start_number, jury_id)
+        self._jury_ids: Dict[Tuple[str, int], List[str]] = {}
+
+    def clear(self):
+        self.participants.clear()
+        self.groups.clear()
+        self.styles.clear()
+        self.overall.clear()
+        self.jury_totals.clear()
+        self._jury_ids.clear()
+
+    def update(self, style: str, participant: Participant, ranking_key: Optional[RankingKey]):
+        item = (style, participant.start_number)
+        self.participants[item] = participant
+        group_key = RankingEngine.group_key(style, participant)
+        self.groups.setdefault(group_key, TopK()).update(item, ranking_key)
+        self.styles.setdefault(style, TopK()).update(item, ranking_key)
+        self.overall.update(item, ranking_key)
+
+    def update_jury_scores(self, style: str, participant: Participant, participant_scores: Dict):
+        """Track every jury total of one participant, dropping jury entries that were removed"""
+        item = (style, participant.start_number)
+        self.participants[item] = participant
+        jury_ids = [key for key in participant_scores if key != 'final_total']
+        for jury_id in self._jury_ids.get(item, []):
+            if jury_id not in participant_scores:
+                self.jury_totals.update((style, participant.start_number, jury_id), None)
+        for jury_id in jury_ids:
+            self.jury_totals.update((style, participant.start_number, jury_id),
+                                    (participant_scores[jury_id]['total'],))
+        self._jury_ids[item] = jury_ids
+
+    def podium(self, group_key: GroupKey, k: int = 3) -> List[RankingEntry]:
+        """Top k of one (style, category, age_group) group"""
+        return self._entries(self.groups.get(group_key), k)
+
+    def style_top(self, style: str, k: int = 3) -> List[RankingEntry]:
+        return self._entries(self.styles.get(style), k)
+
+    def overall_top(self, k: int = 3) -> List[RankingEntry]:
+        return self._entries(self.overall, k)
+
+    def daily_winner(self, style: str) -> Optional[RankingEntry]:
+        top = self.style_top(style, 1)
+        return top[0] if top else None
+
+    def highest_jury_score(self) -> Optional[Tuple[Participant, str, int]]:
+        """(participant, jury_id, total) of the best single jury total"""
+        top = self.jury_totals.top(1)
+        if not top:
+            return None
+        (style, start_number, jury_id), (total,) = top[0]
+        return self.participants[(style, start_number)], jury_id, total
+
+    def _entries(self, top_k: Optional[TopK], k: int) -> List[RankingEntry]:
+        if top_k is None:
+            return []
+        return [make_entry(self.participants[item], key) for item, key in top_k.top(k)]
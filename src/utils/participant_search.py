@@ -0,0 +1,108 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from ..models.category import AgeGroup, Category
+from ..models.participant import Participant
+
+def normalize(text: str) -> str:
+    return ' '.join(text.casefold().split())
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class ParticipantSearch:
+    """Start number and name lookups over one style's participants, built once.
+
+    Results are positions in the participant list, in running order. Start
+    numbers resolve through a dict, names shorter than three characters
+    through a sorted word list (prefix match) and longer ones through a
+    trigram index (substring match).
+    """
+
+    def __init__(self, participants: List[Participant]):
+        self.participants = participants
+        self.positions: Dict[int, int] = {}
+        self.names: List[str] = []
+        self.by_category: Dict[Category, Set[int]] = defaultdict(set)
+        self.by_age_group: Dict[AgeGroup, Set[int]] = defaultdict(set)
+        self._trigrams: Dict[str, Set[int]] = defaultdict(set)
+        words = []
+        for position, participant in enumerate(participants):
+            name = normalize(participant.name)
+            self.positions[participant.start_number] = position
+            self.names.append(name)
+            self.by_category[participant.category].add(position)
+            self.by_age_group[participant.age_group].add(position)
+            words.extend((word, position) for word in name.split())
+            for trigram in trigrams(name):
+                self._trigrams[trigram].add(position)
+        words.sort()
+        self._words = [word for word, _ in words]
+        self._word_positions = [position for _, position in words]
+
+        # Last query and its full result, refined when the next query extends it
+        self._last: Optional[Tuple[str, Optional[Category], Optional[AgeGroup], List[int]]] = None
+
+    def position(self, start_number) -> Optional[int]:
+        try:
+            return self.positions.get(int(start_number))
+        except ValueError:
+            return None
+
+    def search(self, text: str, category: Optional[Category] = None,
+               age_group: Optional[AgeGroup] = None, limit: Optional[int] = None) -> List[int]:
+        """Positions matching a start number or name part and the filters, in running order"""
+        query = normalize(text)
+        if query.isdigit():
+            position = self.position(query)
+            found = [] if position is None else [position]
+            found = [p for p in found if self._matches_filters(p, category, age_group)]
+        elif self._last and query.startswith(self._last[0]) and self._last[1:3] == (category, age_group) \
+                and len(query) >= 3 and len(self._last[0]) >= 3:
+            # Typing on: only the previous matches can still match
+            found = [p for p in self._last[3] if query in self.names[p]]
+        else:
+            found = self._search_names(query, category, age_group)
+
+        if not query.isdigit():
+            self._last = (query, category, age_group, found)
+        return found if limit is None else found[:limit]
+
+    def _search_names(self, query: str, category: Optional[Category],
+                      age_group: Optional[AgeGroup]) -> List[int]:
+        candidates = self._filter_set(category, age_group)
+        if not query:
+            matches = candidates if candidates is not None else range(len(self.participants))
+        elif len(query) < 3:
+            matches = self._word_prefix(query)
+        else:
+            sets = sorted((self._trigrams.get(t, set()) for t in trigrams(query)), key=len)
+            matches = set.intersection(*sets) if sets else set()
+            matches = {p for p in matches if query in self.names[p]}
+
+        if candidates is not None and query:
+            matches = set(matches) & candidates
+        return sorted(matches)
+
+    def _word_prefix(self, prefix: str) -> Set[int]:
+        found = set()
+        i = bisect_left(self._words, prefix)
+        while i < len(self._words) and self._words[i].startswith(prefix):
+            found.add(self._word_positions[i])
+            i += 1
+        return found
+
+    def _filter_set(self, category: Optional[Category], age_group: Optional[AgeGroup]) -> Optional[Set[int]]:
+        sets = []
+        if category is not None:
+            sets.append(self.by_category.get(category, set()))
+        if age_group is not None:
+            sets.append(self.by_age_group.get(age_group, set()))
+        if not sets:
+            return None
+        return set.intersection(*sets) if len(sets) > 1 else sets[0]
+
+    def _matches_filters(self, position: int, category: Optional[Category], age_group: Optional[AgeGroup]) -> bool:
+        participant = self.participants[position]
+        return ((category is None or participant.category == category)
+                and (age_group is None or participant.age_group == age_group))
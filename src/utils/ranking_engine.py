@@ -0,0 +1,123 @@
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..models.participant import Participant
+from ..models.ranking import RankingEntry
+from .fixed_point import to_display
+
+GroupKey = Tuple[str, str, str]  # (style, category, age_group)
+
+# (final total, avg technique, avg performance, avg choreography) as fixed-point
+# integers scaled by fixed_point.SCALE, higher is better
+RankingKey = Tuple[int, ...]
+
+@dataclass
+class RankingChange:
+    """Where one participant left and entered its group, None if absent"""
+    key: GroupKey
+    start_number: int
+    old_index: Optional[int]
+    new_index: Optional[int]
+
+class RankingEngine:
+    """Rankings per (style, category, age_group) kept sorted under single-score updates.
+
+    Every group is a best-first list of entries with a parallel list of sort
+    keys, so a changed score is moved with two bisections instead of
+    regrouping and resorting everything.
+    """
+
+    def __init__(self):
+        self.groups: Dict[GroupKey, List[RankingEntry]] = defaultdict(list)
+        self._keys: Dict[GroupKey, List[tuple]] = defaultdict(list)
+        self._located: Dict[Tuple[str, int], Tuple[GroupKey, tuple]] = {}
+
+    @staticmethod
+    def group_key(style: str, participant: Participant) -> GroupKey:
+        return (style, participant.category.value, participant.age_group.value)
+
+    @staticmethod
+    def sort_key(entry: RankingEntry) -> tuple:
+        # Best key first, start number keeps truly equal entries in a fixed order
+        return (*(-value for value in entry.key), entry.start_number)
+
+    def clear(self):
+        self.groups.clear()
+        self._keys.clear()
+        self._located.clear()
+
+    def rebuild(self, results: Iterable[Tuple[str, Participant, RankingKey]]):
+        """Replace all rankings with (style, participant, ranking key) results"""
+        self.clear()
+        for style, participant, ranking_key in results:
+            self.groups[self.group_key(style, participant)].append(make_entry(participant, ranking_key))
+
+        for key, entries in self.groups.items():
+            entries.sort(key=self.sort_key)
+            sort_keys = self._keys[key] = [self.sort_key(entry) for entry in entries]
+            for entry, sort_key in zip(entries, sort_keys):
+                self._located[(key[0], entry.start_number)] = (key, sort_key)
+
+    def replace_group(self, key: GroupKey,
+                      results: Iterable[Tuple[Participant, RankingKey]]) -> List[RankingEntry]:
+        """Replace one group's rankings with (participant, ranking key) results, returns the old entries"""
+        previous = self.groups.get(key, [])
+        for entry in previous:
+            del self._located[(key[0], entry.start_number)]
+        entries = self.groups[key] = sorted((make_entry(participant, ranking_key)
+                                             for participant, ranking_key in results), key=self.sort_key)
+        sort_keys = self._keys[key] = [self.sort_key(entry) for entry in entries]
+        for entry, sort_key in zip(entries, sort_keys):
+            self._located[(key[0], entry.start_number)] = (key, sort_key)
+        return previous
+
+    def update(self, style: str, participant: Participant,
+               ranking_key: Optional[RankingKey]) -> Optional[RankingChange]:
+        """Move one participant to the position for a new ranking key, None removes it.
+
+        Returns None when the rankings did not change.
+        """
+        key = self.group_key(style, participant)
+        entries = self.groups[key]
+        sort_keys = self._keys[key]
+
+        old_index = None
+        located = self._located.get((style, participant.start_number))
+        if located is not None:
+            old_index = bisect_left(sort_keys, located[1])
+            if ranking_key is not None and entries[old_index].key == tuple(ranking_key):
+                return None
+            del entries[old_index]
+            del sort_keys[old_index]
+            del self._located[(style, participant.start_number)]
+
+        new_index = None
+        if ranking_key is not None:
+            entry = make_entry(participant, ranking_key)
+            sort_key = self.sort_key(entry)
+            new_index = bisect_left(sort_keys, sort_key)
+            entries.insert(new_index, entry)
+            sort_keys.insert(new_index, sort_key)
+            self._located[(style, participant.start_number)] = (key, sort_key)
+
+        if old_index is None and new_index is None:
+            return None
+        return RankingChange(key, participant.start_number, old_index, new_index)
+
+def make_entry(participant: Participant, ranking_key: RankingKey) -> RankingEntry:
+    return RankingEntry(
+        start_number=participant.start_number,
+        name=participant.name,
+        category=participant.category,
+        age_group=participant.age_group,
+        score=to_display(ranking_key[0]),
+        key=tuple(ranking_key)
+    )
+
+def shared_rank(entries: List[RankingEntry], index: int) -> int:
+    """Rank of an entry in a best-first group, truly equal entries share the best rank"""
+    key = entries[index].key
+    while index > 0 and entries[index - 1].key == key:
+        index -= 1
+    return index + 1
@@ -0,0 +1,187 @@
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models.score import CRITERIA
+from .fixed_point import MAX_JURY_SIZE, SCALE, scaled_mean, to_display
+import json
+import threading
+
+AGGREGATIONS = ('mean', 'trimmed_mean', 'median')
+
+@dataclass(frozen=True)
+class RankingRules:
+    """Declarative rule set: how jury totals are combined, weighted, tie-broken and bounded.
+
+    Weights and maxima are given per criterion in CRITERIA order. Weights
+    are integers so scores stay exact fixed-point values.
+    """
+    aggregation: str = 'mean'
+    trim: int = 1  # Jury totals dropped at each end by trimmed_mean
+    weights: Tuple[int, ...] = (1, 1, 1, 1)
+    tie_break: Tuple[str, ...] = ('technique', 'performance', 'choreography')
+    maxima: Tuple[int, ...] = (30, 30, 30, 10)
+
+    def __post_init__(self):
+        if self.aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {self.aggregation!r}, expected one of {AGGREGATIONS}")
+        if len(self.weights) != len(CRITERIA) or len(self.maxima) != len(CRITERIA):
+            raise ValueError(f"Weights and maxima need one value per criterion: {CRITERIA}")
+        if not all(isinstance(w, int) and w >= 0 for w in self.weights):
+            raise ValueError("Weights must be non-negative integers")
+        if not all(0 < m <= 255 for m in self.maxima):
+            raise ValueError("Criterion maxima must be between 1 and 255")
+        unknown = [c for c in self.tie_break if c not in CRITERIA]
+        if unknown:
+            raise ValueError(f"Unknown tie-break criteria: {unknown}")
+        if self.trim < 0:
+            raise ValueError("Trim must not be negative")
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RankingRules':
+        """Rules from a config mapping, weights and maxima keyed by criterion name"""
+        defaults = cls()
+        weights = data.get('weights', {})
+        maxima = data.get('maxima', {})
+        return cls(
+            aggregation=data.get('aggregation', defaults.aggregation),
+            trim=data.get('trim', defaults.trim),
+            weights=tuple(weights.get(c, w) for c, w in zip(CRITERIA, defaults.weights)),
+            tie_break=tuple(data.get('tie_break', defaults.tie_break)),
+            maxima=tuple(maxima.get(c, m) for c, m in zip(CRITERIA, defaults.maxima)),
+        )
+
+    def compile(self) -> 'CompiledRules':
+        return CompiledRules(self)
+
+class CompiledRules:
+    """Key and aggregate functions specialized once for a rule set.
+
+    ``ranking_key`` returns fixed-point keys: the aggregated final total
+    followed by the tie-break criterion means over all jury members.
+    """
+
+    def __init__(self, rules: RankingRules):
+        self.rules = rules
+        self.tie_break = rules.tie_break
+        self.maxima: Dict[str, int] = dict(zip(CRITERIA, rules.maxima))
+        self.jury_total: Callable[[Dict], int] = _jury_total_function(rules.weights)
+        self.aggregate: Callable[[List[int]], int] = _aggregate_function(rules.aggregation, rules.trim)
+        self.ranking_key = self._key_function()
+
+    def _key_function(self):
+        jury_total = self.jury_total
+        aggregate = self.aggregate
+        tie_break = self.tie_break
+
+        def ranking_key(participant_scores: Dict[str, Dict], jury_count: Optional[int] = None):
+            jury_scores = [s for key, s in participant_scores.items() if key != 'final_total']
+            if not jury_scores or len(jury_scores) > MAX_JURY_SIZE:
+                return None  # Entries of jury members no config can have
+            if jury_count is None:
+                if 'final_total' not in participant_scores:
+                    return None
+            elif len(jury_scores) != jury_count:
+                return None
+
+            count = len(jury_scores)
+            return (
+                aggregate([jury_total(s) for s in jury_scores]),
+                *(scaled_mean(sum(s[criterion] for s in jury_scores), count) for criterion in tie_break)
+            )
+        return ranking_key
+
+    def final_total(self, participant_scores: Dict[str, Dict], jury_count: int) -> Optional[float]:
+        """Aggregated jury totals rounded for storage, only once every jury member has scored"""
+        jury_scores = [s for key, s in participant_scores.items() if key != 'final_total']
+        if not jury_scores or len(jury_scores) != jury_count or jury_count > MAX_JURY_SIZE:
+            return None
+        return to_display(self.aggregate([self.jury_total(s) for s in jury_scores]))
+
+    def trimmed_count(self, jury_count: int) -> int:
+        """How many jury totals a trimmed_mean keeps"""
+        if jury_count > 2 * self.rules.trim:
+            return jury_count - 2 * self.rules.trim
+        return jury_count
+
+    def validate(self, criterion: str, value: int) -> bool:
+        return 0 <= value <= self.maxima[criterion]
+
+def _jury_total_function(weights: Tuple[int, ...]) -> Callable[[Dict], int]:
+    if all(w == 1 for w in weights):
+        return itemgetter('total')  # Stored totals are the plain sum
+    weighted = [(c, w) for c, w in zip(CRITERIA, weights) if w]
+
+    def jury_total(s: Dict) -> int:
+        return sum(s[c] * w for c, w in weighted)
+    return jury_total
+
+def _aggregate_function(aggregation: str, trim: int) -> Callable[[List[int]], int]:
+    """Scaled aggregate of a list of integer jury totals"""
+    if aggregation == 'mean':
+        def aggregate(totals: List[int]) -> int:
+            return scaled_mean(sum(totals), len(totals))
+    elif aggregation == 'trimmed_mean':
+        def aggregate(totals: List[int]) -> int:
+            # Too few totals to trim falls back to the plain mean
+            if len(totals) > 2 * trim:
+                totals = sorted(totals)[trim:len(totals) - trim]
+            return scaled_mean(sum(totals), len(totals))
+    else:
+        def aggregate(totals: List[int]) -> int:
+            ordered = sorted(totals)
+            middle = len(ordered) // 2
+            if len(ordered) % 2:
+                return int(ordered[middle]) * SCALE
+            return int(ordered[middle - 1] + ordered[middle]) * (SCALE // 2)
+    return aggregate
+
+DEFAULT_RULES = RankingRules().compile()
+
+_rules: Dict[str, CompiledRules] = {}
+_rules_lock = threading.Lock()
+
+def load_ranking_rules(config_path: str = 'data/jury_config.json') -> RankingRules:
+    """The "ranking_rules" section of the jury config, defaults when absent"""
+    try:
+        with open(config_path, 'r') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return RankingRules()
+    return RankingRules.from_dict(data.get('ranking_rules', {}))
+
+def get_ranking_rules(config_path: str = 'data/jury_config.json') -> CompiledRules:
+    """The process-wide compiled rules for a config file, compiled on first use"""
+    with _rules_lock:
+        rules = _rules.get(config_path)
+        if rules is None:
+            try:
+                rules = load_ranking_rules(config_path).compile()
+            except (ValueError, TypeError) as e:
+                print(f"Error loading ranking rules, using defaults: {e}")
+                rules = DEFAULT_RULES
+            _rules[config_path] = rules
+        return rules
+
+def load_jury_members(config_path: str = 'data/jury_config.json') -> List[Dict]:
+    """The "jury_members" entries of the jury config, ValueError for a jury the scores cannot handle"""
+    with open(config_path, 'r') as f:
+        members = json.load(f).get('jury_members', [])
+    if len(members) > MAX_JURY_SIZE:
+        raise ValueError(f"{config_path} lists {len(members)} jury members, "
+                         f"exact scoring supports at most {MAX_JURY_SIZE}")
+    return members
+
+def load_jury_ids(config_path: str = 'data/jury_config.json') -> List[str]:
+    return [str(member['id']) for member in load_jury_members(config_path)]
+
+def get_total_rule(config_path: str = 'data/jury_config.json') -> Optional[Callable[[Dict], Optional[float]]]:
+    """A participant's final total under the configured rules and jury, None without a jury config"""
+    try:
+        jury_count = len(load_jury_ids(config_path))
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        print(f"Error loading jury members: {e}")
+        return None
+    rules = get_ranking_rules(config_path)
+    return lambda participant_scores: rules.final_total(participant_scores, jury_count)
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from ..models.participant import Participant
+from .leaderboard import Leaderboard
+from .ranking_engine import RankingEngine
+from .score_store import ScoreStore
+
+# Participants handled between two cancellation checks
+CANCEL_CHECK_EVERY = 256
+
+@dataclass(frozen=True)
+class RankingSnapshot:
+    """Rankings and podiums computed away from the GUI thread.
+
+    The engine and leaderboard are not touched by the worker once the
+    snapshot is handed over, the receiver takes ownership of them.
+    """
+    generation: int
+    engine: RankingEngine
+    leaderboard: Leaderboard
+
+def build_snapshot(store: ScoreStore, participants: Dict[int, Participant], generation: int,
+                   cancelled: Callable[[], bool] = lambda: False) -> Optional[RankingSnapshot]:
+    """Rank every finished participant of the store, None when cancelled part way"""
+    # Keys come from the copy too, the store may change while this runs.
+    # Its cache starts from the aggregates already known
+    scores, cache = store.snapshot_cache()
+    results = []
+    jury_scores = []
+    for style, style_scores in scores.items():
+        for i, (start_number, participant_scores) in enumerate(style_scores.items()):
+            if i % CANCEL_CHECK_EVERY == 0 and cancelled():
+                return None
+            participant = participants.get(int(start_number)) if start_number.isdigit() else None
+            if participant is None or participant.style.value != style:
+                continue
+            jury_scores.append((style, participant, participant_scores))
+            ranking = cache.ranking_key(style, start_number)
+            if ranking is not None:
+                results.append((style, participant, ranking))
+
+    store.aggregates.adopt(cache)
+
+    engine = RankingEngine()
+    engine.rebuild(results)
+    if cancelled():
+        return None
+
+    leaderboard = Leaderboard()
+    for style, participant, ranking in results:
+        leaderboard.update(style, participant, ranking)
+    for style, participant, participant_scores in jury_scores:
+        leaderboard.update_jury_scores(style, participant, participant_scores)
+    return RankingSnapshot(generation, engine, leaderboard)
@@ -0,0 +1,126 @@
+import http.client
+import json
+import threading
+import uuid
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+from .score_store import Change, ChangesRejected, ScoreStore
+
+DEFAULT_URL = 'http://127.0.0.1:8765'
+
+
+class AccessDenied(ChangesRejected, PermissionError):
+    """The server did not accept the token, or not for these jury members"""
+
+
+class RemoteScoreStore(ScoreStore):
+    """Client of a ScoreServer, holding a local copy of the scores.
+
+    ``write`` posts changes to the server, which persists them and recomputes
+    the final totals. What other clients change comes from ``fetch_changes``,
+    a long poll meant for a background thread; its result is applied with
+    ``apply`` on the thread that reads the scores.
+    """
+
+    def __init__(self, url: str = DEFAULT_URL, timeout: float = 10.0, poll_seconds: float = 20.0,
+                 token: Optional[str] = None):
+        super().__init__()
+        parts = urlsplit(url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.poll_seconds = poll_seconds
+        self.token = token  # Sent as X-Score-Token, the server's secret or a jury member's token
+        self.client_id = uuid.uuid4().hex
+        self.instance = None
+        self.seq = 0  # Last server change this copy has seen
+        self.closed = False
+        # One keep-alive connection for requests and one for the long poll
+        self._connections: Dict[str, http.client.HTTPConnection] = {}
+        self._channel_locks = {'main': threading.Lock(), 'poll': threading.Lock()}
+
+    def _request(self, channel: str, method: str, path: str, payload=None) -> Dict:
+        body = None if payload is None else json.dumps(payload, separators=(',', ':'))
+        headers = {'Content-Type': 'application/json', 'X-Client-Id': self.client_id}
+        if self.token:
+            headers['X-Score-Token'] = self.token
+        with self._channel_locks[channel]:
+            for attempt in range(2):
+                connection = self._connections.get(channel)
+                if connection is None:
+                    timeout = self.timeout + (self.poll_seconds if channel == 'poll' else 0)
+                    connection = http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+                    self._connections[channel] = connection
+                try:
+                    connection.request(method, path, body, headers)
+                    response = connection.getresponse()
+                    data = json.loads(response.read() or b'{}')
+                    break
+                except (OSError, http.client.HTTPException):
+                    # A kept-alive connection the server dropped gets one retry
+                    connection.close()
+                    self._connections.pop(channel, None)
+                    if attempt or self.closed:
+                        raise
+
+        if response.status == 400:
+            raise ChangesRejected(data.get('error', response.reason))
+        if response.status in (401, 403):
+            raise AccessDenied(f"Score server: {data.get('error', response.reason)}")
+        if response.status != 200:
+            raise ConnectionError(f"Score server: {data.get('error', response.reason)}")
+        return data
+
+    def load(self) -> Dict[str, Dict]:
+        self.replace_scores(self.fetch_scores())
+        return self.scores
+
+    def fetch_scores(self) -> Dict[str, Dict]:
+        """All scores from the server, following changes from there on"""
+        data = self._request('poll', 'GET', '/scores')
+        self.instance, self.seq = data['instance'], data['seq']
+        return data['scores']
+
+    def replace_scores(self, scores: Dict[str, Dict]):
+        """Replace the local copy in place, frames keep their style dicts"""
+        with self._scores_lock:
+            for style in set(self.scores) | set(scores):
+                style_scores = self.scores.setdefault(style, {})
+                style_scores.clear()
+                style_scores.update(scores.get(style, {}))
+        self.aggregates.clear()
+
+    def stored_entries(self, keys) -> List[Change]:
+        """The server's values of some entries, and the final totals of their participants"""
+        scores = self._request('main', 'GET', '/scores')['scores']
+        keys = set(keys) | {(style, start_number, 'final_total') for style, start_number, _ in keys}
+        return [(style, start_number, key, scores.get(style, {}).get(start_number, {}).get(key))
+                for style, start_number, key in sorted(keys)]
+
+    def write(self, changes: Iterable[Change]):
+        changes = [list(change) for change in changes]
+        if changes:
+            self._request('main', 'POST', '/changes', {'changes': changes})
+
+    def fetch_changes(self) -> Optional[List[Change]]:
+        """Changes other clients made since the last call, waiting up to poll_seconds for some.
+
+        Returns None when the server cannot tell, call ``fetch_scores`` then.
+        """
+        data = self._request('poll', 'GET', f'/changes?since={self.seq}&timeout={self.poll_seconds}'
+                                            f'&instance={self.instance}')
+        if data.get('reload'):
+            return None
+        self.seq = data['seq']
+        return [tuple(change) for change in data['changes']]
+
+    def close(self):
+        # Also ends a long poll blocked on another thread
+        self.closed = True
+        for connection in list(self._connections.values()):
+            if connection.sock is not None:
+                try:
+                    connection.sock.shutdown(2)
+                except OSError:
+                    pass
+            connection.close()
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import threading
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlsplit
+from .results_feed import ResultsState, apply_update, state_groups
+
+DEFAULT_RESULTS_PORT = 8766
+KEEPALIVE_SECONDS = 15.0
+MAX_BUFFERED_BYTES = 1 << 20  # Unsent data a subscriber may fall behind by before it is dropped
+
+
+def sse_event(event: str, seq: int, payload: Dict) -> bytes:
+    data = json.dumps(payload, separators=(',', ':'))
+    return f"id: {seq}\nevent: {event}\ndata: {data}\n\n".encode()
+
+
+class ResultsBroadcaster:
+    """Pushes ranking updates to scoreboards and venue screens as Server-Sent Events.
+
+    Runs its own event loop on a daemon thread. ``publish`` takes the group
+    differences of a ResultsFeed from any thread; each update is serialized
+    once and written to every subscriber of /results/stream, so an idle
+    screen costs one socket. The broadcaster keeps the results those updates
+    add up to: a new subscriber starts with them as a snapshot event, and
+    GET /results returns them as JSON. A subscriber that cannot keep up is
+    dropped, EventSource reconnects and gets a fresh snapshot.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_RESULTS_PORT):
+        self.host = host
+        self.port = port
+        self.seq = 0
+        self.state: ResultsState = {}
+        self.subscribers: Set[asyncio.StreamWriter] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.server = None
+        self._thread = None
+        self._handlers = set()
+
+    def start(self) -> int:
+        """Start serving, returns the port; raises OSError if it cannot listen"""
+        started = threading.Event()
+        errors = []
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            try:
+                self.server = self.loop.run_until_complete(
+                    asyncio.start_server(self.handle, self.host, self.port))
+            except OSError as e:
+                errors.append(e)
+                self.loop.close()
+                started.set()
+                return
+            self.port = self.server.sockets[0].getsockname()[1]
+            keepalive = self.loop.create_task(self._keepalive())
+            started.set()
+            self.loop.run_forever()
+
+            keepalive.cancel()
+            for task in list(self._handlers):
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(keepalive, *self._handlers, return_exceptions=True))
+            self.loop.close()
+
+        self._thread = threading.Thread(target=run, name='results-broadcast', daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+        return self.port
+
+    def publish(self, groups: List[Dict]):
+        """Send the group differences of one update, callable from any thread"""
+        if groups and self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._publish, groups)
+
+    def stop(self):
+        if self.loop is None or self.loop.is_closed():
+            return
+
+        def shutdown():
+            self.server.close()
+            for writer in list(self.subscribers):
+                writer.close()
+            self.loop.stop()
+        self.loop.call_soon_threadsafe(shutdown)
+        self._thread.join(5)
+
+    def _publish(self, groups: List[Dict]):
+        self.seq += 1
+        apply_update(self.state, groups)
+        if self.subscribers:
+            self._send_all(sse_event('update', self.seq, {'seq': self.seq, 'groups': groups}))
+
+    def _send_all(self, data: bytes):
+        for writer in list(self.subscribers):
+            if writer.transport.get_write_buffer_size() > MAX_BUFFERED_BYTES:
+                self.subscribers.discard(writer)
+                writer.close()
+            else:
+                writer.write(data)
+
+    async def _keepalive(self):
+        # Keeps proxies and screens from timing out a quiet stream
+        while True:
+            await asyncio.sleep(KEEPALIVE_SECONDS)
+            self._send_all(b': keepalive\n\n')
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            request_line = await reader.readline()
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            path = urlsplit(target).path.rstrip('/')
+
+            if method != 'GET' or path not in ('/results', '/results/stream'):
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                return
+            if path == '/results':
+                data = json.dumps({'seq': self.seq, 'groups': state_groups(self.state)},
+                                  separators=(',', ':')).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Access-Control-Allow-Origin: *\r\nConnection: close\r\n"
+                             + f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                return
+
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Cache-Control: no-cache\r\nAccess-Control-Allow-Origin: *\r\n\r\n"
+                         + sse_event('snapshot', self.seq, {'seq': self.seq, 'groups': state_groups(self.state)}))
+            self.subscribers.add(writer)
+            # Nothing more comes from the client, the read ends when it goes away
+            while await reader.read(1024):
+                pass
+        except (ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass  # Broadcaster stopping
+        finally:
+            self.subscribers.discard(writer)
+            self._handlers.discard(task)
+            writer.close()
@@ -0,0 +1,163 @@
+import csv
+import html
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+from ..models.category import AGE_GROUP_ORDER, CATEGORY_ORDER, STYLE_ORDER, AgeGroup, Category, Style
+from ..models.participant import Participant
+from ..models.ranking import RankingEntry
+from ..models.score import CRITERIA
+from ..models.score_matrix import ScoreMatrix
+from .ranking_engine import GroupKey
+from .results_feed import ranked_rows
+
+RESULT_COLUMNS = ['style', 'category', 'age_group', 'rank', 'start_number', 'name', 'final_total']
+SHEET_COLUMNS = ['jury_id', 'style', 'category', 'age_group', 'start_number', 'name', *CRITERIA, 'total']
+MEANS_COLUMNS = ['style', 'jury_id', 'mean_total']
+PODIUM_PLACES = 3
+
+Section = Tuple[str, Iterator[Sequence]]  # Heading and rows of one part of a report
+
+
+@dataclass
+class Report:
+    """A table produced lazily, in sections the HTML report prints one after another"""
+    name: str
+    title: str
+    columns: List[str]
+    sections: Iterator[Section]
+
+    def rows(self) -> Iterator[Sequence]:
+        for _, rows in self.sections:
+            yield from rows
+
+
+def group_order(key: GroupKey) -> tuple:
+    """Competition order of a (style, category, age_group) group, as in the rankings tab"""
+    style, category, age_group = key
+    return STYLE_ORDER[Style(style)], AGE_GROUP_ORDER[AgeGroup(age_group)], CATEGORY_ORDER[Category(category)]
+
+
+def group_heading(key: GroupKey) -> str:
+    style, category, age_group = key
+    return f"{style.capitalize()} | {age_group.upper()} | {category.upper()}"
+
+
+def _group_rows(key: GroupKey, entries: List[RankingEntry], places: Optional[int] = None) -> Iterator[list]:
+    style, category, age_group = key
+    for row in ranked_rows(entries):
+        if places is not None and row['rank'] > places:
+            return
+        yield [style, category, age_group, row['rank'], row['start_number'], row['name'], row['score']]
+
+
+def results_report(groups: Dict[GroupKey, List[RankingEntry]]) -> Report:
+    """Every ranked participant, group by group"""
+    sections = ((group_heading(key), _group_rows(key, groups[key]))
+                for key in sorted(groups, key=group_order) if groups[key])
+    return Report('results', "Results", RESULT_COLUMNS, sections)
+
+
+def podiums_report(groups: Dict[GroupKey, List[RankingEntry]], places: int = PODIUM_PLACES) -> Report:
+    """The first places of every group, ties included"""
+    sections = ((group_heading(key), _group_rows(key, groups[key], places))
+                for key in sorted(groups, key=group_order) if groups[key])
+    return Report('podiums', "Podiums", RESULT_COLUMNS, sections)
+
+
+def jury_sheets_report(scores: Dict[str, Dict], participants: Iterable[Participant],
+                       jury_ids: Iterable) -> Report:
+    """What each jury member gave, one sheet per jury member in running order"""
+    running_order = sorted(participants, key=Participant.sort_key)
+
+    def sheet(jury_id: str) -> Iterator[list]:
+        for participant in running_order:
+            style = participant.style.value
+            s = scores.get(style, {}).get(str(participant.start_number), {}).get(jury_id)
+            if s is not None:
+                yield [jury_id, style, participant.category.value, participant.age_group.value,
+                       participant.start_number, participant.name, *(s[c] for c in CRITERIA), s['total']]
+
+    sections = ((f"Jury {jury_id}", sheet(str(jury_id))) for jury_id in jury_ids)
+    return Report('jury_sheets', "Jury score sheets", SHEET_COLUMNS, sections)
+
+
+def jury_means_report(scores: Dict[str, Dict], jury_ids: Iterable) -> Report:
+    """Mean total each jury member gave per style, to spot a strict or lenient jury member"""
+    jury_ids = [str(jury_id) for jury_id in jury_ids]
+
+    def style_means(style: str) -> Iterator[list]:
+        for jury_id, mean in ScoreMatrix.from_json(scores[style], jury_ids).jury_means().items():
+            if mean is not None:
+                yield [style, jury_id, round(mean, 2)]
+
+    styles = [style.value for style in sorted(STYLE_ORDER, key=STYLE_ORDER.get) if scores.get(style.value)]
+    sections = ((style.capitalize(), style_means(style)) for style in styles)
+    return Report('jury_means', "Jury means", MEANS_COLUMNS, sections)
+
+
+def write_csv(report: Report, f: TextIO):
+    writer = csv.writer(f)
+    writer.writerow(report.columns)
+    writer.writerows(report.rows())
+
+
+def write_jsonl(report: Report, f: TextIO):
+    columns = report.columns
+    for row in report.rows():
+        f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n')
+
+
+HTML_STYLE = """
+body { font-family: sans-serif; font-size: 10pt; margin: 1.5em; }
+h1 { font-size: 16pt; }
+h2 { font-size: 12pt; margin: 1.2em 0 0.4em; break-after: avoid; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #999; padding: 2px 6px; text-align: left; }
+th { background: #eee; }
+tr { break-inside: avoid; }
+thead { display: table-header-group; }
+@media print { body { margin: 0; } section { break-inside: auto; } }
+"""
+
+
+def write_html(report: Report, f: TextIO):
+    """A self-contained page, the browser's print dialog gives the paper version"""
+    title = html.escape(report.title)
+    head = ''.join(f"<th>{html.escape(column.replace('_', ' '))}</th>" for column in report.columns)
+    f.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{title}</title>"
+            f"<style>{HTML_STYLE}</style></head>\n<body><h1>{title}</h1>\n")
+    for heading, rows in report.sections:
+        f.write(f"<section><h2>{html.escape(heading)}</h2>\n<table><thead><tr>{head}</tr></thead><tbody>\n")
+        for row in rows:
+            f.write('<tr>' + ''.join(f"<td>{html.escape(str(value))}</td>" for value in row) + '</tr>\n')
+        f.write("</tbody></table></section>\n")
+    f.write("</body></html>\n")
+
+
+WRITERS: Dict[str, Callable[[Report, TextIO], None]] = {'csv': write_csv, 'jsonl': write_jsonl, 'html': write_html}
+REPORTS = ('results', 'podiums', 'jury_sheets', 'jury_means')
+
+
+def export_reports(output_dir: str, prefix: str, groups: Dict[GroupKey, List[RankingEntry]],
+                   scores: Dict[str, Dict], participants: Iterable[Participant], jury_ids: Iterable,
+                   reports: Iterable[str] = ('results',), formats: Iterable[str] = ('csv',)) -> List[str]:
+    """Write <prefix>-<report>.<format> files, returns their paths"""
+    participants = list(participants)
+    jury_ids = list(jury_ids)
+    builders = {
+        'results': lambda: results_report(groups),
+        'podiums': lambda: podiums_report(groups),
+        'jury_sheets': lambda: jury_sheets_report(scores, participants, jury_ids),
+        'jury_means': lambda: jury_means_report(scores, jury_ids),
+    }
+    paths = []
+    for name in reports:
+        for fmt in formats:
+            path = os.path.join(output_dir, f"{prefix}-{name}.{fmt}")
+            # Reports are generators, each file needs its own
+            with open(path, 'w', newline='' if fmt == 'csv' else None, encoding='utf-8') as f:
+                WRITERS[fmt](builders[name](), f)
+            paths.append(path)
+    return paths
@@ -0,0 +1,84 @@
+from typing import Dict, Iterable, List, Optional, Set
+from ..models.ranking import RankingEntry
+from .ranking_engine import GroupKey
+
+# {group key: {start number: row}}, a row is {'start_number', 'name', 'score', 'rank'}
+ResultsState = Dict[GroupKey, Dict[int, Dict]]
+
+
+def ranked_rows(entries: List[RankingEntry]) -> List[Dict]:
+    """Rows of a best-first group, truly equal entries share the best rank"""
+    rows = []
+    for index, entry in enumerate(entries):
+        rank = rows[-1]['rank'] if index and entries[index - 1].key == entry.key else index + 1
+        rows.append({'start_number': entry.start_number, 'name': entry.name,
+                     'score': entry.score, 'rank': rank})
+    return rows
+
+
+def group_id(key: GroupKey) -> Dict[str, str]:
+    style, category, age_group = key
+    return {'style': style, 'category': category, 'age_group': age_group}
+
+
+def apply_update(state: ResultsState, groups: Iterable[Dict]):
+    """Apply the group differences of one update to a copy of the results"""
+    for group in groups:
+        key = (group['group']['style'], group['group']['category'], group['group']['age_group'])
+        rows = state.setdefault(key, {})
+        for start_number in group['removed']:
+            rows.pop(start_number, None)
+        for row in group['rows']:
+            rows[row['start_number']] = {k: v for k, v in row.items() if k != 'previous_rank'}
+        if not rows:
+            del state[key]
+
+
+def state_groups(state: ResultsState) -> List[Dict]:
+    """All results as group entries, rows in rank order"""
+    return [{'group': group_id(key),
+             'rows': sorted(rows.values(), key=lambda row: (row['rank'], row['start_number']))}
+            for key, rows in sorted(state.items())]
+
+
+class ResultsFeed:
+    """Row-level differences of the group rankings between two publishes.
+
+    Groups are marked when the ranking engine moves an entry in them. Only
+    those are compared with the rows published last, and only rows that are
+    new, rescored or moved to another rank go out, each with its previous
+    rank. A full recompute marks every group.
+    """
+
+    def __init__(self):
+        self.published: ResultsState = {}
+        self.dirty: Set[GroupKey] = set()
+        self.all_dirty = False
+
+    def mark(self, key: Optional[GroupKey] = None):
+        """Mark one group as changed, or all of them without a key"""
+        if key is None:
+            self.all_dirty = True
+        else:
+            self.dirty.add(key)
+
+    def changes(self, groups: Dict[GroupKey, List[RankingEntry]]) -> List[Dict]:
+        """Differences of the marked groups since the last call, as update group entries"""
+        keys = set(groups) | set(self.published) if self.all_dirty else self.dirty
+        self.dirty = set()
+        self.all_dirty = False
+
+        updates = []
+        for key in sorted(keys):
+            current = {row['start_number']: row for row in ranked_rows(groups.get(key, []))}
+            previous = self.published.get(key, {})
+            rows = [dict(row, previous_rank=previous[start_number]['rank'] if start_number in previous else None)
+                    for start_number, row in current.items() if previous.get(start_number) != row]
+            removed = [start_number for start_number in previous if start_number not in current]
+            if rows or removed:
+                updates.append({'group': group_id(key), 'rows': rows, 'removed': removed})
+            if current:
+                self.published[key] = current
+            else:
+                self.published.pop(key, None)
+        return updates
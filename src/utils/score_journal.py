@@ -0,0 +1,361 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .score_store import Change, ScoreStore
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # No file locking, one station per data directory
+
+ParticipantKey = Tuple[str, str]  # (style, start_number)
+
+
+def atomic_write(path: str, text: str):
+    """Replace a file so readers see either the old or the new content"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    # Make the rename itself durable
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def replay(scores: Dict[str, Dict], changes: Iterable[Change]):
+    """Apply changes to a plain scores dict"""
+    for style, start_number, key, value in changes:
+        participant_scores = scores.setdefault(style, {}).setdefault(start_number, {})
+        if value is None:
+            participant_scores.pop(key, None)
+        else:
+            participant_scores[key] = value
+
+
+def parse_record(line: bytes) -> Change:
+    record = json.loads(line)
+    return record['s'], record['p'], record['k'], record['v']
+
+
+def read_journaled_scores(snapshot_path: str, journal_path: Optional[str] = None) -> Dict[str, Dict]:
+    """Snapshot plus journal without writing to either, unlike loading a ScoreJournal"""
+    journal_path = journal_path or os.path.splitext(snapshot_path)[0] + '.journal'
+    try:
+        with open(snapshot_path, 'r') as f:
+            scores = json.load(f)
+    except FileNotFoundError:
+        scores = {}  # Nothing compacted yet, everything is in the journal
+    try:
+        with open(journal_path, 'rb') as f:
+            # A partial last line is a write that never completed
+            replay(scores, (parse_record(line) for line in f if line.endswith(b'\n') and line.strip()))
+    except FileNotFoundError:
+        pass
+    return scores
+
+
+class ScoreJournal(ScoreStore):
+    """Append-only write-ahead journal in front of the scores.json snapshot.
+
+    Every change is appended as one compact JSON line, so the cost of a save
+    does not depend on the size of the event. The journal is replayed on top
+    of the snapshot when loading and folded back into it every
+    ``compact_every`` records.
+
+    Several stations may share one data directory. Journal access holds an
+    exclusive lock on scores.lock, and a write first reads what other
+    stations appended. ``versions`` counts the journal records seen per
+    participant. A write is a compare-and-swap against the version its edits
+    were based on: when another station wrote the participant in between,
+    only the changed jury entries are written and the final total is
+    recomputed from the merged scores with ``total_rule``. Other stations'
+    changes reach the in-memory scores through ``sync``.
+    """
+
+    def __init__(self, snapshot_path: str = 'data/scores.json',
+                 journal_path: Optional[str] = None, compact_every: int = 500,
+                 fsync: bool = False,
+                 total_rule: Optional[Callable[[Dict], Optional[float]]] = None):
+        super().__init__()
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + '.journal'
+        self.lock_path = os.path.splitext(self.journal_path)[0] + '.lock'
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.total_rule = total_rule
+        self.pending = 0  # Records in the journal since the last compaction
+        self.offset = 0  # Journal bytes this store has read or written
+        self.versions: Dict[ParticipantKey, int] = defaultdict(int)
+        self.synced: Dict[ParticipantKey, int] = defaultdict(int)  # Versions the in-memory scores include
+        self.conflicts = 0  # Writes merged with another station's edits
+        self._bases: Dict[ParticipantKey, int] = {}  # Version unwritten local edits started from
+        self._dirty: Dict[Tuple[str, str, str], object] = {}  # Applied here, not written yet
+        self._incoming: List[Change] = []  # Read from the journal, not applied yet
+        self._file = None
+        self._lock_file = None
+        self._io_lock = threading.Lock()
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        if self._lock_file is None:
+            self._lock_file = open(self.lock_path, 'a')
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def load(self) -> Dict[str, Dict]:
+        """Read the snapshot and replay the journal on top of it"""
+        with self._io_lock, self._file_lock():
+            self.scores = self._read_snapshot()
+            self.aggregates.clear()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.offset = self.pending = 0
+            self.versions.clear()
+            self._bases.clear()
+            self._dirty.clear()
+            self._incoming = []
+
+            replay(self.scores, self._read_journal())
+            self.synced = self.versions.copy()
+            if self.pending >= self.compact_every:
+                self._compact()
+        return self.scores
+
+    def _read_snapshot(self) -> Dict[str, Dict]:
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _read_journal(self) -> List[Change]:
+        """Records appended since this store last read or wrote, with the file lock held"""
+        if self._file is not None and self._rotated():
+            self._rebase()
+            return []
+        return self._read_records()
+
+    def _rebase(self):
+        """Catch up after another station compacted, possibly more than once.
+
+        The new snapshot and journal hold everything written so far, what
+        this store misses is their difference to its scores plus the changes
+        it has not applied yet.
+        """
+        self._file.close()
+        self._file = None
+        self.offset = self.pending = 0
+        current = self._read_snapshot()
+        replay(current, self._read_records())
+
+        known = self.snapshot()
+        replay(known, self._incoming)
+        for style in set(known) | set(current):
+            known_style, current_style = known.get(style, {}), current.get(style, {})
+            for start_number in set(known_style) | set(current_style):
+                changes = [change for change in self.diff(style, start_number,
+                                                          known_style.get(start_number, {}),
+                                                          current_style.get(start_number, {}))
+                           if change[:3] not in self._dirty]  # Not written yet, so not in the files
+                if changes:
+                    self._incoming.extend(changes)
+                    self.versions[(style, start_number)] += 1
+
+    def _rotated(self) -> bool:
+        try:
+            return os.stat(self.journal_path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def _read_records(self) -> List[Change]:
+        if self._file is None:
+            # Created if missing, so a compaction by another station always
+            # shows as a new inode
+            self._file = open(self.journal_path, 'a+b')
+        self._file.seek(self.offset)
+        data = self._file.read()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            # Partial last line from an interrupted write, nobody else is writing
+            self._file.truncate(self.offset + end)
+
+        changes = []
+        for line in data[:end].splitlines():
+            if line.strip():
+                change = parse_record(line)
+                changes.append(change)
+                self.versions[change[:2]] += 1
+        self.offset += end
+        self.pending += len(changes)
+        return changes
+
+    def has_news(self) -> bool:
+        """Cheap check whether sync has anything to do, safe without the locks"""
+        if self._incoming:
+            return True
+        journal = self._file
+        try:
+            stat = os.stat(self.journal_path)
+            if journal is None:
+                return stat.st_size > 0
+            return stat.st_size != self.offset or stat.st_ino != os.fstat(journal.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError):
+            return True  # Closed by a compaction in progress, sync will tell
+
+    def sync(self) -> List[Change]:
+        """Apply the changes other stations wrote, returns those applied"""
+        if not self.has_news():
+            return []
+        with self._io_lock:
+            with self._file_lock():
+                self._incoming.extend(self._read_journal())
+            incoming, self._incoming = self._incoming, []
+            applied = []
+            with self._scores_lock:
+                for change in incoming:
+                    # An unwritten local edit of the same entry will replace it
+                    if change[:3] not in self._dirty:
+                        self._apply(*change)
+                        applied.append(change)
+                for participant in {change[:2] for change in incoming}:
+                    self.synced[participant] = self.versions[participant]
+        return applied
+
+    def apply(self, changes: Iterable[Change]):
+        """Apply local edits in memory, remembering which version they start from"""
+        with self._scores_lock:
+            for style, start_number, key, value in changes:
+                self._bases.setdefault((style, start_number), self.synced[(style, start_number)])
+                self._dirty[(style, start_number, key)] = value
+                self._apply(style, start_number, key, value)
+
+    def write(self, changes: Iterable[Change]):
+        """Append already applied changes to the journal file"""
+        changes = list(changes)
+        if not changes:
+            return
+
+        with self._io_lock, self._file_lock():
+            self._incoming.extend(self._read_journal())
+            submitted, changes = changes, self._merge(changes)
+            lines = [json.dumps({'s': style, 'p': start_number, 'k': key, 'v': value},
+                                separators=(',', ':')) + '\n'
+                     for style, start_number, key, value in changes]
+            data = ''.join(lines).encode()
+
+            if self._file is None:
+                self._file = open(self.journal_path, 'a+b')
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.offset += len(data)
+            self.pending += len(lines)
+
+            with self._scores_lock:
+                for change in changes:
+                    self.versions[change[:2]] += 1
+                # Edits made again since they were submitted stay unwritten
+                for style, start_number, key, value in submitted:
+                    if self._dirty.get((style, start_number, key), value) is value:
+                        self._dirty.pop((style, start_number, key), None)
+                for participant in {change[:2] for change in changes}:
+                    if not any(c[:2] == participant for c in self._incoming):
+                        self.synced[participant] = self.versions[participant]
+                    if not any(key[:2] == participant for key in self._dirty):
+                        self._bases.pop(participant, None)
+
+            if self.pending >= self.compact_every:
+                self._compact()
+
+    def _merge(self, changes: List[Change]) -> List[Change]:
+        """Changes to write, merged per participant with other stations' edits read just before"""
+        by_participant: Dict[ParticipantKey, List[Change]] = defaultdict(list)
+        for change in changes:
+            by_participant[change[:2]].append(change)
+
+        merged = []
+        for participant, participant_changes in by_participant.items():
+            keys = {change[2] for change in participant_changes}
+            # Other stations' edits of the entries written here are superseded
+            self._incoming = [c for c in self._incoming if c[:2] != participant or c[2] not in keys]
+            base = self._bases.get(participant, self.synced[participant])
+            if self.versions[participant] == base:
+                merged.extend(participant_changes)
+                continue
+
+            # Compare-and-swap failed: keep their other entries, write our
+            # changed ones and a final total for the combination
+            self.conflicts += 1
+            if self.total_rule is None:
+                merged.extend(participant_changes)
+                continue
+            scores = {participant[0]: {participant[1]: self.copy_participant_scores(*participant)}}
+            replay(scores, [c for c in self._incoming if c[:2] == participant])
+            replay(scores, participant_changes)
+            participant_scores = scores[participant[0]][participant[1]]
+            total = self.total_rule({k: v for k, v in participant_scores.items() if k != 'final_total'})
+
+            final_change = (*participant, 'final_total', total)
+            merged.extend(c for c in participant_changes if c[2] != 'final_total')
+            merged.append(final_change)
+            if self.participant_scores(*participant).get('final_total') != total:
+                # Corrects the in-memory total on the next sync
+                self._incoming.append(final_change)
+        return merged
+
+    def compact(self):
+        """Write the current state as the new snapshot and start a new journal"""
+        with self._io_lock, self._file_lock():
+            self._incoming.extend(self._read_journal())
+            self._compact()
+
+    def _compact(self):
+        # Built from the files, the in-memory scores may hold unwritten edits
+        scores = self._read_snapshot()
+        if self._file is not None:
+            self._file.seek(0)
+            replay(scores, (parse_record(line) for line in self._file.read().splitlines() if line.strip()))
+            self._file.close()
+            self._file = None
+        atomic_write(self.snapshot_path, json.dumps(scores, indent=2))
+
+        # Replaying the old journal over the new snapshot is idempotent, so a
+        # crash before the replace below loses nothing. Other stations notice
+        # the new journal by its inode.
+        atomic_write(self.journal_path, '')
+        self._file = open(self.journal_path, 'a+b')
+        self.offset = 0
+        self.pending = 0
+
+    def close(self):
+        with self._io_lock:
+            if self.pending:
+                with self._file_lock():
+                    self._incoming.extend(self._read_journal())
+                    self._compact()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
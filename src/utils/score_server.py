@@ -0,0 +1,356 @@
+import argparse
+import asyncio
+import hmac
+import itertools
+import json
+import os
+import signal
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+from ..models.category import Style
+from ..models.score import CRITERIA
+from .ranking_rules import CompiledRules, get_ranking_rules, load_jury_members
+from .score_store import Change, ScoreStore, open_score_store
+
+DEFAULT_PORT = 8765
+MAX_POLL_SECONDS = 30.0
+WRITE_TIMEOUT_SECONDS = 10.0
+STYLES = {style.value for style in Style}
+REASONS = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 403: 'Forbidden', 404: 'Not Found',
+           503: 'Service Unavailable'}
+LOCAL_HOSTS = ('127.0.0.1', '::1', 'localhost')
+
+
+class ScoreServer:
+    """Scoring service for juror devices, the only writer of the score store.
+
+    Submissions are checked and applied to the in-memory scores on the event
+    loop, which also recomputes final totals from the jury scores, so clients
+    cannot overwrite each other's entries. One writer task persists whatever
+    accumulated since its last write in a single store write and requests are
+    answered once their changes are on disk. Every accepted change gets a
+    sequence number, clients follow the others with a long poll on /changes.
+
+    With a shared secret or jury tokens every request needs an X-Score-Token
+    header. The secret may score for every jury member, a jury member's token
+    only for that jury member.
+    """
+
+    def __init__(self, store: ScoreStore, rules: CompiledRules, jury_ids: Iterable,
+                 history: int = 10000, secret: Optional[str] = None,
+                 tokens: Optional[Dict[str, str]] = None):
+        self.store = store
+        self.rules = rules
+        self.jury_ids = [str(jury_id) for jury_id in jury_ids]
+        self.secret = secret
+        self.tokens = {str(jury_id): token for jury_id, token in (tokens or {}).items() if token}
+        self.instance = uuid.uuid4().hex  # Tells clients the server restarted
+        self.seq = 0
+        self.written_seq = 0
+        self.history = deque(maxlen=history)  # (seq, origin, change)
+        self._unwritten: List[Change] = []
+        self._changed = asyncio.Condition()
+        self._written = asyncio.Condition()
+        self._pending = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._writer_task = None
+        self._handlers = set()  # Connection tasks, ended on stop
+        self.server = None
+
+    @property
+    def requires_token(self) -> bool:
+        return bool(self.secret or self.tokens)
+
+    def allowed_jury_ids(self, token: Optional[str]) -> Optional[Set[str]]:
+        """The jury members a request may score for, None if its token is not accepted"""
+        if not self.requires_token:
+            return set(self.jury_ids)
+        if not token:
+            return None
+        token = token.encode()
+        if self.secret and hmac.compare_digest(token, self.secret.encode()):
+            return set(self.jury_ids)
+        for jury_id, jury_token in self.tokens.items():
+            if hmac.compare_digest(token, jury_token.encode()):
+                return {jury_id}
+        return None
+
+    def check(self, change) -> Change:
+        """A submitted change in store form, raises ValueError if it is not acceptable"""
+        try:
+            style, start_number, key, value = change
+        except (TypeError, ValueError):
+            raise ValueError(f"Malformed change: {change!r}")
+        style, start_number, key = str(style), str(start_number), str(key)
+        if style not in STYLES:
+            raise ValueError(f"Unknown style: {style}")
+        if not start_number.isdigit():
+            raise ValueError(f"Invalid start number: {start_number}")
+        if key == 'final_total':
+            return style, start_number, key, value  # Recomputed by the server
+        if key not in self.jury_ids:
+            raise ValueError(f"Unknown jury member: {key}")
+        if value is None:
+            return style, start_number, key, None
+        if not isinstance(value, dict):
+            raise ValueError(f"Invalid scores for jury member {key}")
+
+        jury_score = {}
+        for criterion in CRITERIA:
+            score = value.get(criterion)
+            if type(score) is not int or score <= 0 or not self.rules.validate(criterion, score):
+                raise ValueError(f"Invalid {criterion} score: {score!r}")
+            jury_score[criterion] = score
+        jury_score['total'] = sum(jury_score.values())
+        return style, start_number, key, jury_score
+
+    def submit(self, changes: Iterable, origin: Optional[str] = None,
+               allowed: Optional[Set[str]] = None) -> int:
+        """Apply a client's changes and the final totals they lead to, returns the last sequence number.
+
+        Either every change is accepted or none is. PermissionError for scores
+        of jury members not in allowed.
+        """
+        changes = [self.check(change) for change in changes]
+        if allowed is not None:
+            for _, _, key, _ in changes:
+                if key != 'final_total' and key not in allowed:
+                    raise PermissionError(f"Not allowed to score for jury member {key}")
+        submitted_totals = {(style, start_number): value
+                            for style, start_number, key, value in changes if key == 'final_total'}
+        jury_changes = [change for change in changes if change[2] != 'final_total'
+                        and self.store.participant_scores(change[0], change[1]).get(change[2]) != change[3]]
+        self.store.apply(jury_changes)
+        self._record(jury_changes, origin)
+
+        # Final totals come from the server's scores, a client's own may be stale
+        total_changes = []
+        touched = {(style, start_number) for style, start_number, _, _ in jury_changes}
+        for style, start_number in sorted(touched | submitted_totals.keys()):
+            participant_scores = self.store.participant_scores(style, start_number)
+            total = self.rules.final_total(participant_scores, len(self.jury_ids))
+            if participant_scores.get('final_total') != total \
+                    or submitted_totals.get((style, start_number), total) != total:
+                total_changes.append((style, start_number, 'final_total', total))
+        self.store.apply(total_changes)
+        self._record(total_changes, None)  # Sent to every client, the submitter included
+
+        self._unwritten.extend(jury_changes)
+        self._unwritten.extend(total_changes)
+        if jury_changes or total_changes:
+            self._pending.set()
+        return self.seq
+
+    def _record(self, changes: List[Change], origin: Optional[str]):
+        for change in changes:
+            self.seq += 1
+            self.history.append((self.seq, origin, change))
+
+    def changes_since(self, since: int, origin: Optional[str] = None) -> Optional[List[Change]]:
+        """Changes after a sequence number not made by origin, None when the history no longer reaches back"""
+        if since > self.seq or (self.history and self.history[0][0] > since + 1):
+            return None
+        start = len(self.history) - (self.seq - since)
+        return [change for _, change_origin, change in itertools.islice(self.history, start, None)
+                if origin is None or change_origin != origin]
+
+    async def wait_changes(self, since: int, origin: Optional[str], timeout: float) -> Optional[List[Change]]:
+        """changes_since, waiting up to timeout seconds while there are none"""
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(
+                    lambda: self.changes_since(since, origin) != []), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.changes_since(since, origin)
+
+    async def wait_written(self, seq: int, timeout: float = WRITE_TIMEOUT_SECONDS) -> bool:
+        async with self._written:
+            try:
+                await asyncio.wait_for(self._written.wait_for(lambda: self.written_seq >= seq), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    async def _notify_changed(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _write_loop(self):
+        # Everything submitted while a write runs goes out together in the next one
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._pending.wait()
+            self._pending.clear()
+            changes, self._unwritten = self._unwritten, []
+            seq = self.seq
+            try:
+                await loop.run_in_executor(self._executor, self.store.write, changes)
+            except Exception as e:
+                print(f"Error writing scores: {e}")
+                self._unwritten[:0] = changes
+                await asyncio.sleep(1)
+                self._pending.set()
+                continue
+            async with self._written:
+                self.written_seq = seq
+                self._written.notify_all()
+
+    async def dispatch(self, method: str, target: str, headers: Dict[str, str],
+                       body: bytes) -> Tuple[int, Dict]:
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        path = [part for part in url.path.split('/') if part]
+        origin = headers.get('x-client-id')
+        allowed = self.allowed_jury_ids(headers.get('x-score-token'))
+        if allowed is None:
+            return 401, {'error': 'Missing or unknown X-Score-Token'}
+
+        if method == 'GET' and path == ['scores']:
+            return 200, {'instance': self.instance, 'seq': self.seq, 'scores': self.store.snapshot()}
+
+        if method == 'GET' and path == ['changes']:
+            try:
+                since = int(query.get('since', ['0'])[0])
+                timeout = min(float(query.get('timeout', ['0'])[0]), MAX_POLL_SECONDS)
+            except ValueError:
+                return 400, {'error': 'Invalid since or timeout'}
+            changes = None
+            if query.get('instance', [self.instance])[0] == self.instance:
+                changes = await self.wait_changes(since, origin, timeout)
+            if changes is None:
+                return 200, {'instance': self.instance, 'seq': self.seq, 'reload': True}
+            return 200, {'instance': self.instance, 'seq': self.seq, 'changes': changes}
+
+        try:
+            if method == 'POST' and path == ['changes']:
+                changes = json.loads(body)['changes']
+            elif method in ('PUT', 'DELETE') and len(path) == 4 and path[0] == 'scores':
+                # One juror's scores: /scores/<style>/<start number>/<jury id>
+                _, style, start_number, jury_id = path
+                changes = [(style, start_number, jury_id, json.loads(body) if method == 'PUT' else None)]
+            else:
+                return 404, {'error': 'Not found'}
+            seq = self.submit(changes, origin, allowed)
+        except PermissionError as e:
+            return 403, {'error': str(e)}
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'error': str(e)}
+
+        await self._notify_changed()
+        if not await self.wait_written(seq):
+            return 503, {'error': 'Scores not saved yet', 'seq': seq}
+        return 200, {'seq': seq}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """HTTP/1.1 with keep-alive, JSON in and out"""
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self.dispatch(method, target, headers, body)
+                data = json.dumps(payload, separators=(',', ':')).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                head = [f"HTTP/1.1 {status} {REASONS[status]}",
+                        "Content-Type: application/json",
+                        f"Content-Length: {len(data)}"]
+                if not keep_alive:
+                    head.append("Connection: close")
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass  # Server stopping, possibly during a long poll
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> int:
+        """Start listening, returns the port"""
+        self._writer_task = asyncio.create_task(self._write_loop())
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop listening, write what is left and close the store"""
+        self.server.close()
+        handlers = list(self._handlers)
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self.server.wait_closed()
+        self._writer_task.cancel()
+        self._executor.shutdown(wait=True)
+        if self._unwritten:
+            self.store.write(self._unwritten)
+            self._unwritten = []
+        self.store.close()
+
+    async def serve(self, host: str, port: int):
+        port = await self.start(host, port)
+        print(f"Scoring server listening on {host}:{port}")
+        stopped = asyncio.Event()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            try:
+                asyncio.get_running_loop().add_signal_handler(signal_number, stopped.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows, Ctrl+C still ends asyncio.run
+        try:
+            await stopped.wait()
+        finally:
+            await self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scoring server for juror devices")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on, 0.0.0.0 for the venue LAN")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--backend', choices=['json', 'sqlite'], default=None,
+                        help="Score store, defaults to SCORE_STORE or json")
+    args = parser.parse_args(argv)
+
+    backend = args.backend or os.environ.get('SCORE_STORE', 'json')
+    if backend not in ('json', 'sqlite'):
+        backend = 'json'  # The server is what remote clients talk to
+    config_path = os.path.join(args.data_dir, 'jury_config.json')
+    try:
+        members = load_jury_members(config_path)
+    except ValueError as e:
+        parser.error(str(e))
+    jury_ids = [str(member['id']) for member in members]
+    tokens = {str(member['id']): member.get('token') for member in members}
+    secret = os.environ.get('SCORE_SERVER_TOKEN')
+    if args.host not in LOCAL_HOSTS and not secret and not any(tokens.values()):
+        parser.error(f"Listening on {args.host} needs SCORE_SERVER_TOKEN or jury member tokens in {config_path}")
+    server = ScoreServer(open_score_store(args.data_dir, backend), get_ranking_rules(config_path), jury_ids,
+                         secret=secret, tokens=tokens)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    # python -m src.utils.score_server --host 0.0.0.0
+    main()
@@ -0,0 +1,170 @@
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from .aggregate_cache import AggregateCache
+from .ranking_engine import GroupKey, RankingKey
+from .ranking_rules import CompiledRules
+
+# (style, start_number, key, value) - key is a jury id or 'final_total',
+# a value of None removes the key
+Change = Tuple[str, str, str, Optional[object]]
+
+
+class ChangesRejected(ValueError):
+    """The storage refused changes, writing them again cannot succeed"""
+
+
+class ScoreStore:
+    """Storage interface for scores shared by the style and rankings frames.
+
+    Scores are kept in memory in the scores.json layout
+    ``{style: {start_number: {jury_id: {...}, 'final_total': x}}}``.
+    ``apply`` changes that in-memory state and ``write`` persists changes that
+    were already applied, so the two may run on different threads.
+    ``aggregates`` caches per-participant totals and ranking keys, applying a
+    change invalidates only the participant it touches.
+    """
+
+    def __init__(self):
+        self.scores: Dict[str, Dict] = {}
+        self.groups: Dict[GroupKey, List[str]] = defaultdict(list)
+        self.aggregates = AggregateCache(self.copy_participant_scores)
+        self._scores_lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict]:
+        raise NotImplementedError
+
+    def write(self, changes: Iterable[Change]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def stored_entries(self, keys: Iterable[Tuple[str, str, str]]) -> List[Change]:
+        """Changes that set (style, start_number, key) entries back to what the storage holds"""
+        raise NotImplementedError
+
+    def sync(self) -> List[Change]:
+        """Apply changes other processes made to the same scores, returns those applied"""
+        return []
+
+    def append(self, changes: Iterable[Change]):
+        """Apply changes in memory and persist them"""
+        changes = list(changes)
+        self.apply(changes)
+        self.write(changes)
+
+    def apply(self, changes: Iterable[Change]):
+        """Apply changes to the in-memory scores only"""
+        with self._scores_lock:
+            for style, start_number, key, value in changes:
+                self._apply(style, start_number, key, value)
+
+    def _apply(self, style: str, start_number: str, key: str, value):
+        participant_scores = self.scores.setdefault(style, {}).setdefault(start_number, {})
+        if value is None:
+            participant_scores.pop(key, None)
+        else:
+            participant_scores[key] = value
+        self.aggregates.invalidate(style, start_number)
+
+    def style_scores(self, style: str) -> Dict[str, Dict]:
+        return self.scores.setdefault(style, {})
+
+    def participant_scores(self, style: str, start_number) -> Dict:
+        return self.scores.get(style, {}).get(str(start_number), {})
+
+    def copy_participant_scores(self, style: str, start_number) -> Dict:
+        """participant_scores safe to read while another thread applies changes"""
+        with self._scores_lock:
+            return dict(self.participant_scores(style, start_number))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Copy of all scores that later changes do not affect.
+
+        Jury entries are replaced rather than modified by ``apply``, so they
+        are shared with the live scores.
+        """
+        with self._scores_lock:
+            return self._copy_scores()
+
+    def snapshot_cache(self) -> Tuple[Dict[str, Dict], AggregateCache]:
+        """A snapshot with a frozen aggregate cache over it, hand the cache to ``aggregates.adopt`` when done"""
+        with self._scores_lock:
+            scores = self._copy_scores()
+            cache = self.aggregates.freeze(
+                lambda style, start_number: scores.get(style, {}).get(str(start_number), {}))
+        return scores, cache
+
+    def _copy_scores(self) -> Dict[str, Dict]:
+        return {style: {start_number: dict(participant_scores)
+                        for start_number, participant_scores in style_scores.items()}
+                for style, style_scores in self.scores.items()}
+
+    def set_rules(self, rules: CompiledRules):
+        """Rank with another rule set from now on"""
+        self.aggregates.set_rules(rules)
+
+    def register_participants(self, participants):
+        """Tell the store which (style, category, age_group) group each start number is in"""
+        self.groups.clear()
+        for participant in participants:
+            key = (participant.style.value, participant.category.value, participant.age_group.value)
+            self.groups[key].append(str(participant.start_number))
+
+    def group_ranking(self, style: str, category: str, age_group: str) -> List[Tuple[str, RankingKey]]:
+        """(start_number, ranking key) of every finished participant in a group.
+
+        Best key first, equal keys by start number, the order of the ranking engine.
+        """
+        results = []
+        for start_number in self.groups.get((style, category, age_group), []):
+            ranking = self.aggregates.ranking_key(style, start_number)
+            if ranking is not None:
+                results.append((start_number, ranking))
+        results.sort(key=lambda r: (*(-value for value in r[1]), int(r[0])))
+        return results
+
+    @staticmethod
+    def diff(style: str, start_number: str, old: Dict, new: Dict) -> List[Change]:
+        """Changes needed to turn one participant's score dict into another"""
+        changes = [(style, start_number, key, value)
+                   for key, value in new.items() if old.get(key) != value]
+        changes.extend((style, start_number, key, None)
+                       for key in old if key not in new)
+        return changes
+
+
+def open_score_store(data_dir: str = 'data', backend: Optional[str] = None) -> ScoreStore:
+    """Open and load the configured score store.
+
+    The backend is 'json' (scores.json plus journal, the default), 'sqlite'
+    (scores.db) or 'remote' (a scoring server at SCORE_SERVER, with the token
+    in SCORE_SERVER_TOKEN), chosen by the SCORE_STORE environment variable.
+    The first time the SQLite store is opened it imports the existing
+    scores.json.
+    """
+    backend = backend or os.environ.get('SCORE_STORE', 'json')
+    json_path = os.path.join(data_dir, 'scores.json')
+
+    if backend == 'sqlite':
+        from .sqlite_store import SqliteScoreStore, import_scores_json
+        db_path = os.path.join(data_dir, 'scores.db')
+        if not os.path.exists(db_path) and os.path.exists(json_path):
+            import_scores_json(json_path, db_path)
+        store = SqliteScoreStore(db_path)
+    elif backend == 'json':
+        from .score_journal import ScoreJournal
+        from .ranking_rules import get_total_rule
+        store = ScoreJournal(json_path, fsync=True,
+                             total_rule=get_total_rule(os.path.join(data_dir, 'jury_config.json')))
+    elif backend == 'remote':
+        from .remote_store import RemoteScoreStore, DEFAULT_URL
+        store = RemoteScoreStore(os.environ.get('SCORE_SERVER', DEFAULT_URL),
+                                 token=os.environ.get('SCORE_SERVER_TOKEN'))
+    else:
+        raise ValueError(f"Unknown score store: {backend}")
+
+    store.load()
+    return store
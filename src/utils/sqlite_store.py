@@ -0,0 +1,216 @@
+import sqlite3
+import struct
+import sys
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
+from .ranking_engine import RankingKey
+from .ranking_rules import CompiledRules
+from .score_store import Change, ScoreStore
+from .score_journal import read_journaled_scores
+
+CRITERIA = ('technique', 'choreography', 'performance', 'expression', 'total')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS participants (
+    style TEXT NOT NULL,
+    start_number TEXT NOT NULL,
+    category TEXT NOT NULL,
+    age_group TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (style, start_number)
+);
+CREATE INDEX IF NOT EXISTS idx_participants_group
+    ON participants (style, category, age_group);
+
+CREATE TABLE IF NOT EXISTS jury_scores (
+    style TEXT NOT NULL,
+    start_number TEXT NOT NULL,
+    jury_id TEXT NOT NULL,
+    technique INTEGER NOT NULL,
+    choreography INTEGER NOT NULL,
+    performance INTEGER NOT NULL,
+    expression INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (style, start_number, jury_id)
+);
+CREATE INDEX IF NOT EXISTS idx_jury_scores_jury ON jury_scores (jury_id);
+
+CREATE TABLE IF NOT EXISTS final_totals (
+    style TEXT NOT NULL,
+    start_number TEXT NOT NULL,
+    final_total REAL NOT NULL,
+    PRIMARY KEY (style, start_number)
+);
+
+-- Ranking keys of finished participants under the current rules, derived
+-- from the scores by each connection
+CREATE TEMP TABLE IF NOT EXISTS ranking_keys (
+    style TEXT NOT NULL,
+    start_number TEXT NOT NULL,
+    ranking_key BLOB NOT NULL,
+    PRIMARY KEY (style, start_number)
+);
+"""
+
+def pack_ranking_key(ranking_key: RankingKey) -> bytes:
+    """Fixed-width big-endian parts, so the bytes sort like the key tuple"""
+    return struct.pack(f'>{len(ranking_key)}Q', *ranking_key)
+
+def unpack_ranking_key(data: bytes) -> RankingKey:
+    return struct.unpack(f'>{len(data) // 8}Q', data)
+
+
+class SqliteScoreStore(ScoreStore):
+    """Score store in an embedded SQLite database.
+
+    Every change is a single-row upsert or delete, and group rankings are
+    answered from the (style, category, age_group) index joined with the
+    ranking keys, so neither depends on the size of the event.
+    """
+
+    def __init__(self, db_path: str = 'data/scores.db'):
+        super().__init__()
+        self.db_path = db_path
+        # Writes may come from the background saver thread
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        with self._db_lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+        self._ranking_keys_stale = True  # Rebuilt by the first group query
+
+    def load(self) -> Dict[str, Dict]:
+        with self._db_lock:
+            jury_rows = self.conn.execute(
+                f"SELECT style, start_number, jury_id, {', '.join(CRITERIA)} FROM jury_scores"
+            ).fetchall()
+            final_rows = self.conn.execute(
+                "SELECT style, start_number, final_total FROM final_totals"
+            ).fetchall()
+
+        self.scores = {}
+        for style, start_number, jury_id, *values in jury_rows:
+            participant_scores = self.scores.setdefault(style, {}).setdefault(start_number, {})
+            participant_scores[jury_id] = dict(zip(CRITERIA, values))
+        for style, start_number, final_total in final_rows:
+            self.scores.setdefault(style, {}).setdefault(start_number, {})['final_total'] = final_total
+        self.aggregates.clear()
+        self._ranking_keys_stale = True
+        return self.scores
+
+    def apply(self, changes: Iterable[Change]):
+        changes = list(changes)
+        super().apply(changes)
+        if not self._ranking_keys_stale:
+            with self._db_lock:
+                self._update_ranking_keys({(style, start_number) for style, start_number, _, _ in changes})
+
+    def set_rules(self, rules: CompiledRules):
+        if rules is not self.aggregates.rules:
+            super().set_rules(rules)
+            self._ranking_keys_stale = True
+
+    def write(self, changes: Iterable[Change]):
+        with self._db_lock, self.conn:
+            for style, start_number, key, value in changes:
+                if key == 'final_total':
+                    if value is None:
+                        self.conn.execute(
+                            "DELETE FROM final_totals WHERE style = ? AND start_number = ?",
+                            (style, start_number))
+                    else:
+                        self.conn.execute(
+                            "INSERT OR REPLACE INTO final_totals VALUES (?, ?, ?)",
+                            (style, start_number, float(value)))
+                elif value is None:
+                    self.conn.execute(
+                        "DELETE FROM jury_scores WHERE style = ? AND start_number = ? AND jury_id = ?",
+                        (style, start_number, key))
+                else:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO jury_scores VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (style, start_number, key, *(value[c] for c in CRITERIA)))
+
+    def close(self):
+        with self._db_lock:
+            self.conn.close()
+
+    def register_participants(self, participants):
+        participants = list(participants)
+        super().register_participants(participants)
+        with self._db_lock, self.conn:
+            self.conn.execute("DELETE FROM participants")
+            self.conn.executemany(
+                "INSERT INTO participants VALUES (?, ?, ?, ?, ?)",
+                [(p.style.value, str(p.start_number), p.category.value, p.age_group.value, p.name)
+                 for p in participants])
+
+    def group_ranking(self, style: str, category: str, age_group: str) -> List[Tuple[str, RankingKey]]:
+        if self._ranking_keys_stale:
+            self._rebuild_ranking_keys()
+        with self._db_lock:
+            rows = self.conn.execute(
+                """SELECT p.start_number, k.ranking_key
+                   FROM participants p
+                   JOIN ranking_keys k ON k.style = p.style AND k.start_number = p.start_number
+                   WHERE p.style = ? AND p.category = ? AND p.age_group = ?
+                   ORDER BY k.ranking_key DESC, CAST(p.start_number AS INTEGER)""",
+                (style, category, age_group)).fetchall()
+        return [(start_number, unpack_ranking_key(ranking_key)) for start_number, ranking_key in rows]
+
+    def _rebuild_ranking_keys(self):
+        with self._db_lock:
+            # Marked fresh first, changes applied meanwhile update their rows once this is done
+            self._ranking_keys_stale = False
+            with self._scores_lock:
+                participants = {(style, start_number) for style, style_scores in self.scores.items()
+                                for start_number in style_scores}
+            with self.conn:
+                self.conn.execute("DELETE FROM ranking_keys")
+            self._update_ranking_keys(participants)
+
+    def _update_ranking_keys(self, participants: Set[Tuple[str, str]]):
+        """Recompute the ranking key rows of (style, start_number) participants, under the db lock"""
+        rows, removed = [], []
+        for style, start_number in participants:
+            ranking = self.aggregates.ranking_key(style, start_number)
+            if ranking is None:
+                removed.append((style, start_number))
+            else:
+                rows.append((style, start_number, pack_ranking_key(ranking)))
+        with self.conn:
+            self.conn.executemany("DELETE FROM ranking_keys WHERE style = ? AND start_number = ?", removed)
+            self.conn.executemany("INSERT OR REPLACE INTO ranking_keys VALUES (?, ?, ?)", rows)
+
+    def jury_scores(self, jury_id) -> List[Tuple[str, str, Dict]]:
+        """(style, start_number, scores) of every entry by one jury member"""
+        with self._db_lock:
+            rows = self.conn.execute(
+                f"SELECT style, start_number, {', '.join(CRITERIA)} FROM jury_scores WHERE jury_id = ?",
+                (str(jury_id),)).fetchall()
+        return [(style, start_number, dict(zip(CRITERIA, values)))
+                for style, start_number, *values in rows]
+
+
+def import_scores_json(json_path: str, db_path: str) -> int:
+    """Copy scores.json (and its journal) into a SQLite store, returns the number of records.
+
+    The source files are only read, they stay as they were.
+    """
+    scores = read_journaled_scores(json_path)
+
+    changes = [(style, start_number, key, value)
+               for style, participants in scores.items()
+               for start_number, participant_scores in participants.items()
+               for key, value in participant_scores.items()]
+    store = SqliteScoreStore(db_path)
+    store.write(changes)
+    store.close()
+    return len(changes)
+
+
+if __name__ == '__main__':
+    # python -m src.utils.sqlite_store data/scores.json data/scores.db
+    count = import_scores_json(*sys.argv[1:3])
+    print(f"Imported {count} score records")
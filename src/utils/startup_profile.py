@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+class StartupProfiler:
+    """Wall-clock breakdown of application startup, reported once the window is up.
+
+    Enabled by the ``--profile-startup`` argument or the PROFILE_STARTUP
+    environment variable. Phases cost nothing when it is disabled.
+    Counters are read when they are reported, again at exit.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.enabled = False
+        self.phases: List[Tuple[str, float]] = []
+        self.counters: List[Tuple[str, Callable[[], Dict[str, int]]]] = []
+
+    def enable_from(self, argv: List[str]) -> List[str]:
+        """Switch on from the command line or environment, returns argv without the flag"""
+        self.enabled = '--profile-startup' in argv or os.environ.get('PROFILE_STARTUP', '') not in ('', '0')
+        return [arg for arg in argv if arg != '--profile-startup']
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def counter(self, name: str, read: Callable[[], Dict[str, int]]):
+        if self.enabled:
+            self.counters.append((name, read))
+
+    def report(self, file=None):
+        if not self.enabled:
+            return
+        file = file or sys.stderr
+        total = time.perf_counter() - self.started
+        print("Startup profile:", file=file)
+        for name, seconds in self.phases:
+            print(f"  {name:<24} {seconds * 1000:8.1f} ms", file=file)
+        print(f"  {'total to first paint':<24} {total * 1000:8.1f} ms", file=file)
+        self.report_counters(file)
+
+    def report_counters(self, file=None):
+        if not self.enabled:
+            return
+        file = file or sys.stderr
+        for name, read in self.counters:
+            values = ", ".join(f"{key} {value}" for key, value in read().items())
+            print(f"  {name:<24} {values}", file=file)
+
+profiler = StartupProfiler()
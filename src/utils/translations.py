@@ -21,7 +21,13 @@ TRANSLATIONS = {
         'error': 'Error',
         'invalid_input': 'Invalid Input',
         'score_range_error': 'Score must be between 0 and {max}',
-        'number_error': 'Score must be a whole number'
+        'number_error': 'Score must be a whole number',
+        'daily_top3': 'Daily Top 3',
+        'highest_score': 'Highest score',
+        'highest_jury_total': 'Highest jury total',
+        'search_placeholder': 'Start number or name',
+        'all_categories': 'All categories',
+        'all_age_groups': 'All age groups'
     },
     'dutch': {
         'previous': 'Vorige',
@@ -45,6 +51,12 @@ TRANSLATIONS = {
         'error': 'Fout',
         'invalid_input': 'Ongeldige Invoer',
         'score_range_error': 'Score moet tussen 0 en {max} zijn',
-        'number_error': 'Score moet een geheel getal zijn'
+        'number_error': 'Score moet een geheel getal zijn',
+        'daily_top3': 'Dagelijkse Top 3',
+        'highest_score': 'Hoogste score',
+        'highest_jury_total': 'Hoogste jurytotaal',
+        'search_placeholder': 'Startnummer of naam',
+        'all_categories': 'Alle categorieën',
+        'all_age_groups': 'Alle leeftijdsgroepen'
     }
 } 
\ No newline at end of file
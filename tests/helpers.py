@@ -0,0 +1,4 @@
+def jury_score(technique, choreography=25, performance=25, expression=8):
+    """One jury member's entry in the scores.json layout"""
+    return {'technique': technique, 'choreography': choreography, 'performance': performance,
+            'expression': expression, 'total': technique + choreography + performance + expression}
@@ -0,0 +1,61 @@
+from src.utils.fixed_point import SCALE
+from src.utils.ranking_rules import RankingRules
+from src.utils.score_journal import ScoreJournal
+from .helpers import jury_score
+
+def make_store(tmp_path):
+    store = ScoreJournal(str(tmp_path / 'scores.json'))
+    store.load()
+    store.append([('modern', '1', '1', jury_score(20, 20, 20, 5)),
+                  ('modern', '1', 'final_total', 65.0),
+                  ('modern', '2', '1', jury_score(25, 25, 25, 8))])
+    return store
+
+def test_hits_until_the_participant_changes(tmp_path):
+    store = make_store(tmp_path)
+    cache = store.aggregates
+
+    assert cache.ranking_key('modern', 1) == (65 * SCALE, 20 * SCALE, 20 * SCALE, 20 * SCALE)
+    assert cache.ranking_key('modern', '1') is not None
+    assert cache.ranking_key('modern', 2) is None  # Not finished
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # Only participant 2 is recomputed
+    store.append([('modern', '2', 'final_total', 83.0)])
+    assert cache.ranking_key('modern', 2)[0] == 83 * SCALE
+    assert cache.ranking_key('modern', 1)[0] == 65 * SCALE
+    assert (cache.hits, cache.misses) == (2, 3)
+    assert cache.get('modern', 2).criterion_sums == (25, 25, 25, 8)
+
+def test_jury_count_and_rule_switches(tmp_path):
+    store = make_store(tmp_path)
+    cache = store.aggregates
+    assert cache.ranking_key('modern', 2, jury_count=1)[0] == 83 * SCALE
+    assert cache.ranking_key('modern', 2, jury_count=2) is None
+
+    cache.set_rules(RankingRules(weights=(2, 1, 1, 1)).compile())
+    assert len(cache) == 0
+    assert cache.ranking_key('modern', 2, jury_count=1)[0] == 108 * SCALE
+
+def test_reload_clears_the_cache(tmp_path):
+    store = make_store(tmp_path)
+    store.aggregates.get('modern', 1)
+    store.load()
+    assert len(store.aggregates) == 0
+
+def test_frozen_copy_hands_back_only_unchanged_participants(tmp_path):
+    store = make_store(tmp_path)
+    store.append([('modern', '3', '1', jury_score(10, 10, 10, 2))])
+    store.aggregates.get('modern', 1)
+
+    scores, frozen = store.snapshot_cache()
+    assert frozen.ranking_key('modern', 1)[0] == 65 * SCALE  # Known before the copy
+    frozen.get('modern', 2)
+    frozen.get('modern', 3)
+    assert (frozen.hits, frozen.misses) == (1, 2)
+
+    store.append([('modern', '2', 'final_total', 83.0)])
+    store.aggregates.adopt(frozen)
+    assert len(store.aggregates) == 2  # 1 and 3, 2 changed after the copy
+    assert store.aggregates.ranking_key('modern', 2)[0] == 83 * SCALE
+    assert (store.aggregates.hits, store.aggregates.misses) == (1, 4)
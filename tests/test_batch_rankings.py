@@ -0,0 +1,64 @@
+import random
+import pytest
+from src.models.participant import Participant
+from src.utils.batch_rankings import iter_score_rows
+from src.utils.calculations import rank_scores
+from src.utils.ranking_engine import shared_rank
+from src.utils.ranking_rules import RankingRules
+
+def make_event(seed=7, jury_count=3):
+    rng = random.Random(seed)
+    participants = {}
+    all_scores = {'modern': {}, 'urban': {}}
+    for start_number in range(1, 201):
+        style = rng.choice(['modern', 'urban'])
+        line = f"{style},{rng.choice(['solo', 'duo', 'teams'])},{rng.choice(['mini', 'kids'])},{start_number},P{start_number}"
+        participants[start_number] = Participant.from_csv_line(line)
+        scored = {}
+        for jury_id in range(1, rng.randint(1, jury_count) + 1):
+            values = [rng.randint(20, 22), rng.randint(20, 22), rng.randint(20, 22), rng.randint(7, 8)]
+            scored[str(jury_id)] = dict(zip(['technique', 'choreography', 'performance', 'expression'], values),
+                                        total=sum(values))
+        all_scores[style][str(start_number)] = scored
+    return all_scores, participants
+
+def test_iter_score_rows_skips_final_total():
+    all_scores = {'modern': {'4': {'1': {'technique': 1, 'choreography': 2, 'performance': 3,
+                                         'expression': 4, 'total': 10}, 'final_total': 10.0}}}
+    assert list(iter_score_rows(all_scores)) == [('modern', 4, '1', 1, 2, 3, 4, 10)]
+
+def test_batch_path_matches_per_object_path():
+    pytest.importorskip('pandas')
+    from src.utils.batch_rankings import rank_scores_batch
+
+    all_scores, participants = make_event()
+    expected = rank_scores(all_scores, participants, jury_count=3)
+    assert expected
+    assert rank_scores_batch(all_scores, participants, jury_count=3) == expected
+
+def test_batch_ranks_share_truly_equal_entries():
+    pytest.importorskip('pandas')
+    from src.utils.batch_rankings import participants_frame, rank_frame, scores_frame
+
+    all_scores, participants = make_event(seed=3, jury_count=1)
+    results = rank_frame(scores_frame(all_scores), participants_frame(participants.values()), 1)
+    for key, entries in rank_scores(all_scores, participants, jury_count=1).items():
+        group = results[(results['style'] == key[0]) & (results['category'] == key[1])
+                        & (results['age_group'] == key[2])]
+        assert list(group['rank']) == [shared_rank(entries, i) for i in range(len(entries))]
+    assert results['rank'].duplicated().any()
+
+@pytest.mark.parametrize('rules', [
+    RankingRules(aggregation='trimmed_mean'),
+    RankingRules(aggregation='median'),
+    RankingRules(weights=(2, 1, 1, 3), tie_break=('expression', 'technique')),
+])
+def test_batch_path_matches_per_object_path_for_rule_sets(rules):
+    pytest.importorskip('pandas')
+    from src.utils.batch_rankings import rank_scores_batch
+
+    compiled = rules.compile()
+    all_scores, participants = make_event(seed=11, jury_count=4)
+    expected = rank_scores(all_scores, participants, 4, compiled)
+    assert expected
+    assert rank_scores_batch(all_scores, participants, 4, compiled) == expected
@@ -0,0 +1,46 @@
+import pytest
+from src.models.jury import JuryMember
+from src.models.participant import Participant
+from src.utils.ranking_rules import DEFAULT_RULES
+
+PARTICIPANTS = [Participant.from_csv_line(f'modern,solo,mini,{n},P{n}') for n in (1, 2)]
+JURY = [JuryMember(1, 'Jury 1', 'modern'), JuryMember(2, 'Jury 2', 'modern')]
+STYLE_SCORES = {'1': {'1': {'technique': 20, 'choreography': 20, 'performance': 20,
+                            'expression': 5, 'total': 65}}}
+
+def test_grid_validates_and_produces_changes_for_edited_participants_only():
+    pytest.importorskip('PySide6')
+    from src.gui.bulk_entry import BulkEntryModel
+
+    model = BulkEntryModel(PARTICIPANTS, JURY, STYLE_SCORES, DEFAULT_RULES)
+    assert model.rowCount() == 4
+    assert model.data(model.index(0, 3)) == 20 and model.data(model.index(0, 7)) == 65
+
+    # Participant 1, jury 2: above the expression maximum is refused
+    assert not model.setData(model.index(1, 6), 11)
+    for column, value in zip(range(3, 7), [25, 25, 25, 9]):
+        assert model.setData(model.index(1, column), value)
+    # Participant 2 left incomplete
+    assert model.setData(model.index(2, 3), 10)
+    assert model.incomplete_rows() == 1
+
+    changes = model.changes('modern', STYLE_SCORES)
+    assert ('modern', '1', '2', {'technique': 25, 'choreography': 25, 'performance': 25,
+                                 'expression': 9, 'total': 84}) in changes
+    assert ('modern', '1', 'final_total', 74.5) in changes
+    assert {change[1] for change in changes} == {'1'}
+
+def test_incomplete_edit_keeps_the_stored_jury_score():
+    pytest.importorskip('PySide6')
+    from src.gui.bulk_entry import BulkEntryModel
+
+    model = BulkEntryModel(PARTICIPANTS, JURY, STYLE_SCORES, DEFAULT_RULES)
+    assert model.setData(model.index(0, 3), 0)
+    assert model.incomplete_edited_rows() == 1
+    assert model.changes('modern', STYLE_SCORES) == []
+
+    # Cleared completely, the jury score goes
+    for column in range(3, 7):
+        model.setData(model.index(0, column), 0)
+    assert model.incomplete_edited_rows() == 0
+    assert model.changes('modern', STYLE_SCORES) == [('modern', '1', '1', None)]
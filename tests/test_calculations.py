@@ -1,6 +1,10 @@
 import pytest
-from src.utils.calculations import calculate_average_score, resolve_ex_aequo
+from src.utils.calculations import (calculate_average_score, ex_aequo_key, resolve_ex_aequo, final_total,
+                                    rank_scores, ranking_key)
+from src.models.participant import Participant
 from src.models.score import Score
+from src.utils.fixed_point import SCALE
+from .helpers import jury_score
 
 def test_calculate_average_score():
     scores = [
@@ -25,4 +29,73 @@ def test_resolve_ex_aequo():
     ]
     
     # scores1 should win due to higher technique score
-    assert resolve_ex_aequo(scores1, scores2) == 1 
\ No newline at end of file
+    assert resolve_ex_aequo(scores1, scores2) == 1 
+
+def test_ex_aequo_key_follows_the_rules():
+    from src.utils.ranking_rules import RankingRules
+    scores = [Score(participant_id=1, jury_member=j, technique=t, choreography=20, performance=20, expression=5)
+              for j, t in enumerate([10, 20, 30], 1)]
+    assert ex_aequo_key(scores) == (65 * SCALE, 20 * SCALE, 20 * SCALE, 20 * SCALE)
+
+    median = RankingRules(aggregation='median', weights=(2, 1, 1, 1), tie_break=('choreography',)).compile()
+    assert ex_aequo_key(scores, median) == (85 * SCALE, 20 * SCALE)
+
+def test_final_total_needs_every_jury_member():
+    scores = {'1': jury_score(25, 25, 25, 8), '2': jury_score(28, 27, 26, 9)}
+    assert final_total(scores, 2) == (83 + 90) / 2
+    assert final_total(dict(scores, final_total=86.5), 2) == 86.5
+    assert final_total(scores, 3) is None
+
+def test_rank_scores_groups_and_sorts():
+    participants = {p.start_number: p for p in [
+        Participant.from_csv_line('modern,solo,mini,1,Emma Smith'),
+        Participant.from_csv_line('modern,solo,mini,2,Liam Johnson'),
+        Participant.from_csv_line('modern,duo,kids,3,Sophie Turner'),
+    ]}
+    all_scores = {'modern': {
+        '1': {'1': jury_score(20, 20, 20, 5)},
+        '2': {'1': jury_score(25, 25, 25, 8)},
+        '3': {},
+        'notes': {},
+    }}
+
+    rankings = rank_scores(all_scores, participants, jury_count=1)
+    assert list(rankings) == [('modern', 'solo', 'mini')]
+    assert [(e.start_number, e.score) for e in rankings[('modern', 'solo', 'mini')]] == [(2, 83.0), (1, 65.0)]
+
+def test_ranking_key_applies_ex_aequo_order():
+    winner = {'1': jury_score(28, 20, 25, 8), 'final_total': 81.0}
+    runner_up = {'1': jury_score(27, 21, 25, 8), 'final_total': 81.0}
+    assert ranking_key(winner) == (81 * SCALE, 28 * SCALE, 25 * SCALE, 20 * SCALE)
+    assert ranking_key(winner) > ranking_key(runner_up)
+
+    # Not finished yet
+    assert ranking_key({'1': jury_score(28, 20, 25, 8)}) is None
+    assert ranking_key({'1': jury_score(28, 20, 25, 8)}, jury_count=2) is None
+
+def test_ranking_key_ties_are_exact_across_jury_sizes():
+    # 211/3 has no exact float, equal means must still compare equal
+    three = {'1': jury_score(22, 20, 20, 8), '2': jury_score(22, 20, 20, 8), '3': jury_score(22, 21, 20, 8),
+             'final_total': 70.33}
+    six = dict(three, **{'4': jury_score(22, 20, 20, 8), '5': jury_score(22, 20, 20, 8),
+                         '6': jury_score(22, 21, 20, 8)})
+    assert ranking_key(three) == ranking_key(six)
+    assert all(isinstance(part, int) for part in ranking_key(three))
+    assert final_total(three, 3) == 70.33
+
+def test_fixed_point_rejects_unsupported_jury_sizes():
+    from src.utils.fixed_point import MAX_JURY_SIZE, scaled_mean
+    assert scaled_mean(7, 7) == SCALE
+    with pytest.raises(ValueError):
+        scaled_mean(10, MAX_JURY_SIZE + 1)
+
+def test_rank_scores_reads_through_an_aggregate_cache():
+    from src.utils.aggregate_cache import AggregateCache
+    participants = {1: Participant.from_csv_line('modern,solo,mini,1,Emma Smith')}
+    all_scores = {'modern': {'1': {'1': jury_score(20, 20, 20, 5)}}}
+    cache = AggregateCache(lambda style, start_number: all_scores[style][start_number])
+
+    expected = rank_scores(all_scores, participants, jury_count=1)
+    assert rank_scores(all_scores, participants, 1, cache=cache) == expected
+    assert rank_scores(all_scores, participants, 1, cache=cache) == expected
+    assert (cache.hits, cache.misses) == (1, 1)
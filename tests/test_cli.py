@@ -0,0 +1,81 @@
+import csv
+import json
+import subprocess
+import sys
+from src.cli import main, run
+
+SCORES = {'technique': 25, 'choreography': 24, 'performance': 26, 'expression': 8, 'total': 83}
+
+def make_competition(path, final_total=83.0):
+    path.mkdir()
+    (path / 'participants.csv').write_text("modern,solo,kids,1,Ann\nmodern,solo,kids,2,Bob\n"
+                                           "urban,duo,teens,3,Cas\n")
+    (path / 'jury_config.json').write_text(json.dumps({'jury_members': [{'id': 1}, {'id': 2}]}))
+    better = dict(SCORES, technique=27, total=85)
+    (path / 'scores.json').write_text(json.dumps({
+        'modern': {'1': {'1': SCORES, '2': SCORES, 'final_total': final_total},
+                   '2': {'1': better, '2': better, 'final_total': 85.0},
+                   '9': {'1': SCORES}},
+        'urban': {'3': {'1': SCORES}},
+    }))
+    # The last jury score written after the last compaction
+    (path / 'scores.journal').write_text(json.dumps({'s': 'urban', 'p': '3', 'k': '2', 'v': SCORES}) + '\n'
+                                         + json.dumps({'s': 'urban', 'p': '3', 'k': 'final_total', 'v': 83.0}) + '\n')
+    return path
+
+def test_competitions_are_ranked_in_worker_processes(tmp_path):
+    competitions = [str(make_competition(tmp_path / name)) for name in ('spring', 'autumn')]
+    summaries = run(competitions, str(tmp_path), jobs=2)
+    assert [summary.name for summary in summaries] == ['spring', 'autumn']
+    assert all(summary.ok for summary in summaries)
+    assert summaries[0].ranked == 3 and summaries[0].unknown == ['modern/9']
+
+    with open(tmp_path / 'autumn-results.csv', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['style', 'category', 'age_group', 'rank', 'start_number', 'name', 'final_total']
+    assert rows[1:] == [['modern', 'solo', 'kids', '1', '2', 'Bob', '85.0'],
+                        ['modern', 'solo', 'kids', '2', '1', 'Ann', '83.0'],
+                        ['urban', 'duo', 'teens', '1', '3', 'Cas', '83.0']]
+
+    assert main([competitions[0], '-o', str(tmp_path / 'out'), '-r', 'podiums', '-r', 'jury_sheets',
+                 '-f', 'jsonl', '-f', 'html']) == 0
+    assert sorted(path.name for path in (tmp_path / 'out').iterdir()) == [
+        'spring-jury_sheets.html', 'spring-jury_sheets.jsonl', 'spring-podiums.html', 'spring-podiums.jsonl']
+
+def test_check_reports_stored_totals_that_disagree(tmp_path):
+    good = str(make_competition(tmp_path / 'good'))
+    bad = str(make_competition(tmp_path / 'bad', final_total=80.0))
+    assert main([good, '--check']) == 0
+    assert main([good, bad, '--check', '-j', '1']) == 1
+    assert run([bad])[0].mismatched == [('modern', '1', 80.0, 83.0)]
+    assert main([str(tmp_path / 'missing')]) == 1
+
+def test_check_accepts_unrounded_totals_of_older_versions(tmp_path):
+    path = make_competition(tmp_path / 'legacy')
+    (path / 'jury_config.json').write_text(json.dumps({'jury_members': [{'id': 1}, {'id': 2}, {'id': 3}]}))
+    scores = json.loads((path / 'scores.json').read_text())
+    participant_scores = scores['modern']['1']
+    participant_scores['3'] = dict(SCORES, technique=26, total=84)
+
+    for final_total, flagged in (((83 + 83 + 84) / 3, False), (83.33, False), (83.3, True)):
+        participant_scores['final_total'] = final_total
+        (path / 'scores.json').write_text(json.dumps(scores))
+        mismatched = {m[:2] for m in run([str(path)])[0].mismatched}
+        assert (('modern', '1') in mismatched) == flagged
+
+def test_cli_does_not_import_qt(tmp_path):
+    competition = make_competition(tmp_path / 'event')
+    code = ("import sys; from src.cli import main; main([sys.argv[1]]); "
+            "assert not any(name.startswith('PySide6') for name in sys.modules)")
+    subprocess.run([sys.executable, '-c', code, str(competition)], check=True, capture_output=True)
+
+def test_journal_without_snapshot_and_broken_competitions(tmp_path):
+    fresh = make_competition(tmp_path / 'fresh')
+    (fresh / 'scores.json').unlink()
+    summary = run([str(fresh)])[0]
+    assert summary.error is None and summary.incomplete == 1
+
+    broken = make_competition(tmp_path / 'broken')
+    (broken / 'scores.json').write_text('[]')
+    summaries = run([str(broken), str(fresh)], jobs=2)
+    assert summaries[0].error.startswith('AttributeError') and summaries[1].error is None
@@ -0,0 +1,51 @@
+from src.models.participant import Participant
+from src.utils.leaderboard import Leaderboard, TopK
+
+EMMA = Participant.from_csv_line('modern,solo,mini,1,Emma Smith')
+LIAM = Participant.from_csv_line('modern,solo,mini,2,Liam Johnson')
+SOPHIE = Participant.from_csv_line('modern,duo,kids,3,Sophie Turner')
+
+def test_top_k_skips_replaced_and_removed_keys():
+    top = TopK()
+    for item, value in [('a', 5), ('b', 9), ('c', 7), ('b', 1), ('d', 8)]:
+        top.update(item, (value,))
+    top.update('d', None)
+
+    assert top.top(2) == [('c', (7,)), ('a', (5,))]
+    assert top.top(10) == [('c', (7,)), ('a', (5,)), ('b', (1,))]
+    assert len(top) == 3
+
+def test_top_k_returns_an_item_once_after_its_key_comes_back():
+    top = TopK()
+    top.update('a', (5,))
+    top.update('b', (4,))
+    top.update('a', (9,))
+    top.update('a', (5,))
+    assert top.top(3) == [('a', (5,)), ('b', (4,))]
+
+    board = Leaderboard()
+    for score in (70, 80, 70):
+        board.update('modern', EMMA, (score,))
+    assert [e.name for e in board.podium(('modern', 'solo', 'mini'))] == ['Emma Smith']
+
+def test_podium_and_daily_winner_follow_updates():
+    board = Leaderboard()
+    board.update('modern', EMMA, (70.0,))
+    board.update('modern', LIAM, (80.0,))
+    board.update('modern', SOPHIE, (75.0,))
+
+    assert [e.name for e in board.podium(('modern', 'solo', 'mini'))] == ['Liam Johnson', 'Emma Smith']
+    assert [e.name for e in board.style_top('modern')] == ['Liam Johnson', 'Sophie Turner', 'Emma Smith']
+
+    board.update('modern', LIAM, None)
+    assert board.daily_winner('modern').name == 'Sophie Turner'
+    assert board.daily_winner('urban') is None
+
+def test_highest_jury_score_drops_removed_jury_entries():
+    board = Leaderboard()
+    board.update_jury_scores('modern', EMMA, {'1': {'total': 90}, '2': {'total': 95}, 'final_total': 92.5})
+    board.update_jury_scores('modern', LIAM, {'1': {'total': 93}})
+    assert board.highest_jury_score() == (EMMA, '2', 95)
+
+    board.update_jury_scores('modern', EMMA, {'1': {'total': 90}})
+    assert board.highest_jury_score() == (LIAM, '1', 93)
@@ -0,0 +1,44 @@
+from src.models.category import AgeGroup, Category, Style
+from src.models.participant_repository import ParticipantRepository, get_participant_repository
+
+CSV = """modern,solo,mini,1,Emma Smith
+urban,duo,kids,51,Street Duo
+
+modern,solo,mini,2,Liam Johnson
+3,Bob Wilson,modern,team,adults
+"""
+
+def test_indexes(tmp_path):
+    path = tmp_path / 'participants.csv'
+    path.write_text(CSV)
+    repository = ParticipantRepository.from_csv(str(path))
+
+    # Blank and malformed lines are skipped
+    assert len(repository) == 3
+    assert repository.get('51').name == 'Street Duo'
+    assert repository.get(99) is None
+    assert [p.start_number for p in repository.for_style(Style.MODERN)] == [1, 2]
+    assert [p.start_number for p in repository.for_group(Style.URBAN, Category.DUO, AgeGroup.KIDS)] == [51]
+    assert repository.for_group(Style.URBAN, Category.SOLO, AgeGroup.KIDS) == []
+
+def test_indexes_are_rows_of_the_table(tmp_path):
+    path = tmp_path / 'participants.csv'
+    path.write_text("modern,solo,kids,7,Late\nmodern,duo,mini,4,Duo\nmodern,solo,mini,9,Solo\n")
+    repository = ParticipantRepository.from_csv(str(path))
+
+    # Running order, not file order: age group before category
+    modern = repository.for_style(Style.MODERN)
+    assert [p.start_number for p in modern] == [9, 4, 7]
+    assert list(modern.rows) == [2, 1, 0]
+    assert [p.start_number for p in modern[1:]] == [4, 7]
+    assert dict(repository.by_start_number)[4] == modern[1]
+    assert 9 in repository.by_start_number and 5 not in repository.by_start_number
+
+def test_shared_repository_is_loaded_once(tmp_path):
+    path = tmp_path / 'participants.csv'
+    path.write_text(CSV)
+
+    repository = get_participant_repository(str(path))
+    path.write_text('')
+    assert get_participant_repository(str(path)) is repository
+    assert len(repository) == 3
@@ -0,0 +1,38 @@
+from src.models.category import AgeGroup, Category
+from src.models.participant import Participant
+from src.utils.participant_search import ParticipantSearch
+
+PARTICIPANTS = [Participant.from_csv_line(line) for line in [
+    'modern,solo,mini,1,Emma Smith',
+    'modern,solo,kids,2,Liam Johnson',
+    'modern,duo,mini,3,Sophie Turner & Emma Jones',
+    'modern,teams,kids,850,Smithfield Dance',
+]]
+
+def test_start_number_jumps_directly():
+    search = ParticipantSearch(PARTICIPANTS)
+    assert search.search('850') == [3]
+    assert search.search(' 3 ') == [2]
+    assert search.search('851') == []
+    assert search.search('850', category=Category.SOLO) == []
+
+def test_short_queries_match_word_prefixes():
+    search = ParticipantSearch(PARTICIPANTS)
+    assert search.search('em') == [0, 2]
+    assert search.search('E') == [0, 2]
+    assert search.search('so') == [2]
+
+def test_longer_queries_match_anywhere_and_refine_while_typing():
+    search = ParticipantSearch(PARTICIPANTS)
+    assert search.search('mit') == [0, 3]
+    assert search.search('smith') == [0, 3]
+    assert search.search('smithf') == [3]
+    assert search.search('mith') == [0, 3]  # Not a continuation, searched again
+    assert search.search('emma  jo') == [2]
+
+def test_filters_and_limit():
+    search = ParticipantSearch(PARTICIPANTS)
+    assert search.search('', age_group=AgeGroup.MINI) == [0, 2]
+    assert search.search('', category=Category.SOLO, age_group=AgeGroup.KIDS) == [1]
+    assert search.search('smith', category=Category.TEAMS) == [3]
+    assert search.search('', limit=2) == [0, 1]
@@ -0,0 +1,45 @@
+from src.models.category import AgeGroup, Category, Style
+from src.models.participant import Participant
+from src.models.participant_table import ParticipantTable, iter_csv_rows
+
+CSV = """urban,solo,kids,51,Street Kid
+modern,teams,mini,7,Dance Crew
+modern,solo,kids,3,Noah Davis
+modern,solo,mini,9,Dance Crew
+1,John Doe,modern,solo,teens
+"""
+
+def write_csv(tmp_path):
+    path = tmp_path / 'participants.csv'
+    path.write_text(CSV)
+    return str(path)
+
+def test_streaming_rows_are_ordinals(tmp_path):
+    rows = list(iter_csv_rows(write_csv(tmp_path)))
+    assert len(rows) == 4
+    assert rows[0] == (1, 0, 1, 51, 'Street Kid')
+
+def test_rows_are_participant_views(tmp_path):
+    table = ParticipantTable.from_csv(write_csv(tmp_path))
+
+    assert len(table) == 4
+    assert table[1] == Participant(7, 'Dance Crew', Style.MODERN, Category.TEAMS, AgeGroup.MINI)
+    assert table.names[1] is table.names[3]
+    assert table[table.row_of(51)].name == 'Street Kid'
+    assert table.row_of(100) is None
+
+def test_sort_matches_participant_order(tmp_path):
+    path = write_csv(tmp_path)
+    table = ParticipantTable.from_csv(path)
+
+    expected = sorted(table, key=Participant.sort_key)
+    assert [table[row] for row in table.sorted_rows()] == expected
+    assert [p.start_number for p in expected] == [9, 7, 3, 51]
+
+def test_group_rows(tmp_path):
+    table = ParticipantTable.from_csv(write_csv(tmp_path))
+    groups = table.group_rows()
+    assert list(groups[(0, 0, 1)]) == [2]
+    assert len(groups) == 4
+    # Groups follow the order of the rows passed in
+    assert list(table.group_rows(reversed(range(4)))) == [(0, 0, 0), (0, 0, 1), (0, 2, 0), (1, 0, 1)]
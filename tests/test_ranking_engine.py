@@ -0,0 +1,56 @@
+from src.models.participant import Participant
+from src.utils.ranking_engine import RankingChange, RankingEngine, shared_rank
+
+EMMA = Participant.from_csv_line('modern,solo,mini,1,Emma Smith')
+LIAM = Participant.from_csv_line('modern,solo,mini,2,Liam Johnson')
+SOPHIE = Participant.from_csv_line('modern,solo,mini,3,Sophie Turner')
+GROUP = ('modern', 'solo', 'mini')
+
+def names(engine):
+    return [entry.name for entry in engine.groups[GROUP]]
+
+def test_rebuild_sorts_best_first():
+    engine = RankingEngine()
+    engine.rebuild([('modern', EMMA, (70.0,)), ('modern', LIAM, (80.0,)), ('modern', SOPHIE, (70.0,))])
+    assert names(engine) == ['Liam Johnson', 'Emma Smith', 'Sophie Turner']
+
+def test_update_moves_only_the_changed_participant():
+    engine = RankingEngine()
+    engine.rebuild([('modern', EMMA, (70.0,)), ('modern', LIAM, (80.0,))])
+
+    assert engine.update('modern', SOPHIE, (75.0,)) == RankingChange(GROUP, 3, None, 1)
+    assert engine.update('modern', EMMA, (90.0,)) == RankingChange(GROUP, 1, 2, 0)
+    assert names(engine) == ['Emma Smith', 'Liam Johnson', 'Sophie Turner']
+
+    # Same score again is not a change
+    assert engine.update('modern', EMMA, (90.0,)) is None
+
+def test_update_removes_unfinished_participant():
+    engine = RankingEngine()
+    engine.rebuild([('modern', EMMA, (70.0,)), ('modern', LIAM, (80.0,))])
+
+    assert engine.update('modern', LIAM, None) == RankingChange(GROUP, 2, 0, None)
+    assert engine.update('modern', LIAM, None) is None
+    assert names(engine) == ['Emma Smith']
+
+def test_ties_on_total_use_ex_aequo_averages():
+    engine = RankingEngine()
+    engine.rebuild([('modern', EMMA, (80.0, 25.0, 25.0, 22.0)),
+                    ('modern', LIAM, (80.0, 26.0, 24.0, 22.0)),
+                    ('modern', SOPHIE, (80.0, 25.0, 25.0, 22.0))])
+    entries = engine.groups[GROUP]
+
+    assert names(engine) == ['Liam Johnson', 'Emma Smith', 'Sophie Turner']
+    assert [shared_rank(entries, i) for i in range(3)] == [1, 2, 2]
+
+def test_replace_group_swaps_one_group_and_keeps_updating():
+    engine = RankingEngine()
+    engine.rebuild([('modern', EMMA, (70.0,)), ('modern', LIAM, (80.0,))])
+
+    previous = engine.replace_group(GROUP, [(SOPHIE, (90.0,)), (EMMA, (60.0,))])
+    assert [entry.name for entry in previous] == ['Liam Johnson', 'Emma Smith']
+    assert names(engine) == ['Sophie Turner', 'Emma Smith']
+
+    # Liam left with the replacement, updates find the new positions
+    assert engine.update('modern', LIAM, None) is None
+    assert engine.update('modern', EMMA, (95.0,)) == RankingChange(GROUP, 1, 1, 0)
@@ -0,0 +1,57 @@
+import json
+import pytest
+from src.utils.fixed_point import MAX_JURY_SIZE, SCALE
+from src.utils.ranking_rules import RankingRules, get_total_rule, load_jury_ids, load_ranking_rules
+from .helpers import jury_score
+
+# Jury totals 60, 70, 80 and 95
+SCORES = {'1': jury_score(20, 20, 15, 5), '2': jury_score(20, 20, 20, 10),
+          '3': jury_score(25, 25, 25, 5), '4': jury_score(30, 30, 25, 10)}
+
+def test_aggregations():
+    assert RankingRules().compile().ranking_key(SCORES, 4)[0] == 305 * SCALE // 4
+    assert RankingRules(aggregation='trimmed_mean').compile().ranking_key(SCORES, 4)[0] == 75 * SCALE
+    assert RankingRules(aggregation='median').compile().ranking_key(SCORES, 4)[0] == 75 * SCALE
+    assert RankingRules(aggregation='median').compile().final_total(SCORES, 4) == 75.0
+
+def test_trimmed_mean_keeps_small_juries_whole():
+    rules = RankingRules(aggregation='trimmed_mean').compile()
+    two = {'1': SCORES['1'], '2': SCORES['2']}
+    assert rules.ranking_key(two, 2)[0] == 65 * SCALE
+
+def test_weights_and_tie_break_order():
+    rules = RankingRules(weights=(2, 1, 1, 0), tie_break=('expression',)).compile()
+    key = rules.ranking_key({'1': jury_score(20, 20, 15, 5)}, 1)
+    assert key == ((40 + 20 + 15) * SCALE, 5 * SCALE)
+    assert rules.final_total({'1': jury_score(20, 20, 15, 5)}, 1) == 75.0
+
+def test_rules_from_jury_config(tmp_path):
+    config = tmp_path / 'jury_config.json'
+    config.write_text('{"jury_members": [], "ranking_rules": {"aggregation": "trimmed_mean", '
+                      '"maxima": {"expression": 20}, "weights": {"technique": 2}}}')
+    rules = load_ranking_rules(str(config))
+    assert rules.aggregation == 'trimmed_mean'
+    assert rules.weights == (2, 1, 1, 1)
+    assert rules.compile().maxima == {'technique': 30, 'choreography': 30, 'performance': 30, 'expression': 20}
+    assert load_ranking_rules(str(tmp_path / 'missing.json')) == RankingRules()
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError):
+        RankingRules(aggregation='mode')
+    with pytest.raises(ValueError):
+        RankingRules(tie_break=('style',))
+    with pytest.raises(ValueError):
+        RankingRules(weights=(1.5, 1, 1, 1))
+
+def test_juries_larger_than_the_fixed_point_scale_are_rejected(tmp_path):
+    config = tmp_path / 'jury_config.json'
+    config.write_text(json.dumps({'jury_members': [{'id': i} for i in range(1, MAX_JURY_SIZE + 2)]}))
+    with pytest.raises(ValueError, match=f"at most {MAX_JURY_SIZE}"):
+        load_jury_ids(str(config))
+    assert get_total_rule(str(config)) is None
+
+    # Stray entries beyond the largest jury leave the participant unranked instead of raising
+    scores = {str(i): jury_score(20, 20, 15, 5) for i in range(MAX_JURY_SIZE + 1)}
+    rules = RankingRules().compile()
+    assert rules.ranking_key(scores) is None
+    assert rules.final_total(scores, MAX_JURY_SIZE + 1) is None
@@ -0,0 +1,57 @@
+from src.models.participant import Participant
+from src.utils.fixed_point import SCALE
+from src.utils.ranking_snapshot import build_snapshot
+from src.utils.score_journal import ScoreJournal
+from .helpers import jury_score
+
+EMMA = Participant.from_csv_line('modern,solo,mini,1,Emma Smith')
+LIAM = Participant.from_csv_line('modern,solo,mini,2,Liam Johnson')
+PARTICIPANTS = {1: EMMA, 2: LIAM}
+
+def make_store(tmp_path):
+    store = ScoreJournal(str(tmp_path / 'scores.json'))
+    store.load()
+    store.append([('modern', '1', '1', jury_score(20, 20, 20, 5)), ('modern', '1', 'final_total', 65.0),
+                  ('modern', '2', '1', jury_score(25, 25, 25, 8)), ('modern', '2', 'final_total', 83.0),
+                  ('urban', '2', '1', jury_score(25, 25, 25, 9)), ('urban', '2', 'final_total', 84.0)])
+    return store
+
+def test_snapshot_ranks_finished_participants_of_their_own_style(tmp_path):
+    snapshot = build_snapshot(make_store(tmp_path), PARTICIPANTS, generation=3)
+    assert snapshot.generation == 3
+    assert [e.name for e in snapshot.engine.groups[('modern', 'solo', 'mini')]] == ['Liam Johnson', 'Emma Smith']
+    assert not snapshot.engine.groups.get(('urban', 'solo', 'mini'))
+    assert snapshot.leaderboard.daily_winner('modern').name == 'Liam Johnson'
+    assert snapshot.leaderboard.highest_jury_score() == (LIAM, '1', 83)
+
+def test_cancelled_build_returns_nothing(tmp_path):
+    assert build_snapshot(make_store(tmp_path), PARTICIPANTS, 1, cancelled=lambda: True) is None
+
+def test_snapshot_ranks_the_scores_it_copied(tmp_path):
+    store = make_store(tmp_path)
+    copy_scores = store.snapshot_cache
+
+    def snapshot_then_edit():
+        # An edit arriving right after the copy is not part of this snapshot
+        copied = copy_scores()
+        store.append([('modern', '1', '1', jury_score(30, 30, 30, 10)), ('modern', '1', 'final_total', 100.0)])
+        return copied
+    store.snapshot_cache = snapshot_then_edit
+
+    snapshot = build_snapshot(store, PARTICIPANTS, generation=1)
+    assert [e.score for e in snapshot.engine.groups[('modern', 'solo', 'mini')]] == [83.0, 65.0]
+    # What the build computed from the old copy is not kept for the edited participant
+    assert store.aggregates.get('modern', 1).final_total == 100 * SCALE
+
+def test_later_builds_reuse_the_aggregates_of_unchanged_participants(tmp_path):
+    store = make_store(tmp_path)
+    build_snapshot(store, PARTICIPANTS, generation=1)
+    assert (store.aggregates.hits, store.aggregates.misses) == (0, 2)
+
+    store.append([('modern', '1', 'final_total', 66.0)])
+    snapshot = build_snapshot(store, PARTICIPANTS, generation=2)
+    assert (store.aggregates.hits, store.aggregates.misses) == (1, 3)
+    assert snapshot.leaderboard.daily_winner('modern').name == 'Liam Johnson'
+    # Live edits hit what the worker computed
+    assert store.aggregates.ranking_key('modern', 2) is not None
+    assert store.aggregates.hits == 2
@@ -0,0 +1,55 @@
+import pytest
+from src.models.participant import Participant
+from src.utils.fixed_point import SCALE
+from src.utils.ranking_engine import RankingEngine
+from .helpers import jury_score
+
+PARTICIPANTS = [Participant.from_csv_line(f'modern,solo,mini,{n},P{n}') for n in range(1, 5)]
+GROUP = ('modern', 'solo', 'mini')
+
+def test_moving_out_of_a_tie_refreshes_the_ranks_it_shared():
+    pytest.importorskip('PySide6')
+    from src.gui.rankings_frame import RankingsModel
+
+    engine = RankingEngine()
+    engine.rebuild((('modern', p, (total * SCALE,)) for p, total in zip(PARTICIPANTS, [90, 80, 80, 80])))
+    model = RankingsModel()
+    model.set_groups([(GROUP, "MINI | SOLO")], engine.groups)
+    assert [model.data(model.index(row, 0)) for row in range(1, 5)] == ['1', '2', '2', '2']
+
+    refreshed = set()
+    model.dataChanged.connect(lambda first, last, roles: refreshed.update(range(first.row(), last.row() + 1)))
+    # P2 moves above P1, P3 and P4 lose the rank they shared with it
+    model.apply_change(engine.update('modern', PARTICIPANTS[1], (95 * SCALE,)))
+    assert [model.data(model.index(row, 0)) for row in range(1, 5)] == ['1', '2', '3', '3']
+    assert refreshed == {1, 2, 3, 4}
+
+def test_reloaded_group_matches_a_full_recompute(tmp_path):
+    pytest.importorskip('PySide6')
+    from PySide6.QtWidgets import QApplication
+    from src.gui.rankings_frame import RankingsFrame
+    from src.utils.score_journal import ScoreJournal
+
+    app = QApplication.instance() or QApplication([])
+    store = ScoreJournal(str(tmp_path / 'scores.json'))
+    store.load()
+    frame = RankingsFrame(store=store)
+    frame.participants = {p.start_number: p for p in PARTICIPANTS}
+    store.register_participants(PARTICIPANTS)
+    frame.load_rankings()
+    frame.worker.wait()
+    app.processEvents()
+
+    changes = [('modern', str(n), '1', jury_score(15 + n)) for n in range(1, 5)]
+    changes += [('modern', str(n), 'final_total', 0.0) for n in range(1, 5)]
+    store.apply(changes)
+    frame.reload_groups([('modern', n) for n in range(1, 5)])
+    assert [entry.name for entry in frame.rankings[GROUP]] == ['P4', 'P3', 'P2', 'P1']
+    assert frame.model.rowCount() == 5
+    assert [entry.name for entry in frame.leaderboard.podium(GROUP)] == ['P4', 'P3', 'P2']
+
+    reloaded = list(frame.rankings[GROUP])
+    frame.load_rankings()
+    frame.worker.wait()
+    app.processEvents()
+    assert frame.rankings[GROUP] == reloaded
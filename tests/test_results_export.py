@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+from src.models.category import AgeGroup, Category, Style
+from src.models.participant import Participant
+from src.utils.fixed_point import SCALE
+from src.utils.ranking_engine import RankingEngine
+from src.utils.results_export import (Report, export_reports, jury_means_report, jury_sheets_report,
+                                      podiums_report, results_report, write_csv, write_html, write_jsonl)
+
+PARTICIPANTS = [Participant(1, "Ann", Style.MODERN, Category.SOLO, AgeGroup.KIDS),
+                Participant(2, "Bob & Co", Style.MODERN, Category.SOLO, AgeGroup.KIDS),
+                Participant(3, "Cas", Style.MODERN, Category.SOLO, AgeGroup.KIDS),
+                Participant(4, "Dee", Style.MODERN, Category.SOLO, AgeGroup.KIDS),
+                Participant(5, "Eli", Style.MODERN, Category.SOLO, AgeGroup.MINI)]
+
+def rankings(totals):
+    engine = RankingEngine()
+    for participant, total in zip(PARTICIPANTS, totals):
+        engine.update('modern', participant, (total * SCALE, 0))
+    return engine.groups
+
+def test_results_and_podiums_in_competition_order():
+    groups = rankings([80, 90, 80, 70, 60])
+    out = io.StringIO()
+    write_csv(results_report(groups), out)
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    # Mini comes before kids, tied entries share a rank
+    assert [row[3:6] for row in rows[1:]] == [['1', '5', 'Eli'], ['1', '2', 'Bob & Co'], ['2', '1', 'Ann'],
+                                              ['2', '3', 'Cas'], ['4', '4', 'Dee']]
+
+    out = io.StringIO()
+    write_jsonl(podiums_report(groups, places=2), out)
+    podium = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(row['rank'], row['name']) for row in podium] == [(1, 'Eli'), (1, 'Bob & Co'), (2, 'Ann'), (2, 'Cas')]
+    assert podium[0] == {'style': 'modern', 'category': 'solo', 'age_group': 'mini', 'rank': 1,
+                         'start_number': 5, 'name': 'Eli', 'final_total': 60.0}
+
+def test_jury_sheets_follow_the_running_order():
+    s = {'technique': 20, 'choreography': 21, 'performance': 22, 'expression': 5, 'total': 68}
+    scores = {'modern': {'1': {'1': s, '2': s}, '5': {'2': s}}}
+    report = jury_sheets_report(scores, PARTICIPANTS, [1, 2])
+    sections = [(heading, [row[4] for row in rows]) for heading, rows in report.sections]
+    assert sections == [('Jury 1', [1]), ('Jury 2', [5, 1])]
+
+def test_jury_means_per_style():
+    s = {'technique': 20, 'choreography': 21, 'performance': 22, 'expression': 5, 'total': 68}
+    strict = dict(s, technique=10, total=58)
+    scores = {'urban': {'7': {'1': s}}, 'modern': {'1': {'1': s, '2': strict}, '5': {'2': s}}, 'ballet': {}}
+    report = jury_means_report(scores, [1, 2, 3])
+    assert [(heading, list(rows)) for heading, rows in report.sections] == [
+        ('Modern', [['modern', '1', 68.0], ['modern', '2', 63.0]]), ('Urban', [['urban', '1', 68.0]])]
+
+def test_html_is_written_while_sections_are_produced():
+    out = io.StringIO()
+    written = []
+
+    def sections():
+        for group in range(3):
+            written.append(len(out.getvalue()))
+            yield f"Group <{group}>", iter([[group, 'a&b']])
+
+    write_html(Report('test', "Test", ['rank', 'name'], sections()), out)
+    page = out.getvalue()
+    assert written[0] < written[1] < written[2] < len(page)
+    assert "<h2>Group &lt;2&gt;</h2>" in page and "<td>a&amp;b</td>" in page
+    assert "<th>rank</th><th>name</th>" in page and page.rstrip().endswith("</html>")
+
+def test_export_writes_one_file_per_report_and_format(tmp_path):
+    paths = export_reports(str(tmp_path), 'event', rankings([80, 90, 80, 70, 60]), {}, PARTICIPANTS, [1],
+                           reports=['results', 'jury_sheets'], formats=['csv', 'html'])
+    assert [path.rsplit('/', 1)[1] for path in paths] == ['event-results.csv', 'event-results.html',
+                                                          'event-jury_sheets.csv', 'event-jury_sheets.html']
+    assert (tmp_path / 'event-jury_sheets.csv').read_text().count('\n') == 1  # Header only
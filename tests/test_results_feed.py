@@ -0,0 +1,77 @@
+import json
+import socket
+from src.models.category import AgeGroup, Category, Style
+from src.models.participant import Participant
+from src.utils.fixed_point import SCALE
+from src.utils.ranking_engine import RankingEngine
+from src.utils.results_broadcast import ResultsBroadcaster
+from src.utils.results_feed import ResultsFeed, apply_update, state_groups
+
+def participant(start_number):
+    return Participant(start_number=start_number, name=f"Dancer {start_number}", style=Style.MODERN,
+                       category=Category.SOLO, age_group=AgeGroup.KIDS)
+
+def ranking(score):
+    return (score * SCALE, 0)
+
+def test_only_moved_rows_are_published():
+    engine, feed = RankingEngine(), ResultsFeed()
+    for start_number, score in ((1, 80), (2, 70), (3, 60)):
+        engine.update('modern', participant(start_number), ranking(score))
+    feed.mark()
+    first = feed.changes(engine.groups)
+    assert [row['rank'] for row in first[0]['rows']] == [1, 2, 3]
+    assert feed.changes(engine.groups) == []
+
+    # 3 overtakes 2, 1 keeps its rank and is not sent
+    feed.mark(engine.update('modern', participant(3), ranking(75)).key)
+    update = feed.changes(engine.groups)
+    assert update == [{'group': {'style': 'modern', 'category': 'solo', 'age_group': 'kids'},
+                       'rows': [{'start_number': 3, 'name': 'Dancer 3', 'score': 75.0, 'rank': 2, 'previous_rank': 3},
+                                {'start_number': 2, 'name': 'Dancer 2', 'score': 70.0, 'rank': 3, 'previous_rank': 2}],
+                       'removed': []}]
+
+    feed.mark(engine.update('modern', participant(1), None).key)
+    update += feed.changes(engine.groups)
+    assert update[-1]['removed'] == [1]
+
+    # Applying the updates reproduces the rankings
+    state = {}
+    apply_update(state, first + update)
+    assert state_groups(state) == [{'group': update[0]['group'],
+                                    'rows': [{'start_number': 3, 'name': 'Dancer 3', 'score': 75.0, 'rank': 1},
+                                             {'start_number': 2, 'name': 'Dancer 2', 'score': 70.0, 'rank': 2}]}]
+
+def read_event(stream):
+    event = {}
+    for line in stream:
+        line = line.decode().rstrip('\n')
+        if not line:
+            return event
+        if not line.startswith(':'):
+            name, _, value = line.partition(': ')
+            event[name] = value
+
+def test_subscribers_get_a_snapshot_then_updates():
+    broadcaster = ResultsBroadcaster('127.0.0.1', 0)
+    port = broadcaster.start()
+    try:
+        rows = [{'start_number': 5, 'name': 'Dancer 5', 'score': 80.0, 'rank': 1, 'previous_rank': None}]
+        broadcaster.publish([{'group': {'style': 'modern', 'category': 'solo', 'age_group': 'kids'},
+                              'rows': rows, 'removed': []}])
+
+        with socket.create_connection(('127.0.0.1', port), timeout=5) as connection:
+            connection.sendall(b"GET /results/stream HTTP/1.1\r\nHost: screen\r\n\r\n")
+            stream = connection.makefile('rb')
+            assert b'text/event-stream' in b''.join(iter(stream.readline, b'\r\n'))
+            snapshot = read_event(stream)
+            assert snapshot['event'] == 'snapshot' and snapshot['id'] == '1'
+            assert json.loads(snapshot['data'])['groups'][0]['rows'][0]['start_number'] == 5
+
+            broadcaster.publish([{'group': {'style': 'modern', 'category': 'solo', 'age_group': 'kids'},
+                                  'rows': [], 'removed': [5]}])
+            update = read_event(stream)
+            assert update['event'] == 'update' and json.loads(update['data'])['groups'][0]['removed'] == [5]
+        assert broadcaster.state == {}
+    finally:
+        broadcaster.stop()
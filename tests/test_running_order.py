@@ -0,0 +1,20 @@
+import pytest
+from src.models.participant import Participant
+
+PARTICIPANTS = [Participant.from_csv_line(f'modern,solo,mini,{n},P{n}') for n in range(1, 4)]
+
+def test_statuses_load_once_and_update_per_row():
+    pytest.importorskip('PySide6')
+    from src.gui.running_order import MISSING, PARTIAL, SCORED, RunningOrderModel
+
+    model = RunningOrderModel(PARTICIPANTS, jury_count=2)
+    model.load_statuses({'1': {'1': {}, '2': {}, 'final_total': 80.0}, '2': {'1': {}}})
+    assert list(model.statuses) == [SCORED, PARTIAL, MISSING]
+
+    changed = []
+    model.dataChanged.connect(lambda first, last, roles: changed.append(first.row()))
+    model.update_status(2, {'2': {}})
+    model.update_status(1, {'1': {}})  # Unchanged, no signal
+    assert list(model.statuses) == [SCORED, PARTIAL, PARTIAL]
+    assert changed == [2]
+    assert model.data(model.index(2)).split()[1:3] == ['3', 'P3']
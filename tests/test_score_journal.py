@@ -0,0 +1,143 @@
+import json
+from src.utils.ranking_rules import DEFAULT_RULES
+from src.utils.score_journal import ScoreJournal, atomic_write
+
+JURY_SCORE = {'technique': 25, 'choreography': 25, 'performance': 25, 'expression': 8, 'total': 83}
+
+def make_journal(tmp_path, **kwargs):
+    snapshot = tmp_path / 'scores.json'
+    snapshot.write_text(json.dumps({'modern': {}, 'urban': {}}))
+    journal = ScoreJournal(str(snapshot), **kwargs)
+    journal.load()
+    return journal
+
+def test_append_is_replayed_on_load(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.append([('modern', '1', '1', JURY_SCORE)])
+    journal.append([('modern', '1', 'final_total', 83.0)])
+    journal.close()
+
+    # Close compacts, so the snapshot alone holds everything
+    assert json.loads((tmp_path / 'scores.json').read_text())['modern']['1']['final_total'] == 83.0
+    assert (tmp_path / 'scores.journal').read_text() == ''
+
+    scores = ScoreJournal(str(tmp_path / 'scores.json')).load()
+    assert scores['modern']['1'] == {'1': JURY_SCORE, 'final_total': 83.0}
+
+def test_replay_without_compaction(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.append([('urban', '7', '2', JURY_SCORE), ('urban', '7', 'final_total', 83.0)])
+    journal.append([('urban', '7', 'final_total', None)])
+
+    reloaded = ScoreJournal(str(tmp_path / 'scores.json'))
+    scores = reloaded.load()
+    assert scores['urban']['7'] == {'2': JURY_SCORE}
+    assert reloaded.pending == 3
+
+def test_compaction_after_threshold(tmp_path):
+    journal = make_journal(tmp_path, compact_every=2)
+    journal.append([('modern', '1', '1', JURY_SCORE)])
+    journal.append([('modern', '2', '1', JURY_SCORE)])
+
+    assert journal.pending == 0
+    assert (tmp_path / 'scores.journal').read_text() == ''
+    snapshot = json.loads((tmp_path / 'scores.json').read_text())
+    assert set(snapshot['modern']) == {'1', '2'}
+
+def test_torn_last_line_is_ignored(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.append([('modern', '1', '1', JURY_SCORE)])
+    with open(tmp_path / 'scores.journal', 'a') as f:
+        f.write('{"s":"modern","p":"2"')
+
+    scores = ScoreJournal(str(tmp_path / 'scores.json')).load()
+    assert scores['modern'] == {'1': {'1': JURY_SCORE}}
+
+def test_diff_only_reports_changed_keys():
+    old = {'1': JURY_SCORE, '2': JURY_SCORE, 'final_total': 83.0}
+    new = {'1': JURY_SCORE, '2': dict(JURY_SCORE, expression=9, total=84)}
+
+    changes = ScoreJournal.diff('modern', '5', old, new)
+    assert changes == [('modern', '5', '2', new['2']), ('modern', '5', 'final_total', None)]
+
+def test_apply_then_write_matches_append(tmp_path):
+    journal = make_journal(tmp_path, fsync=True)
+    changes = [('modern', '3', '1', JURY_SCORE)]
+    journal.apply(changes)
+    assert journal.scores['modern']['3'] == {'1': JURY_SCORE}
+    assert (tmp_path / 'scores.journal').read_text() == ''  # Nothing written yet
+
+    journal.write(changes)
+    assert ScoreJournal(str(tmp_path / 'scores.json')).load() == journal.scores
+
+def test_atomic_write_replaces_without_leftovers(tmp_path):
+    path = tmp_path / 'scores.json'
+    path.write_text('old')
+    atomic_write(str(path), 'new')
+    assert path.read_text() == 'new'
+    assert [p.name for p in tmp_path.iterdir()] == ['scores.json']
+
+def two_stations(tmp_path, **kwargs):
+    """Two stores sharing one data directory, with a two member jury"""
+    first = make_journal(tmp_path, total_rule=lambda s: DEFAULT_RULES.final_total(s, 2), **kwargs)
+    second = ScoreJournal(str(tmp_path / 'scores.json'), total_rule=first.total_rule, **kwargs)
+    second.load()
+    return first, second
+
+def test_conflicting_stations_merge_jury_entries(tmp_path):
+    first, second = two_stations(tmp_path)
+    other_score = dict(JURY_SCORE, technique=29, total=87)
+    first.append([('modern', '1', '1', JURY_SCORE)])
+    # Written without having seen the first station's entry
+    second.append([('modern', '1', '2', other_score)])
+    assert first.conflicts == 0 and second.conflicts == 1
+
+    expected = {'1': JURY_SCORE, '2': other_score, 'final_total': 85.0}
+    assert second.sync() == [('modern', '1', '1', JURY_SCORE), ('modern', '1', 'final_total', 85.0)]
+    assert [change[2] for change in first.sync()] == ['2', 'final_total']
+    assert first.participant_scores('modern', '1') == expected
+    assert second.participant_scores('modern', '1') == expected
+    assert ScoreJournal(str(tmp_path / 'scores.json')).load()['modern']['1'] == expected
+
+    # The merged total is no longer an unwritten local edit for the second station
+    better = dict(JURY_SCORE, technique=27, total=85)
+    first.append([('modern', '1', '1', better), ('modern', '1', 'final_total', 86.0)])
+    second.sync()
+    assert second.participant_scores('modern', '1') == {'1': better, '2': other_score, 'final_total': 86.0}
+
+def test_unwritten_local_edit_wins_over_synced_entry(tmp_path):
+    first, second = two_stations(tmp_path)
+    first.append([('modern', '2', '1', JURY_SCORE)])
+    newer = dict(JURY_SCORE, expression=9, total=84)
+    second.apply([('modern', '2', '1', newer)])
+    assert second.sync() == []
+    assert second.participant_scores('modern', '2')['1'] == newer
+
+    second.write([('modern', '2', '1', newer)])
+    first.sync()
+    assert first.participant_scores('modern', '2') == {'1': newer}
+
+def test_station_follows_compaction_by_another(tmp_path):
+    first, second = two_stations(tmp_path, compact_every=3)
+    first.append([('urban', '1', '1', JURY_SCORE)])
+    second.append([('urban', '2', '1', JURY_SCORE)])
+    first.append([('urban', '3', '1', JURY_SCORE)])  # Third record, compacts
+    assert (tmp_path / 'scores.journal').read_text() == ''
+
+    second.append([('urban', '4', '1', JURY_SCORE)])
+    assert [change[1] for change in second.sync()] == ['1', '3']
+    assert [change[1] for change in first.sync()] == ['2', '4']  # '2' read while writing '3'
+    assert first.scores['urban'] == second.scores['urban']
+    assert set(ScoreJournal(str(tmp_path / 'scores.json')).load()['urban']) == {'1', '2', '3', '4'}
+
+def test_station_started_without_journal_sees_compaction(tmp_path):
+    (tmp_path / 'scores.json').write_text(json.dumps({}))
+    first, second = (ScoreJournal(str(tmp_path / 'scores.json')) for _ in range(2))
+    first.load()
+    second.load()
+    second.append([('modern', '1', '1', JURY_SCORE)])
+    second.close()  # Compacts into the snapshot
+
+    assert first.sync() == [('modern', '1', '1', JURY_SCORE)]
+    first.append([('modern', '2', '1', JURY_SCORE)])
+    assert set(first.scores['modern']) == {'1', '2'}
@@ -0,0 +1,43 @@
+from src.models.score_matrix import ScoreMatrix
+from src.utils.calculations import calculate_average_score, resolve_ex_aequo
+from .helpers import jury_score
+
+STYLE_SCORES = {
+    '1': {'1': jury_score(25, 25, 25, 8), '2': jury_score(28, 27, 26, 9), 'final_total': 86.5},
+    '2': {'2': jury_score(20, 20, 20, 5)},
+    '3': {},
+}
+
+def test_json_round_trip():
+    matrix = ScoreMatrix.from_json(STYLE_SCORES)
+    assert matrix.jury_ids == ['1', '2']
+    assert matrix.to_json() == STYLE_SCORES
+
+def test_row_and_column_aggregates():
+    matrix = ScoreMatrix.from_json(STYLE_SCORES)
+    assert matrix.participant_totals() == {1: 173, 2: 65, 3: 0}
+    assert matrix.jury_count(1) == 2 and matrix.jury_count(2) == 1
+    assert matrix.criterion_sum(1, 'technique') == 53
+    assert matrix.jury_means() == {'1': 83.0, '2': (90 + 65) / 2}
+
+    matrix.remove(1, '2')
+    assert matrix.get(1, '2') is None
+    assert matrix.average_total(1) == 83.0
+
+def test_new_jury_member_keeps_existing_scores():
+    matrix = ScoreMatrix.from_json(STYLE_SCORES)
+    matrix.set(2, '3', [10, 10, 10, 3])
+    # Participant 1 now misses a jury member, so it is no longer finished
+    assert matrix.to_json()['1'] == {'1': jury_score(25, 25, 25, 8), '2': jury_score(28, 27, 26, 9)}
+    assert [s.total for s in matrix.row(2)] == [65, 33]
+
+def test_calculations_accept_matrix_rows():
+    matrix = ScoreMatrix(['1', '2'])
+    matrix.set(1, '1', [30, 25, 25, 8])
+    matrix.set(1, '2', [30, 27, 26, 9])
+    matrix.set(2, '1', [28, 28, 25, 8])
+    matrix.set(2, '2', [28, 27, 26, 9])
+
+    assert calculate_average_score(matrix.row(1)) == (88 + 92) / 2
+    assert resolve_ex_aequo(matrix.row(1), matrix.row(2)) == 1
+    assert resolve_ex_aequo(matrix.row(1), matrix.scores(1)) == 0
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import threading
+import pytest
+from src.utils.ranking_rules import DEFAULT_RULES
+from src.utils.remote_store import RemoteScoreStore
+from src.utils.score_journal import ScoreJournal
+from src.utils.score_server import ScoreServer, main
+
+SCORES = {'technique': 25, 'choreography': 24, 'performance': 26, 'expression': 8}
+
+def make_server(tmp_path, **kwargs):
+    snapshot = tmp_path / 'scores.json'
+    snapshot.write_text(json.dumps({'modern': {}, 'urban': {}}))
+    store = ScoreJournal(str(snapshot))
+    store.load()
+    return ScoreServer(store, DEFAULT_RULES, [1, 2, 3], **kwargs)
+
+def jury_change(jury_id, **scores):
+    scores = dict(SCORES, **scores)
+    scores['total'] = sum(scores.values())
+    return ('modern', '4', str(jury_id), scores)
+
+def test_final_total_is_computed_by_the_server(tmp_path):
+    server = make_server(tmp_path)
+    server.submit([jury_change(1)], origin='a')
+    server.submit([jury_change(2, technique=28), ('modern', '4', 'final_total', 99.0)], origin='b')
+    assert 'final_total' not in server.store.participant_scores('modern', '4')
+    # Client b's stale total is corrected for it too
+    assert server.changes_since(2, 'b') == [('modern', '4', 'final_total', None)]
+
+    server.submit([jury_change(3, expression=10)], origin='c')
+    participant_scores = server.store.participant_scores('modern', '4')
+    assert participant_scores['1']['total'] == 83
+    assert participant_scores['final_total'] == 84.67  # (83 + 86 + 85) / 3
+
+def test_invalid_submission_changes_nothing(tmp_path):
+    server = make_server(tmp_path)
+    for change in (jury_change(1, technique=31), jury_change(9), ('modern', '4', '1', dict(SCORES, expression='8')),
+                   ('ballet', '4', '1', SCORES), ('modern', '4')):
+        with pytest.raises(ValueError):
+            server.submit([jury_change(2), change])
+    assert server.seq == 0
+    assert server.store.participant_scores('modern', '4') == {}
+
+def test_changes_since_skips_own_and_forgotten_history(tmp_path):
+    server = make_server(tmp_path, history=2)
+    server.submit([jury_change(1)], origin='a')
+    assert server.changes_since(0, 'a') == []
+    assert server.changes_since(0, 'b') == [jury_change(1)]
+    server.submit([jury_change(2), jury_change(3)], origin='a')  # Also sets the final total
+    assert server.changes_since(0) is None
+    assert server.changes_since(2, 'a') == [('modern', '4', 'final_total', 83.0)]
+    assert server.changes_since(5) is None
+
+def start_server(tmp_path, **kwargs):
+    loop = asyncio.new_event_loop()
+    server = make_server(tmp_path, **kwargs)
+    port = loop.run_until_complete(server.start('127.0.0.1', 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+    return server, f'http://127.0.0.1:{port}', stop
+
+def test_clients_share_scores_through_the_server(tmp_path):
+    server, url, stop = start_server(tmp_path)
+    first, second = RemoteScoreStore(url, poll_seconds=1), RemoteScoreStore(url, poll_seconds=1)
+    try:
+        first.load()
+        second.load()
+        first.append([jury_change(1)])
+        second.append([jury_change(2), jury_change(3)])
+
+        # Saved on the server before the write returned
+        journal = (tmp_path / 'scores.journal').read_text().splitlines()
+        assert len(journal) == 4
+
+        changes = first.fetch_changes()
+        assert [change[2] for change in changes] == ['2', '3', 'final_total']
+        first.apply(changes)
+        assert first.participant_scores('modern', '4') == server.store.participant_scores('modern', '4')
+        assert second.fetch_changes() == [jury_change(1),
+                                          ('modern', '4', 'final_total', 83.0)]
+
+        with pytest.raises(ValueError):
+            first.write([jury_change(1, technique=40)])
+    finally:
+        first.close()
+        second.close()
+        stop()
+    assert json.loads((tmp_path / 'scores.json').read_text())['modern']['4']['final_total'] == 83.0
+
+def test_tokens_limit_who_may_score(tmp_path):
+    server, url, stop = start_server(tmp_path, secret='desk', tokens={1: 'one', 2: 'two'})
+    desk, juror = RemoteScoreStore(url, token='desk'), RemoteScoreStore(url, token='one')
+    stranger, impostor = RemoteScoreStore(url), RemoteScoreStore(url, token='guess')
+    try:
+        desk.load()
+        juror.load()
+        for client in (stranger, impostor):
+            with pytest.raises(PermissionError):
+                client.load()
+        juror.append([jury_change(1)])
+        with pytest.raises(PermissionError):
+            juror.write([jury_change(2)])
+        desk.append([jury_change(2), jury_change(3)])
+        assert server.store.participant_scores('modern', '4')['final_total'] == 83.0
+    finally:
+        for client in (desk, juror, stranger, impostor):
+            client.close()
+        stop()
+
+def test_server_refuses_the_network_without_tokens(tmp_path, monkeypatch, capsys):
+    monkeypatch.delenv('SCORE_SERVER_TOKEN', raising=False)
+    (tmp_path / 'jury_config.json').write_text(json.dumps({'jury_members': [{'id': 1, 'name': "Jury 1"}]}))
+    with pytest.raises(SystemExit):
+        main(['--host', '0.0.0.0', '--data-dir', str(tmp_path)])
+    assert 'SCORE_SERVER_TOKEN' in capsys.readouterr().err
+
+def test_refused_edit_does_not_hold_back_later_ones(tmp_path):
+    QtCore = pytest.importorskip('PySide6.QtCore')
+    from src.gui.score_saver import ScoreSaver
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    server, url, stop = start_server(tmp_path, tokens={1: 'one', 2: 'two'})
+    store = RemoteScoreStore(url, token='one')
+    try:
+        store.load()
+        saver = ScoreSaver(store)
+        errors, restored = [], []
+        saver.failed.connect(errors.append)
+        saver.rejected.connect(restored.append)
+
+        saver.submit([jury_change(2)])
+        saver.flush()
+        assert len(errors) == 1 and restored == [[('modern', '4', '2', None),
+                                                  ('modern', '4', 'final_total', None)]]
+        saver.submit([jury_change(1)])
+        saver.flush()
+        assert len(errors) == 1 and not saver.unsaved({('modern', '4', '1'), ('modern', '4', '2')})
+        assert list(server.store.participant_scores('modern', '4')) == ['1']
+    finally:
+        store.close()
+        stop()
@@ -0,0 +1,75 @@
+import json
+import pytest
+from src.models.participant import Participant
+from src.utils.ranking_rules import RankingRules
+from src.utils.score_store import open_score_store
+from src.utils.sqlite_store import SqliteScoreStore, import_scores_json
+from .helpers import jury_score
+
+PARTICIPANTS = [
+    Participant.from_csv_line('modern,solo,mini,1,Emma Smith'),
+    Participant.from_csv_line('modern,solo,mini,2,Liam Johnson'),
+    Participant.from_csv_line('modern,duo,mini,3,Sophie Turner'),
+    Participant.from_csv_line('modern,solo,mini,10,Noah Brown'),
+]
+
+def finished(start_number, *entries):
+    changes = [('modern', start_number, str(jury_id), entry) for jury_id, entry in enumerate(entries, 1)]
+    return changes + [('modern', start_number, 'final_total', 0.0)]
+
+def test_changes_round_trip(tmp_path):
+    db_path = str(tmp_path / 'scores.db')
+    store = SqliteScoreStore(db_path)
+    store.append([('modern', '1', '1', jury_score(20)), ('modern', '1', 'final_total', 78.0)])
+    store.append([('modern', '1', 'final_total', None)])
+    store.close()
+
+    store = SqliteScoreStore(db_path)
+    assert store.load() == {'modern': {'1': {'1': jury_score(20)}}}
+    assert store.jury_scores(1) == [('modern', '1', jury_score(20))]
+
+def test_sqlite_store_imports_scores_json_once(tmp_path):
+    scores = {'modern': {'1': {'1': jury_score(20), 'final_total': 78.0}}, 'urban': {}}
+    (tmp_path / 'scores.json').write_text(json.dumps(scores))
+
+    store = open_score_store(str(tmp_path), backend='sqlite')
+    assert store.load() == {'modern': scores['modern']}
+    store.append([('urban', '4', 'final_total', 60.0)])
+    store.close()
+
+    # The existing database is kept on the next start
+    store = open_score_store(str(tmp_path), backend='sqlite')
+    assert store.scores['urban'] == {'4': {'final_total': 60.0}}
+    assert import_scores_json(str(tmp_path / 'scores.json'), str(tmp_path / 'other.db')) == 2
+
+def test_import_leaves_scores_json_and_journal_alone(tmp_path):
+    (tmp_path / 'scores.json').write_text('{}')
+    journal = tmp_path / 'scores.journal'
+    journal.write_text(json.dumps({'s': 'modern', 'p': '1', 'k': '1', 'v': jury_score(20)}) + '\n')
+
+    assert import_scores_json(str(tmp_path / 'scores.json'), str(tmp_path / 'scores.db')) == 1
+    assert (tmp_path / 'scores.json').read_text() == '{}'
+    assert journal.read_text().count('\n') == 1
+    assert not (tmp_path / 'scores.lock').exists()
+
+@pytest.mark.parametrize('backend', ['sqlite', 'json'])
+def test_group_ranking_orders_by_the_full_ranking_key(tmp_path, backend):
+    (tmp_path / 'scores.json').write_text('{}')
+    store = open_score_store(str(tmp_path), backend=backend)
+    store.register_participants(PARTICIPANTS)
+    # Equal totals, Liam wins the technique tie-break, Noah ties Emma completely
+    store.append(finished('1', jury_score(20)) + finished('2', jury_score(22, choreography=23))
+                 + finished('10', jury_score(20)) + finished('3', jury_score(29)))
+    store.append([('modern', '4', '1', jury_score(30))])  # Not finished, not ranked
+
+    ranking = store.group_ranking('modern', 'solo', 'mini')
+    assert [start_number for start_number, _ in ranking] == ['2', '1', '10']
+    assert ranking[0][1] == store.aggregates.ranking_key('modern', '2')
+    assert [start_number for start_number, _ in store.group_ranking('modern', 'duo', 'mini')] == ['3']
+    assert store.group_ranking('urban', 'solo', 'mini') == []
+
+    # Later changes and rule switches are reflected
+    store.append([('modern', '10', '1', jury_score(25))])
+    assert [start_number for start_number, _ in store.group_ranking('modern', 'solo', 'mini')] == ['10', '2', '1']
+    store.set_rules(RankingRules(tie_break=('choreography',)).compile())
+    assert [start_number for start_number, _ in store.group_ranking('modern', 'solo', 'mini')] == ['10', '1', '2']
@@ -0,0 +1,35 @@
+import io
+from src.utils.startup_profile import StartupProfiler
+
+def test_flag_enables_and_is_removed_from_argv(monkeypatch):
+    monkeypatch.delenv('PROFILE_STARTUP', raising=False)
+    profiler = StartupProfiler()
+    assert profiler.enable_from(['main.py', '--profile-startup', '-style', 'fusion']) == ['main.py', '-style', 'fusion']
+    assert profiler.enabled
+
+    with profiler.phase('open score store'):
+        pass
+    profiler.counter('aggregate cache', lambda: {'hits': 3, 'misses': 1})
+    out = io.StringIO()
+    profiler.report(out)
+    assert 'open score store' in out.getvalue()
+    assert 'total to first paint' in out.getvalue()
+    assert 'hits 3, misses 1' in out.getvalue()
+
+def test_disabled_profiler_records_nothing(monkeypatch):
+    monkeypatch.delenv('PROFILE_STARTUP', raising=False)
+    profiler = StartupProfiler()
+    profiler.enable_from(['main.py'])
+    with profiler.phase('import Qt'):
+        pass
+    profiler.counter('aggregate cache', dict)
+    out = io.StringIO()
+    profiler.report(out)
+    profiler.report_counters(out)
+    assert profiler.phases == [] and profiler.counters == [] and out.getvalue() == ''
+
+def test_environment_variable_enables(monkeypatch):
+    monkeypatch.setenv('PROFILE_STARTUP', '1')
+    profiler = StartupProfiler()
+    profiler.enable_from(['main.py'])
+    assert profiler.enabled
@@ -0,0 +1,32 @@
+import time
+import pytest
+from src.utils.score_journal import ScoreJournal
+from .helpers import jury_score
+
+def test_sync_waits_for_the_journal_off_the_gui_thread(tmp_path):
+    pytest.importorskip('PySide6')
+    from PySide6.QtWidgets import QApplication
+    from src.gui.station_sync import StationSync
+
+    app = QApplication.instance() or QApplication([])
+    store = ScoreJournal(str(tmp_path / 'scores.json'))
+    store.load()
+    other = ScoreJournal(str(tmp_path / 'scores.json'))
+    other.load()
+    other.append([('modern', '1', '1', jury_score(20))])
+
+    sync = StationSync(store, interval_ms=10)
+    received = []
+    sync.received.connect(received.append)
+    with store._io_lock:  # Another thread writing and fsyncing
+        started = time.perf_counter()
+        sync.tick()
+        sync.tick()  # Skipped, the first sync is still waiting
+        assert time.perf_counter() - started < 0.5
+    sync.wait()
+    app.processEvents()
+
+    assert received == [[('modern', '1', '1', jury_score(20))]]
+    assert store.participant_scores('modern', 1) == {'1': jury_score(20)}
+    other.close()
+    store.close()